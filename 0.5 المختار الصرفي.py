@@ -1,79 +1,252 @@
 import re
 import ast
 import os
+import sys
 import json
+import html
+import io
+import pickle
+import shutil
 import sqlite3
 import concurrent.futures
-from collections import defaultdict
-import multiprocessing
+from collections import defaultdict, Counter, deque, namedtuple
+from multiprocessing import shared_memory
 import logging
 from datetime import datetime
 import hashlib
+import importlib.util
+import functools
+import contextlib
 from pathlib import Path
-import pickle
 from tqdm import tqdm
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # للاستخدام بدون واجهة رسومية
-from jinja2 import Template
 
-# دعم ملفات docx
+import zipfile
+
+# محلل XML أسرع لملفات docx إن توفرت مكتبة lxml (اختيارية)
 try:
-    from docx import Document
-    DOCX_SUPPORT = True
+    from lxml.etree import iterparse as xml_iterparse
+    LXML_SUPPORT = True
 except ImportError:
-    DOCX_SUPPORT = False
-    logging.warning("مكتبة python-docx غير مثبتة. ملفات .docx لن تُقرأ. قم بتثبيتها: pip install python-docx")
+    from xml.etree.ElementTree import iterparse as xml_iterparse
+    LXML_SUPPORT = False
+
+# المكتبات الاختيارية الثقيلة التي لا تلزم إلا لحالات قليلة يُتحقق من وجودها فقط،
+# وتُستورد عند أول استعمال، فلا تؤخر تحميل الوحدة (في الواجهة وفي كل عملية معالجة)
+
+# python-docx بديل احتياطي لملفات docx التي يتعذر تحليلها مباشرة (اختيارية)
+DOCX_SUPPORT = importlib.util.find_spec('docx') is not None
+
+# تسلسل JSON أسرع إن توفرت مكتبة orjson (اختيارية)
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
+# مسافة Levenshtein بتنفيذ C إن توفرت مكتبة rapidfuzz (اختيارية)
+try:
+    from rapidfuzz.distance import Levenshtein as RapidLevenshtein
+    RAPIDFUZZ_SUPPORT = True
+except ImportError:
+    RAPIDFUZZ_SUPPORT = False
+
+# كتابة تقارير Excel مباشرة بمكتبة xlsxwriter إن توفرت (اختيارية)
+XLSXWRITER_SUPPORT = importlib.util.find_spec('xlsxwriter') is not None
+
+# البديل عند غياب xlsxwriter: openpyxl في وضع الكتابة فقط
+OPENPYXL_SUPPORT = importlib.util.find_spec('openpyxl') is not None
+
+def import_optional(module_name):
+    """استيراد مكتبة اختيارية عند أول استعمال (None إذا تعذر استيرادها)
+
+    find_spec يثبت وجود الحزمة لا صلاحيتها للاستيراد، فالحزمة المعطوبة أو غير المقصودة
+    (كحزمة docx القديمة لبايثون 2) تُعامل معاملة الغائبة.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except (ImportError, SyntaxError) as e:
+        logging.warning(f"تعذر استيراد المكتبة الاختيارية {module_name}: {e}")
+        return None
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+##################################
+# أدوات JSON
+##################################
+
+def json_dumps_bytes(obj):
+    """تحويل كائن إلى JSON بترميز UTF-8 (عبر orjson إن توفرت)"""
+    if ORJSON_SUPPORT:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def json_loads(data):
+    """قراءة JSON من bytes أو str (عبر orjson إن توفرت)"""
+    if ORJSON_SUPPORT:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_literal_file(file_path):
+    """قراءة ملف بيانات مكتوب بصيغة قاموس/قائمة بايثون
+
+    أغلب هذه الملفات JSON صالح فتُقرأ بمحلل JSON وهو أسرع بكثير من ast.literal_eval،
+    ويُرجع إلى ast.literal_eval لما سواها (اقتباس مفرد، فاصلة زائدة، ...).
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    try:
+        return json_loads(data)
+    except ValueError:
+        return ast.literal_eval(data.decode('utf-8'))
+
+##################################
+# الأنماط المترجمة مسبقاً
+##################################
+
+# نمط استخراج الكلمات العربية (يشمل التشكيل)
+ARABIC_WORD_RE = re.compile(r"[\u0621-\u065F\u0670\u06D6-\u06DC\u06DF-\u06E8\u06EA-\u06ED]+")
+
+# نمط سطر الوسم: "الكلمة" = "الوسم" في بداية السطر (يُطبق على الملف كاملاً دون تجاوز حدود السطر)
+TAG_LINE_RE = re.compile(r'^\s*"([^"\n]+)"[^\S\n]*=[^\S\n]*"([^"\n]+)"', re.MULTILINE)
+
+# نمط حركات التشكيل
+DIACRITICS_RE = re.compile(r'[ًٌٍَُِّْ]')
+# جدول حذف الحركات نفسها (str.translate أسرع من re.sub لحذف مجموعة حروف)
+DROP_DIACRITICS_TABLE = str.maketrans('', '', 'ًٌٍَُِّْ')
+
+# جدول التطبيع: توحيد الهمزات والألفات والتاءات وحذف الحروف القرآنية الخاصة في مرور واحد
+QURANIC_MARKS = ''.join(chr(c) for c in (*range(0x0670, 0x0680), *range(0x06D6, 0x06F0)))
+NORMALIZE_TABLE = str.maketrans({
+    **dict.fromkeys(QURANIC_MARKS),
+    **dict.fromkeys('ءأإآ', 'أ'),
+    'ٱ': 'ا',
+    'ة': 'ت',
+})
+
+def available_cpu_count():
+    """عدد المعالجات المتاحة لهذه العملية فعلاً (بحسب قيود التخصيص affinity) لا كل معالجات الجهاز"""
+    if hasattr(os, 'process_cpu_count'):  # Python 3.13+
+        return os.process_cpu_count() or 1
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def file_signature(file_path):
+    """توقيع الملف من وقت تعديله وحجمه، يتغير بتغير الملف فيبطل ما خُزّن له في الكاش"""
+    stat = os.stat(file_path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+# أحرف الزيادة، وجدول حذفها: عددها في الكلمة = طولها - طولها بعد الحذف
+EXTRA_CHARS = "سأؤئءآإتمونيهىّا"
+_DROP_EXTRA_TABLE = str.maketrans('', '', EXTRA_CHARS)
+
+def count_extra_chars(word):
+    """عدد أحرف الزيادة في الكلمة (مرور واحد بـ str.translate)"""
+    return len(word) - len(word.translate(_DROP_EXTRA_TABLE))
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern, flags=0):
+    """ترجمة النمط مرة واحدة (كاش re الداخلي محدود بـ 512 نمطاً فقط)"""
+    return re.compile(pattern, flags)
+
 ##################################
 # نظام الكاش
 ##################################
 
 class CacheManager:
-    """نظام كاش لحفظ النتائج المعالجة سابقاً"""
+    """نظام كاش لحفظ النتائج المعالجة سابقاً
+
+    يُخزَّن الكاش في قاعدة SQLite (مفتاح/قيمة) بدل ملف JSON واحد،
+    فتكون القراءة والكتابة لكل مفتاح على حدة دون إعادة كتابة الكاش كاملاً.
+    """
     def __init__(self, cache_dir="cache"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
-        self.cache_file = self.cache_dir / "word_cache.json"
-        self.cache = self.load_cache()
-        
-    def load_cache(self):
-        """تحميل الكاش من الملف"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        self.cache_file = self.cache_dir / "word_cache.db"
+        self.conn = sqlite3.connect(str(self.cache_file))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                key BLOB PRIMARY KEY,
+                value BLOB NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        # نتائج الأوزان كاملة (JSON) بمفتاح يجمع الوزن وبصمة إعدادات المعالجة،
+        # مع البصمة وحدها ليُحذف ما خُزّن بإعدادات أخرى. جدول weight_results القديم كان مسلسلاً بـ pickle
+        self.conn.execute('DROP TABLE IF EXISTS weight_results')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS weight_result_cache (
+                key BLOB PRIMARY KEY,
+                fingerprint BLOB NOT NULL,
+                value BLOB NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        self.conn.commit()
+        # ذاكرة داخلية أمام قاعدة الكاش بمفاتيح (كلمة، وزن) مُدخلة في جدول sys.intern،
+        # وقيمها مجمدة (القوائم صفوفاً) فلا يغيّر المستدعي ما في الكاش بتعديل ما أُعيد إليه
+        self.memory = {}
     
     def save_cache(self):
-        """حفظ الكاش إلى الملف"""
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(self.cache, f, ensure_ascii=False, indent=2)
+        """تثبيت التغييرات المعلّقة في الكاش"""
+        self.conn.commit()
     
     def get_cache_key(self, word, pattern):
-        """إنشاء مفتاح فريد للكلمة والوزن"""
-        return f"{word}_{pattern}"
+        """إنشاء مفتاح فريد للكلمة والوزن (بصمة من 16 بايت)"""
+        return hashlib.blake2b(f"{word}\x00{pattern}".encode('utf-8'), digest_size=16).digest()
+    
+    @staticmethod
+    def _freeze(value):
+        """نسخة غير قابلة للتعديل من القيمة: القوائم والصفوف صفوفاً بكل مستوياتها"""
+        if isinstance(value, (list, tuple)):
+            return tuple(map(CacheManager._freeze, value))
+        return value
     
     def get(self, word, pattern):
-        """الحصول على نتيجة من الكاش"""
+        """الحصول على نتيجة من الكاش (قيمة مجمدة: القوائم صفوف)"""
+        memory_key = (sys.intern(word), sys.intern(pattern))
+        if memory_key in self.memory:
+            return self.memory[memory_key]
+        
         key = self.get_cache_key(word, pattern)
-        return self.cache.get(key)
+        row = self.conn.execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+        result = self._freeze(json_loads(row[0])) if row else None
+        if result is not None:
+            self.memory[memory_key] = result
+        return result
     
     def set(self, word, pattern, result):
         """حفظ نتيجة في الكاش"""
+        self.memory[(sys.intern(word), sys.intern(pattern))] = self._freeze(result)
         key = self.get_cache_key(word, pattern)
-        self.cache[key] = result
+        value = json_dumps_bytes(result)
+        self.conn.execute('INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)', (key, value))
+    
+    def get_weight_result(self, key):
+        """نتيجة وزن مخزنة (كما خُزّنت في JSON) بمفتاحها، أو None"""
+        row = self.conn.execute('SELECT value FROM weight_result_cache WHERE key = ?', (key,)).fetchone()
+        return json_loads(row[0]) if row else None
+    
+    def put_weight_result(self, key, fingerprint, value):
+        """تخزين نتيجة وزن (قابلة للتحويل إلى JSON) بمفتاحها وبصمة إعدادات المعالجة"""
+        self.conn.execute('INSERT OR REPLACE INTO weight_result_cache (key, fingerprint, value) VALUES (?, ?, ?)',
+                          (key, fingerprint, json_dumps_bytes(value)))
+    
+    def prune_weight_results(self, fingerprint):
+        """حذف نتائج الأوزان المخزنة بإعدادات غير الحالية (تُرجع عدد المحذوف)"""
+        return self.conn.execute('DELETE FROM weight_result_cache WHERE fingerprint != ?', (fingerprint,)).rowcount
         
     def clear(self):
         """مسح الكاش"""
-        self.cache = {}
-        if self.cache_file.exists():
-            self.cache_file.unlink()
+        self.memory = {}
+        self.conn.execute('DELETE FROM cache')
+        self.conn.execute('DELETE FROM weight_result_cache')
+        self.conn.commit()
+    
+    def close(self):
+        """إغلاق الاتصال بقاعدة الكاش"""
+        self.conn.commit()
+        self.conn.close()
 
 ##################################
 # نظام قاعدة البيانات
@@ -81,11 +254,63 @@ class CacheManager:
 
 class DatabaseManager:
     """مدير قاعدة البيانات SQLite"""
-    def __init__(self, db_path="morphology.db"):
+    # جمل الإدراج المتكررة ثابتة النص لتُعاد من كاش الجمل المترجمة في sqlite3
+    INSERT_ROOT_SQL = 'INSERT OR IGNORE INTO roots (root) VALUES (?)'
+    INSERT_PATTERN_SQL = 'INSERT OR IGNORE INTO patterns (pattern) VALUES (?)'
+    INSERT_PATTERN_INFO_SQL = 'INSERT OR IGNORE INTO patterns (pattern, pattern_type, extra_chars_count) VALUES (?, ?, ?)'
+    # UPSERT: تحديث السجل الموجود في مكانه بدل حذفه وإعادة إدراجه
+    INSERT_RESULT_SQL = '''
+        INSERT INTO results
+        (word, root_id, pattern_id, prefix, suffix, intermediate, score, frequency)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+        ON CONFLICT(word, root_id, pattern_id) DO UPDATE SET
+            prefix = excluded.prefix,
+            suffix = excluded.suffix,
+            intermediate = excluded.intermediate,
+            score = excluded.score,
+            frequency = frequency + 1
+    '''
+    UPDATE_PATTERN_FREQ_SQL = 'UPDATE patterns SET frequency = frequency + ? WHERE id = ?'
+    UPDATE_ROOT_FREQ_SQL = 'UPDATE roots SET frequency = frequency + ? WHERE id = ?'
+    
+    def __init__(self, db_path="morphology.db", fast_ingest=False, check_same_thread=True):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        # التحكم بالمعاملات يدوياً (BEGIN/COMMIT) بدل المعاملات الضمنية،
+        # مع كاش أكبر للجمل المترجمة (استعلامات IN متغيرة الطول تشغل جزءاً منه)
+        # check_same_thread=False لمن يسلّم الاتصال إلى خيط آخر بعد انتهاء عمله عليه
+        self.conn = sqlite3.connect(db_path, isolation_level=None, cached_statements=512,
+                                    check_same_thread=check_same_thread)
+        self.apply_pragmas()
         self.create_tables()
-        
+        self.set_fast_ingest(fast_ingest)
+
+    def apply_pragmas(self):
+        """ضبط إعدادات SQLite لتسريع الكتابة"""
+        cursor = self.conn.cursor()
+        # page_size يجب أن يسبق أول كتابة وتفعيل WAL ليأخذ أثره على قاعدة جديدة
+        cursor.execute('PRAGMA page_size=8192')
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-262144')  # 256MB
+        cursor.execute('PRAGMA mmap_size=268435456')  # 256MB
+
+    def set_fast_ingest(self, enabled):
+        """تعطيل المزامنة مع القرص أثناء الإدراج المكثف ثم إعادتها"""
+        self.conn.execute(f"PRAGMA synchronous={'OFF' if enabled else 'NORMAL'}")
+    
+    @contextlib.contextmanager
+    def fast_ingest(self):
+        """إدراج مكثف بلا مزامنة مع القرص، تُعاد المزامنة بعده ولو انتهى بخطأ
+
+        تُحاط به المعاملة (لا العكس) فتُعاد المزامنة بعد إيداعها أو التراجع عنها.
+        """
+        self.set_fast_ingest(True)
+        try:
+            yield
+        finally:
+            self.set_fast_ingest(False)
+    
     def create_tables(self):
         """إنشاء الجداول"""
         cursor = self.conn.cursor()
@@ -145,17 +370,41 @@ class DatabaseManager:
             )
         ''')
         
+        # فهارس التكرار لجلب الأكثر شيوعاً دون فرز الجدول كاملاً
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_patterns_freq ON patterns(frequency DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_roots_freq ON roots(frequency DESC)')
+    
+    @contextlib.contextmanager
+    def transaction(self):
+        """معاملة واحدة تضم عدة عمليات كتابة
+
+        عمليات الإدراج المجمّعة داخلها تنضم إليها بدل فتح معاملة خاصة بكل دفعة،
+        فيُكتب الكل عند الإيداع مرة واحدة.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        self.conn.execute('BEGIN')
+        try:
+            yield
+        except BaseException:
+            self.conn.rollback()
+            raise
         self.conn.commit()
     
     def insert_pattern(self, pattern, pattern_type=None, extra_chars_count=0):
         """إدراج وزن جديد"""
         cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR IGNORE INTO patterns (pattern, pattern_type, extra_chars_count)
-            VALUES (?, ?, ?)
-        ''', (pattern, pattern_type, extra_chars_count))
-        self.conn.commit()
-        return cursor.lastrowid or self.get_pattern_id(pattern)
+        cursor.execute(self.INSERT_PATTERN_INFO_SQL, (pattern, pattern_type, extra_chars_count))
+        # عند تجاهل الإدراج لا يعبّر lastrowid عن هذا الوزن
+        return cursor.lastrowid if cursor.rowcount else self.get_pattern_id(pattern)
+    
+    def insert_patterns_bulk(self, rows):
+        """إدراج دفعة أوزان في معاملة واحدة؛ كل عنصر في rows هو: (pattern, pattern_type, extra_chars_count)"""
+        if not rows:
+            return
+        with self.transaction():
+            self.conn.executemany(self.INSERT_PATTERN_INFO_SQL, rows)
     
     def insert_root(self, root):
         """إدراج جذر جديد"""
@@ -164,30 +413,60 @@ class DatabaseManager:
             INSERT OR IGNORE INTO roots (root)
             VALUES (?)
         ''', (root,))
-        self.conn.commit()
-        return cursor.lastrowid or self.get_root_id(root)
+        return cursor.lastrowid if cursor.rowcount else self.get_root_id(root)
     
     def insert_result(self, word, root, pattern, prefix, suffix, intermediate, score=0):
         """إدراج نتيجة تحليل"""
-        root_id = self.insert_root(root)
-        pattern_id = self.get_pattern_id(pattern)
-        
+        self.insert_results_bulk([(word, root, pattern, prefix, suffix, intermediate, score)])
+
+    def insert_results_bulk(self, rows):
+        """إدراج دفعة من نتائج التحليل في معاملة واحدة
+
+        كل عنصر في rows هو: (word, root, pattern, prefix, suffix, intermediate, score)
+        """
+        if not rows:
+            return
+
         cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO results 
-            (word, root_id, pattern_id, prefix, suffix, intermediate, score, frequency)
-            VALUES (?, ?, ?, ?, ?, ?, ?,
-                COALESCE((SELECT frequency + 1 FROM results 
-                         WHERE word = ? AND root_id = ? AND pattern_id = ?), 1))
-        ''', (word, root_id, pattern_id, prefix, suffix, intermediate, score,
-              word, root_id, pattern_id))
-        
-        # تحديث تكرار الوزن والجذر
-        cursor.execute('UPDATE patterns SET frequency = frequency + 1 WHERE id = ?', (pattern_id,))
-        cursor.execute('UPDATE roots SET frequency = frequency + 1 WHERE id = ?', (root_id,))
-        
-        self.conn.commit()
-    
+        with self.transaction():
+            # إدراج الجذور والأوزان الجديدة ثم جلب معرّفاتها دفعة واحدة
+            roots = {row[1] for row in rows}
+            patterns = {row[2] for row in rows}
+            cursor.executemany(self.INSERT_ROOT_SQL, [(root,) for root in roots])
+            cursor.executemany(self.INSERT_PATTERN_SQL, [(pattern,) for pattern in patterns])
+            root_ids = self._fetch_ids('roots', 'root', roots)
+            pattern_ids = self._fetch_ids('patterns', 'pattern', patterns)
+
+            payload = []
+            root_deltas = Counter()
+            pattern_deltas = Counter()
+            for word, root, pattern, prefix, suffix, intermediate, score in rows:
+                root_id = root_ids[root]
+                pattern_id = pattern_ids[pattern]
+                payload.append((word, root_id, pattern_id, prefix, suffix, intermediate, score))
+                root_deltas[root_id] += 1
+                pattern_deltas[pattern_id] += 1
+
+            cursor.executemany(self.INSERT_RESULT_SQL, payload)
+
+            # تحديث التكرارات بزيادة مجمّعة لكل وزن وجذر
+            cursor.executemany(self.UPDATE_PATTERN_FREQ_SQL,
+                               [(delta, pid) for pid, delta in pattern_deltas.items()])
+            cursor.executemany(self.UPDATE_ROOT_FREQ_SQL,
+                               [(delta, rid) for rid, delta in root_deltas.items()])
+
+    def _fetch_ids(self, table, column, values, batch_size=500):
+        """جلب معرّفات مجموعة قيم من جدول (على دفعات لتجنب حد متغيرات SQLite)"""
+        cursor = self.conn.cursor()
+        ids = {}
+        values = list(values)
+        for i in range(0, len(values), batch_size):
+            batch = values[i:i + batch_size]
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(f'SELECT {column}, id FROM {table} WHERE {column} IN ({placeholders})', batch)
+            ids.update(cursor.fetchall())
+        return ids
+
     def get_pattern_id(self, pattern):
         """الحصول على معرف الوزن"""
         cursor = self.conn.cursor()
@@ -202,22 +481,38 @@ class DatabaseManager:
         result = cursor.fetchone()
         return result[0] if result else None
     
+    def get_patterns_info(self, patterns, batch_size=500):
+        """جلب عدد أحرف الزيادة والتكرار لمجموعة أوزان باستعلام واحد لكل دفعة
+
+        يعيد قاموساً: الوزن -> (extra_chars_count, frequency)
+        """
+        cursor = self.conn.cursor()
+        info = {}
+        patterns = list(patterns)
+        for i in range(0, len(patterns), batch_size):
+            batch = patterns[i:i + batch_size]
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(f'''
+                SELECT pattern, extra_chars_count, frequency
+                FROM patterns WHERE pattern IN ({placeholders})
+            ''', batch)
+            info.update((pattern, (extra, freq)) for pattern, extra, freq in cursor.fetchall())
+        return info
+    
     def get_statistics(self):
         """الحصول على الإحصائيات"""
         cursor = self.conn.cursor()
         stats = {}
         
-        cursor.execute('SELECT COUNT(*) FROM results')
-        stats['total_results'] = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(DISTINCT word) FROM results')
-        stats['unique_words'] = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM patterns')
-        stats['total_patterns'] = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM roots')
-        stats['total_roots'] = cursor.fetchone()[0]
+        # العدّادات كلها في استعلام واحد
+        cursor.execute('''
+            SELECT (SELECT COUNT(*) FROM results),
+                   (SELECT COUNT(DISTINCT word) FROM results),
+                   (SELECT COUNT(*) FROM patterns),
+                   (SELECT COUNT(*) FROM roots)
+        ''')
+        (stats['total_results'], stats['unique_words'],
+         stats['total_patterns'], stats['total_roots']) = cursor.fetchone()
         
         cursor.execute('''
             SELECT pattern, frequency 
@@ -237,6 +532,10 @@ class DatabaseManager:
         
         return stats
     
+    def checkpoint(self):
+        """دمج سجل WAL في ملف القاعدة دون انتظار القراء، فلا يبقى للإغلاق إلا القليل"""
+        self.conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+
     def close(self):
         """إغلاق الاتصال بقاعدة البيانات"""
         self.conn.close()
@@ -245,58 +544,122 @@ class DatabaseManager:
 # نظام ترشيح وتقييم الأوزان
 ##################################
 
+# بيانات الوزن الثابتة اللازمة لحساب النقاط
+PatternMeta = namedtuple('PatternMeta', ['extra_count', 'length', 'db_freq'])
+
 class PatternRanker:
     """نظام ترشيح وتقييم الأوزان المتعددة"""
     def __init__(self, db_manager=None):
-        self.extra_chars = set("سأؤئءآإتمونيهىّا")
+        self.extra_chars = set(EXTRA_CHARS)
         self.db_manager = db_manager
         self.pattern_scores = defaultdict(float)
         
-    def calculate_score(self, pattern, word, prefix, suffix, results_count):
-        """حساب نقاط الوزن"""
-        score = 0
+    def count_extra_chars(self, pattern):
+        """عدد أحرف الزيادة في الوزن"""
+        return count_extra_chars(pattern)
+    
+    def get_pattern_meta(self, patterns):
+        """بناء PatternMeta لمجموعة أوزان باستعلام واحد
+
+        يُؤخذ عدد أحرف الزيادة المخزن في جدول الأوزان إن وُجد، وإلا يُحسب.
+        """
+        patterns = list(patterns)
+        stored = self.db_manager.get_patterns_info(patterns) if self.db_manager else {}
+        missing_freq = 0 if self.db_manager else None
+        meta = {}
+        for pattern in patterns:
+            extra_count, db_freq = stored.get(pattern, (None, missing_freq))
+            if extra_count is None:
+                extra_count = self.count_extra_chars(pattern)
+            meta[pattern] = PatternMeta(extra_count, len(pattern), db_freq)
+        return meta
+        
+    def calculate_score(self, pattern, word, prefix, suffix, results_count, db_freq=None, meta=None):
+        """حساب نقاط الوزن
+
+        meta: بيانات الوزن (PatternMeta) إن كانت مجهزة مسبقاً، وإلا تُبنى هنا
+        db_freq: تكرار الوزن في قاعدة البيانات إن كان معروفاً مسبقاً
+        """
+        if meta is None:
+            if db_freq is None and self.db_manager:
+                meta = self.get_pattern_meta([pattern])[pattern]
+            else:
+                meta = PatternMeta(self.count_extra_chars(pattern), len(pattern), db_freq)
         
-        # 1. نقاط أحرف الزيادة (الأولوية الأعلى)
-        extra_count = sum(1 for c in pattern if c in self.extra_chars)
-        score += extra_count * 20
+        word_len = len(word)
+        score = (
+            meta.extra_count * 20                                             # 1. أحرف الزيادة (الأولوية الأعلى)
+            + (5 if prefix else 0) + (5 if suffix else 0)                     # 3. السوابق واللواحق
+            + (10 if word_len and 0.7 <= meta.length / word_len <= 1.3 else 0)  # 4. نسبة الطول
+            + min(results_count * 2, 20)                                      # 5. عدد النتائج (حد أقصى 20)
+        )
         
         # 2. نقاط التكرار في قاعدة البيانات
-        if self.db_manager:
-            pattern_id = self.db_manager.get_pattern_id(pattern)
-            if pattern_id:
-                cursor = self.db_manager.conn.cursor()
-                cursor.execute('SELECT frequency FROM patterns WHERE id = ?', (pattern_id,))
-                result = cursor.fetchone()
-                if result:
-                    score += min(result[0] * 0.5, 50)  # حد أقصى 50 نقطة
-        
-        # 3. نقاط التطابق مع السوابق واللواحق
-        if prefix:
-            score += 5
-        if suffix:
-            score += 5
-            
-        # 4. نقاط نسبة طول الوزن للكلمة
-        length_ratio = len(pattern) / len(word) if len(word) > 0 else 0
-        if 0.7 <= length_ratio <= 1.3:
-            score += 10
-            
-        # 5. نقاط عدد النتائج المطابقة
-        score += min(results_count * 2, 20)  # حد أقصى 20 نقطة
+        if meta.db_freq is not None:
+            score += min(meta.db_freq * 0.5, 50)  # حد أقصى 50 نقطة
         
         return score
     
+    def calculate_scores_batch(self, pattern, rows, results_count=1, meta=None):
+        """نقاط مجموعة نتائج لوزن واحد دفعة واحدة، تُدرج بعدها بترتيبها
+
+        مطابقة لحساب calculate_score لكل نتيجة ثم إدراجها قبل حساب التالية:
+        تكرار الوزن في meta هو تكراره قبل الدفعة، ويزيد بواحد بعد كل نتيجة.
+        rows: أزواج (word, prefix, suffix)؛ تُحسب الحدود الثابتة للوزن مرة واحدة
+        ويبقى لكل نتيجة حدود السوابق واللواحق ونسبة الطول والتكرار.
+        """
+        if meta is None:
+            meta = self.get_pattern_meta([pattern])[pattern]
+        
+        base_score = meta.extra_count * 20 + min(results_count * 2, 20)
+        # تكرار الوزن يزيد بواحد مع إدراج كل نتيجة، فنقاط النتيجة i تُحسب بتكراره
+        # قبل إدراجها: تكرار بداية الدفعة + i (كما في الحساب ثم الإدراج نتيجةً نتيجة)
+        db_freq = meta.db_freq
+        
+        # نقاط نسبة الطول تعتمد على طول الكلمة فقط، فتُحسب مرة لكل طول
+        pattern_len = meta.length
+        length_scores = {}
+        scores = []
+        for word, prefix, suffix in rows:
+            word_len = len(word)
+            length_score = length_scores.get(word_len)
+            if length_score is None:
+                length_score = length_scores[word_len] = (
+                    10 if word_len and 0.7 <= pattern_len / word_len <= 1.3 else 0)
+            score = base_score + (5 if prefix else 0) + (5 if suffix else 0) + length_score
+            if db_freq is not None:
+                score += min(db_freq * 0.5, 50)
+                db_freq += 1
+            scores.append(score)
+        return scores
+    
     def rank_patterns(self, patterns_results, word):
         """ترتيب الأوزان حسب النقاط"""
         ranked = []
         
+        # جلب بيانات كل الأوزان باستعلام واحد بدل استعلامين لكل نتيجة
+        metas = self.get_pattern_meta(patterns_results.keys())
+        
+        word_len = len(word)
         for pattern, results in patterns_results.items():
-            total_score = 0
-            for prefix, root, suffix in results:
-                score = self.calculate_score(pattern, word, prefix, suffix, len(results))
-                total_score += score
+            if not results:
+                ranked.append((pattern, results, 0))
+                continue
+            
+            # كل الحدود ثابتة للوزن الواحد ما عدا نقاط السوابق واللواحق،
+            # فيُحسب المتوسط مباشرة بدل حساب نقاط كل نتيجة على حدة.
+            # الحدود كلها مضاعفات 0.5 فمجموعها دقيق، والقسمة الواحدة على عدد النتائج
+            # تعطي المتوسط نفسه بتاً ببت كجمع نقاط النتائج ثم قسمته
+            results_count = len(results)
+            meta = metas[pattern]
+            base_score = (meta.extra_count * 20
+                          + (10 if word_len and 0.7 <= meta.length / word_len <= 1.3 else 0)
+                          + min(results_count * 2, 20))
+            if meta.db_freq is not None:
+                base_score += min(meta.db_freq * 0.5, 50)
+            affix_count = sum(bool(prefix) + bool(suffix) for prefix, _, suffix in results)
             
-            avg_score = total_score / len(results) if results else 0
+            avg_score = (base_score * results_count + 5 * affix_count) / results_count
             ranked.append((pattern, results, avg_score))
         
         # ترتيب تنازلي حسب النقاط
@@ -310,76 +673,175 @@ class PatternRanker:
 
 class BatchProcessor:
     """معالج دُفعات متقدم للملفات الكبيرة"""
-    def __init__(self, chunk_size=1000, save_interval=5000):
+    def __init__(self, chunk_size=1000, save_interval=5000, max_workers=None):
         self.chunk_size = chunk_size
         self.save_interval = save_interval
+        self.max_workers = max_workers or available_cpu_count()
+        self.read_size = 1 << 20  # حجم كتلة القراءة (1MB)
         self.processed_count = 0
-        self.checkpoint_file = "processing_checkpoint.pkl"
+        self.saved_rows = 0
+        # النتائج تُلحق بملف سطري (JSON لكل سطر)، والعدّادات في ملف منفصل صغير
+        self.checkpoint_file = "processing_checkpoint.ndjson"
+        self.meta_file = "processing_checkpoint.meta"
         
-    def save_checkpoint(self, data):
-        """حفظ نقطة استعادة"""
-        with open(self.checkpoint_file, 'wb') as f:
-            pickle.dump({
+    def save_checkpoint(self, new_rows):
+        """حفظ نقطة استعادة (إلحاق النتائج الجديدة فقط ثم تحديث العدّادات)
+
+        النتائج تُحفظ بصيغة JSON، فيجب أن تكون من أنواعها (نصوص وأعداد وقوائم/صفوف وقواميس)؛
+        النتائج المتسلسلة (كالصفوف tuple، وهي ما تُرجعه دوال المعالجة عادة) تُحفظ قوائم
+        وتُعاد صفوفاً عند التحميل.
+        """
+        # التسلسل قبل فتح الملف، فلا يُلحق جزء من الدفعة إن تعذر تسلسل إحدى نتائجها
+        encoded = []
+        for row in new_rows:
+            try:
+                encoded.append(json_dumps_bytes(row) + b'\n')
+            except (TypeError, ValueError) as e:
+                raise TypeError(
+                    f"تعذر حفظ نقطة الاستعادة: النتيجة {row!r} ليست قابلة للتحويل إلى JSON "
+                    f"(يجب أن تُرجع دالة المعالجة نصوصاً وأعداداً وقوائم/صفوفاً وقواميس): {e}"
+                ) from e
+        with open(self.checkpoint_file, 'ab') as f:
+            f.write(b''.join(encoded))
+        self.saved_rows += len(new_rows)
+        
+        # كتابة العدّادات في ملف مؤقت ثم استبداله لتجنب ملف ناقص عند الانقطاع
+        tmp_meta = self.meta_file + '.tmp'
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump({
                 'processed_count': self.processed_count,
-                'timestamp': datetime.now(),
-                'data': data
+                'saved_rows': self.saved_rows,
+                'timestamp': datetime.now().isoformat(sep=' ', timespec='seconds')
             }, f)
+        os.replace(tmp_meta, self.meta_file)
     
     def load_checkpoint(self):
         """تحميل نقطة الاستعادة"""
+        if not os.path.exists(self.meta_file):
+            return None
+        with open(self.meta_file, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        
+        # قراءة النتائج المثبتة في ملف العدّادات فقط (ما أُلحق بعدها لم يكتمل)
+        data = []
         if os.path.exists(self.checkpoint_file):
             with open(self.checkpoint_file, 'rb') as f:
-                return pickle.load(f)
-        return None
+                for _, line in zip(range(meta['saved_rows']), f):
+                    row = json_loads(line)
+                    # JSON لا يميز الصف من القائمة، فتُعاد النتائج صفوفاً كما في التشغيل الجديد
+                    data.append(tuple(row) if isinstance(row, list) else row)
+        meta['data'] = data
+        return meta
     
-    def process_file_in_chunks(self, file_path, process_func):
-        """معالجة الملف على دفعات"""
+    def clear_checkpoint(self):
+        """حذف ملفات نقطة الاستعادة"""
+        for path in (self.checkpoint_file, self.meta_file):
+            if os.path.exists(path):
+                os.remove(path)
+        self.saved_rows = 0
+    
+    def iter_chunks(self, file):
+        """توليد دفعات من الأسطر مع حجمها بالبايت
+
+        file مفتوح بالوضع الثنائي: يُقرأ بكتل كبيرة ويُقسَّم على b'\\n'،
+        ثم يُفك ترميز كل دفعة مرة واحدة بدل فك ترميز كل سطر على حدة.
+        """
+        tail = b''
+        while True:
+            block = file.read(self.read_size)
+            if not block:
+                break
+            raw_lines = (tail + block).split(b'\n')
+            tail = raw_lines.pop()  # بقية سطر لم يكتمل بعد
+            for i in range(0, len(raw_lines), self.chunk_size):
+                raw_chunk = b'\n'.join(raw_lines[i:i + self.chunk_size])
+                chunk = [line.strip() for line in raw_chunk.decode('utf-8').split('\n')]
+                yield chunk, len(raw_chunk) + 1  # مع فاصل السطر الأخير
+        if tail:
+            yield [tail.decode('utf-8').strip()], len(tail)
+    
+    def _make_executor(self, process_func, initializer, initargs):
+        """منفذ الدفعات: عمليات متوازية إن أمكن تسلسل process_func، وإلا خيط واحد"""
+        try:
+            pickle.dumps(process_func)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            logging.info("دالة المعالجة غير قابلة للتسلسل، فتُعالج الدفعات تسلسلياً")
+            return concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, initializer=initializer, initargs=initargs
+            )
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=initializer, initargs=initargs
+        )
+    
+    def process_file_in_chunks(self, file_path, process_func, initializer=None, initargs=()):
+        """معالجة الملف على دفعات متوازية
+
+        process_func: دالة تأخذ قائمة أسطر وتُرجع قائمة نتائجها. تُوزَّع الدفعات على عمليات
+        متوازية إن أمكن تسلسل process_func بـ pickle (دالة على مستوى الوحدة)؛ أما الدوال
+        المجهولة (lambda) والدوال المتداخلة والدوال المرتبطة بكائن فتُعالَج بها الدفعات
+        تسلسلياً في خيط واحد. البيانات الثابتة المشتركة تُمرَّر مرة واحدة لكل عملية
+        عبر initializer/initargs (وفي المسار التسلسلي يُستدعى initializer مرة واحدة).
+        """
         checkpoint = self.load_checkpoint()
         start_line = 0
+        results = []
         
         if checkpoint:
             response = input(f"تم العثور على نقطة استعادة ({checkpoint['timestamp']}). هل تريد المتابعة من حيث توقفت؟ (y/n): ")
             if response.lower() == 'y':
                 start_line = checkpoint['processed_count']
+                results = checkpoint['data']
                 logging.info(f"متابعة المعالجة من السطر {start_line}")
         
-        results = []
-        chunk = []
+        self.processed_count = start_line
+        self.clear_checkpoint()
+        if start_line:
+            # إعادة كتابة الملف بالنتائج المثبتة فقط قبل متابعة الإلحاق
+            self.save_checkpoint(results)
+        last_saved = start_line
         
-        with open(file_path, 'r', encoding='utf-8') as file:
-            # تخطي الأسطر المعالجة سابقاً
+        with open(file_path, 'rb', buffering=self.read_size) as file:
+            # تخطي الأسطر المعالجة سابقاً (دون فك ترميزها)
+            skipped_bytes = 0
             for _ in range(start_line):
-                next(file, None)
+                line = file.readline()
+                if not line:
+                    break
+                skipped_bytes += len(line)
             
-            # معالجة باقي الملف
-            with tqdm(total=sum(1 for _ in open(file_path, 'r', encoding='utf-8')) - start_line,
-                     desc="معالجة الملف", unit="سطر") as pbar:
+            # معالجة باقي الملف (التقدم بالبايت بدل قراءة الملف مرتين لعدّ الأسطر)
+            with tqdm(total=os.path.getsize(file_path), initial=skipped_bytes,
+                     desc="معالجة الملف", unit="B", unit_scale=True) as pbar, \
+                 self._make_executor(process_func, initializer, initargs) as executor:
                 
-                for line_num, line in enumerate(file, start=start_line):
-                    chunk.append(line.strip())
-                    self.processed_count = line_num
-                    
-                    # معالجة الدفعة عند الوصول للحجم المحدد
-                    if len(chunk) >= self.chunk_size:
-                        chunk_results = process_func(chunk)
-                        results.extend(chunk_results)
-                        chunk = []
-                        pbar.update(self.chunk_size)
+                # نافذة محدودة من الدفعات قيد المعالجة حتى لا يُقرأ الملف كله إلى الذاكرة،
+                # وتُجمع النتائج بالترتيب لتبقى نقطة الاستعادة متسقة
+                pending = deque()
+                max_pending = self.max_workers * 2
+                
+                def collect():
+                    nonlocal last_saved
+                    future, line_count, chunk_bytes = pending.popleft()
+                    results.extend(future.result())
+                    self.processed_count += line_count
+                    pbar.update(chunk_bytes)
                     
-                    # حفظ نقطة استعادة
-                    if line_num % self.save_interval == 0:
-                        self.save_checkpoint(results)
-                        logging.info(f"تم حفظ نقطة استعادة عند السطر {line_num}")
+                    # حفظ نقطة استعادة عند حدود الدفعات
+                    if self.processed_count - last_saved >= self.save_interval:
+                        self.save_checkpoint(results[self.saved_rows:])
+                        last_saved = self.processed_count
+                        logging.info(f"تم حفظ نقطة استعادة عند السطر {self.processed_count}")
+                
+                for chunk, chunk_bytes in self.iter_chunks(file):
+                    pending.append((executor.submit(process_func, chunk), len(chunk), chunk_bytes))
+                    if len(pending) >= max_pending:
+                        collect()
                 
-                # معالجة آخر دفعة
-                if chunk:
-                    chunk_results = process_func(chunk)
-                    results.extend(chunk_results)
-                    pbar.update(len(chunk))
+                while pending:
+                    collect()
         
-        # حذف ملف نقطة الاستعادة بعد الانتهاء
-        if os.path.exists(self.checkpoint_file):
-            os.remove(self.checkpoint_file)
+        # حذف ملفات نقطة الاستعادة بعد الانتهاء
+        self.clear_checkpoint()
         
         return results
 
@@ -387,6 +849,172 @@ class BatchProcessor:
 # مولد التقارير
 ##################################
 
+REPORT_HTML_HEAD = """<!DOCTYPE html>
+<html dir="rtl" lang="ar">
+<head>
+    <meta charset="UTF-8">
+    <title>تقرير التحليل الصرفي</title>
+    <style>
+        body {
+            font-family: 'Arial', 'Tahoma', sans-serif;
+            margin: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background-color: white;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 0 0 10px rgba(0,0,0,0.1);
+        }
+        h1, h2 {
+            color: #333;
+            border-bottom: 2px solid #4CAF50;
+            padding-bottom: 10px;
+        }
+        .stats-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin: 20px 0;
+        }
+        .stat-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px;
+            border-radius: 10px;
+            text-align: center;
+        }
+        .stat-number {
+            font-size: 2em;
+            font-weight: bold;
+            margin: 10px 0;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+        }
+        th, td {
+            padding: 12px;
+            text-align: right;
+            border-bottom: 1px solid #ddd;
+        }
+        th {
+            background-color: #4CAF50;
+            color: white;
+        }
+        tr:hover {
+            background-color: #f5f5f5;
+        }
+        .chart-container {
+            margin: 20px 0;
+            text-align: center;
+        }
+        .timestamp {
+            text-align: center;
+            color: #666;
+            margin-top: 20px;
+        }
+        .progress-bar {
+            background-color: #f0f0f0;
+            border-radius: 10px;
+            overflow: hidden;
+            margin: 10px 0;
+        }
+        .progress-fill {
+            background: linear-gradient(90deg, #4CAF50, #45a049);
+            height: 30px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            color: white;
+            font-weight: bold;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>📊 تقرير التحليل الصرفي</h1>
+"""
+
+# أجزاء تقرير HTML (تُجهَّز مرة واحدة عند تحميل الوحدة وتُملأ بـ str.format)
+REPORT_HTML_STATS = """
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div>إجمالي النتائج</div>
+                <div class="stat-number">{total_results}</div>
+            </div>
+            <div class="stat-card">
+                <div>الكلمات الفريدة</div>
+                <div class="stat-number">{unique_words}</div>
+            </div>
+            <div class="stat-card">
+                <div>عدد الأوزان</div>
+                <div class="stat-number">{total_patterns}</div>
+            </div>
+            <div class="stat-card">
+                <div>عدد الجذور</div>
+                <div class="stat-number">{total_roots}</div>
+            </div>
+        </div>
+        """
+
+REPORT_HTML_PATTERNS_TITLE = """
+        <h2>🏆 الأوزان الأكثر شيوعاً</h2>
+"""
+
+REPORT_HTML_ROOTS_TITLE = """
+        <h2>🌳 الجذور الأكثر شيوعاً</h2>
+"""
+
+REPORT_HTML_TABLE_HEAD = """        <table>
+            <thead>
+                <tr>
+                    <th>الترتيب</th>
+                    <th>{label}</th>
+                    <th>التكرار</th>
+                    <th>النسبة المئوية</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+
+REPORT_HTML_TABLE_ROW = """                <tr>
+                    <td>{rank}</td>
+                    <td style="font-weight: bold;">{item}</td>
+                    <td>{freq}</td>
+                    <td>
+                        <div class="progress-bar">
+                            <div class="progress-fill" style="width: {width}%;">
+                                {percent:.1f}%
+                            </div>
+                        </div>
+                    </td>
+                </tr>
+"""
+
+REPORT_HTML_TABLE_TAIL = """            </tbody>
+        </table>
+"""
+
+REPORT_HTML_TAIL = """
+        <div class="chart-container">
+            <h2>📈 الرسوم البيانية</h2>
+            <img src="patterns_chart.svg" alt="توزيع الأوزان" style="max-width: 100%;">
+            <img src="roots_chart.svg" alt="توزيع الجذور" style="max-width: 100%;">
+        </div>
+        
+        <div class="timestamp">
+            تم إنشاء التقرير: {timestamp}
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
 class ReportGenerator:
     """مولد تقارير HTML وExcel"""
     def __init__(self, db_manager):
@@ -434,22 +1062,19 @@ class ReportGenerator:
                                    unrecognized_file_name="unrecognized_words.txt",
                                    coverage_html_name="coverage.html"):
         """توليد ملفات التغطية: قوائم الكلمات وملف HTML تفاعلي صغير"""
-        # حساب المجموعات
-        all_words_sorted = sorted(all_words_set)
+        # حساب المجموعات (الكلمات المتعرَّف عليها قد تتضمن ما ليس في المدونة، فيُبقى التقاطع)
         recognized_sorted = sorted(recognized_set & all_words_set)
         unrecognized_sorted = sorted(all_words_set - recognized_set)
 
-        # كتابة الملفات النصية
+        # كتابة الملفات النصية (كتابة واحدة لكل ملف)
         recognized_path = self.report_dir / recognized_file_name
         unrecognized_path = self.report_dir / unrecognized_file_name
 
         with open(recognized_path, 'w', encoding='utf-8') as f:
-            for w in recognized_sorted:
-                f.write(w + "\n")
+            f.write(''.join(w + "\n" for w in recognized_sorted))
 
         with open(unrecognized_path, 'w', encoding='utf-8') as f:
-            for w in unrecognized_sorted:
-                f.write(w + "\n")
+            f.write(''.join(w + "\n" for w in unrecognized_sorted))
 
         # إنشاء HTML تفاعلي بسيط (Canvas) بدون مكتبات خارجية
         recognized_count = len(recognized_sorted)
@@ -573,7 +1198,7 @@ class ReportGenerator:
         logging.info(f"تم إنشاء ملفات التغطية: {recognized_path}, {unrecognized_path}, {coverage_path}")
 
         return {
-            'total_words': len(all_words_sorted),
+            'total_words': len(all_words_set),
             'recognized': recognized_count,
             'unrecognized': unrecognized_count,
             'recognized_file': str(recognized_path),
@@ -581,213 +1206,36 @@ class ReportGenerator:
             'coverage_html': str(coverage_path)
         }
 
+    @staticmethod
+    def _iter_frequency_table(label, items, max_freq, total_freq):
+        """توليد أجزاء جدول التكرارات (الترتيب، العنصر، التكرار، النسبة) لتقرير HTML"""
+        yield REPORT_HTML_TABLE_HEAD.format(label=label)
+        for i, (item, freq) in enumerate(items, 1):
+            yield REPORT_HTML_TABLE_ROW.format(
+                rank=i, item=html.escape(str(item)), freq=freq,
+                width=(freq / max_freq) * 100, percent=(freq / total_freq) * 100
+            )
+        yield REPORT_HTML_TABLE_TAIL
+
     def generate_html_report(self, stats, output_file="report.html"):
-        """توليد تقرير HTML"""
-        template_str = '''
-        <!DOCTYPE html>
-        <html dir="rtl" lang="ar">
-        <head>
-            <meta charset="UTF-8">
-            <title>تقرير التحليل الصرفي</title>
-            <style>
-                body {
-                    font-family: 'Arial', 'Tahoma', sans-serif;
-                    margin: 20px;
-                    background-color: #f5f5f5;
-                }
-                .container {
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    background-color: white;
-                    padding: 20px;
-                    border-radius: 10px;
-                    box-shadow: 0 0 10px rgba(0,0,0,0.1);
-                }
-                h1, h2 {
-                    color: #333;
-                    border-bottom: 2px solid #4CAF50;
-                    padding-bottom: 10px;
-                }
-                .stats-grid {
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 20px;
-                    margin: 20px 0;
-                }
-                .stat-card {
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 20px;
-                    border-radius: 10px;
-                    text-align: center;
-                }
-                .stat-number {
-                    font-size: 2em;
-                    font-weight: bold;
-                    margin: 10px 0;
-                }
-                table {
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin: 20px 0;
-                }
-                th, td {
-                    padding: 12px;
-                    text-align: right;
-                    border-bottom: 1px solid #ddd;
-                }
-                th {
-                    background-color: #4CAF50;
-                    color: white;
-                }
-                tr:hover {
-                    background-color: #f5f5f5;
-                }
-                .chart-container {
-                    margin: 20px 0;
-                    text-align: center;
-                }
-                .timestamp {
-                    text-align: center;
-                    color: #666;
-                    margin-top: 20px;
-                }
-                .progress-bar {
-                    background-color: #f0f0f0;
-                    border-radius: 10px;
-                    overflow: hidden;
-                    margin: 10px 0;
-                }
-                .progress-fill {
-                    background: linear-gradient(90deg, #4CAF50, #45a049);
-                    height: 30px;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    color: white;
-                    font-weight: bold;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>📊 تقرير التحليل الصرفي</h1>
-                
-                <div class="stats-grid">
-                    <div class="stat-card">
-                        <div>إجمالي النتائج</div>
-                        <div class="stat-number">{{ total_results }}</div>
-                    </div>
-                    <div class="stat-card">
-                        <div>الكلمات الفريدة</div>
-                        <div class="stat-number">{{ unique_words }}</div>
-                    </div>
-                    <div class="stat-card">
-                        <div>عدد الأوزان</div>
-                        <div class="stat-number">{{ total_patterns }}</div>
-                    </div>
-                    <div class="stat-card">
-                        <div>عدد الجذور</div>
-                        <div class="stat-number">{{ total_roots }}</div>
-                    </div>
-                </div>
-                
-                <h2>🏆 الأوزان الأكثر شيوعاً</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>الترتيب</th>
-                            <th>الوزن</th>
-                            <th>التكرار</th>
-                            <th>النسبة المئوية</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for i, (pattern, freq) in enumerate(top_patterns, 1) %}
-                        <tr>
-                            <td>{{ i }}</td>
-                            <td style="font-weight: bold;">{{ pattern }}</td>
-                            <td>{{ freq }}</td>
-                            <td>
-                                <div class="progress-bar">
-                                    <div class="progress-fill" style="width: {{ (freq/max_pattern_freq)*100 }}%;">
-                                        {{ "%.1f"|format((freq/total_pattern_freq)*100) }}%
-                                    </div>
-                                </div>
-                            </td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-                
-                <h2>🌳 الجذور الأكثر شيوعاً</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>الترتيب</th>
-                            <th>الجذر</th>
-                            <th>التكرار</th>
-                            <th>النسبة المئوية</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for i, (root, freq) in enumerate(top_roots, 1) %}
-                        <tr>
-                            <td>{{ i }}</td>
-                            <td style="font-weight: bold;">{{ root }}</td>
-                            <td>{{ freq }}</td>
-                            <td>
-                                <div class="progress-bar">
-                                    <div class="progress-fill" style="width: {{ (freq/max_root_freq)*100 }}%;">
-                                        {{ "%.1f"|format((freq/total_root_freq)*100) }}%
-                                    </div>
-                                </div>
-                            </td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-                
-                <div class="chart-container">
-                    <h2>📈 الرسوم البيانية</h2>
-                    <img src="patterns_chart.png" alt="توزيع الأوزان" style="max-width: 100%;">
-                    <img src="roots_chart.png" alt="توزيع الجذور" style="max-width: 100%;">
-                </div>
-                
-                <div class="timestamp">
-                    تم إنشاء التقرير: {{ timestamp }}
-                </div>
-            </div>
-        </body>
-        </html>
-        '''
-        
-        template = Template(template_str)
-        
+        """توليد تقرير HTML (من قوالب نصية مجهزة مسبقاً تُكتب إلى الملف مباشرة)"""
         # حساب الإحصائيات الإضافية
         max_pattern_freq = max([f for _, f in stats['top_patterns']]) if stats['top_patterns'] else 1
         total_pattern_freq = sum([f for _, f in stats['top_patterns']])
         max_root_freq = max([f for _, f in stats['top_roots']]) if stats['top_roots'] else 1
         total_root_freq = sum([f for _, f in stats['top_roots']])
         
-        html_content = template.render(
-            total_results=stats['total_results'],
-            unique_words=stats['unique_words'],
-            total_patterns=stats['total_patterns'],
-            total_roots=stats['total_roots'],
-            top_patterns=stats['top_patterns'],
-            top_roots=stats['top_roots'],
-            max_pattern_freq=max_pattern_freq,
-            total_pattern_freq=total_pattern_freq,
-            max_root_freq=max_root_freq,
-            total_root_freq=total_root_freq,
-            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            enumerate=enumerate
-        )
-        
         output_path = self.report_dir / output_file
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(REPORT_HTML_HEAD)
+            f.write(REPORT_HTML_STATS.format(**stats))
+            f.write(REPORT_HTML_PATTERNS_TITLE)
+            f.writelines(self._iter_frequency_table('الوزن', stats['top_patterns'],
+                                                    max_pattern_freq, total_pattern_freq))
+            f.write(REPORT_HTML_ROOTS_TITLE)
+            f.writelines(self._iter_frequency_table('الجذر', stats['top_roots'],
+                                                    max_root_freq, total_root_freq))
+            f.write(REPORT_HTML_TAIL.format(timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
         
         # توليد الرسوم البيانية
         self.generate_charts(stats)
@@ -796,68 +1244,130 @@ class ReportGenerator:
         return output_path
     
     def generate_charts(self, stats):
-        """توليد الرسوم البيانية"""
-        plt.rcParams['font.family'] = ['Arial Unicode MS', 'Tahoma']
-        
+        """توليد الرسوم البيانية (ملفات SVG مباشرة دون matplotlib)"""
         # رسم بياني للأوزان
         if stats['top_patterns']:
             patterns, frequencies = zip(*stats['top_patterns'])
-            
-            plt.figure(figsize=(12, 6))
-            plt.bar(range(len(patterns)), frequencies, color='#4CAF50')
-            plt.xlabel('الوزن', fontsize=12)
-            plt.ylabel('التكرار', fontsize=12)
-            plt.title('الأوزان الأكثر شيوعاً', fontsize=14, fontweight='bold')
-            plt.xticks(range(len(patterns)), patterns, rotation=45, ha='right')
-            plt.tight_layout()
-            plt.savefig(self.report_dir / 'patterns_chart.png', dpi=100, bbox_inches='tight')
-            plt.close()
+            self._write_bar_chart(self.report_dir / 'patterns_chart.svg', patterns, frequencies,
+                                  '#4CAF50', 'الأوزان الأكثر شيوعاً', 'الوزن', 'التكرار')
         
         # رسم بياني للجذور
         if stats['top_roots']:
             roots, frequencies = zip(*stats['top_roots'])
-            
-            plt.figure(figsize=(12, 6))
-            plt.bar(range(len(roots)), frequencies, color='#2196F3')
-            plt.xlabel('الجذر', fontsize=12)
-            plt.ylabel('التكرار', fontsize=12)
-            plt.title('الجذور الأكثر شيوعاً', fontsize=14, fontweight='bold')
-            plt.xticks(range(len(roots)), roots, rotation=45, ha='right')
-            plt.tight_layout()
-            plt.savefig(self.report_dir / 'roots_chart.png', dpi=100, bbox_inches='tight')
-            plt.close()
+            self._write_bar_chart(self.report_dir / 'roots_chart.svg', roots, frequencies,
+                                  '#2196F3', 'الجذور الأكثر شيوعاً', 'الجذر', 'التكرار')
+    
+    # هوامش الرسم: يسار، يمين، أعلى، أسفل
+    CHART_MARGINS = (80, 20, 60, 140)
     
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _chart_frame(width, height):
+        """الإطار الثابت المشترك بين الرسوم: رأس SVG وأصناف CSS والخلفية والمحوران
+
+        يُبنى مرة واحدة لكل مقاس ويُعاد استعماله لكل رسم، ويبقى ما يخص الرسم
+        (العنوان واللون والأعمدة) في _write_bar_chart.
+        """
+        left, right, top, bottom = ReportGenerator.CHART_MARGINS
+        base_y = height - bottom
+        # الخصائص المتكررة في أصناف CSS بدل تكرارها في كل عنصر
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="Arial, Tahoma, sans-serif">'
+            f'<style>.t{{font-size:12px;text-anchor:end}}.l{{font-size:14px;text-anchor:end}}'
+            f'.c{{font-size:14px;text-anchor:middle}}.a{{stroke:#333}}</style>'
+            f'<rect width="{width}" height="{height}" fill="#fff"/>'
+            # المحوران
+            f'<path class="a" d="M{left} {top}V{base_y}H{width - right}" fill="none"/>'
+        )
+    
+    @staticmethod
+    def _write_bar_chart(path, labels, values, color, title, xlabel, ylabel,
+                         width=1200, height=600):
+        """كتابة رسم أعمدة بسيط بصيغة SVG"""
+        left, right, top, bottom = ReportGenerator.CHART_MARGINS
+        plot_w = width - left - right
+        plot_h = height - top - bottom
+        base_y = top + plot_h
+        max_value = max(max(values), 1)
+        slot = plot_w / len(values)
+        bar_w = slot * 0.8
+        
+        parts = [
+            ReportGenerator._chart_frame(width, height),
+            f'<text class="c" x="{width / 2:g}" y="{top / 2:g}" font-size="20" '
+            f'font-weight="bold">{html.escape(title)}</text>',
+        ]
+        
+        # خطوط تدريج المحور العمودي
+        for i in range(5):
+            tick = max_value * i / 4
+            y = base_y - plot_h * i / 4
+            parts.append(f'<text class="t" x="{left - 8}" y="{y + 4:.1f}">{tick:g}</text>')
+        
+        # الأعمدة كلها في مسار واحد، ثم تسمياتها
+        ly = base_y + 16
+        bars = []
+        for i, (label, value) in enumerate(zip(labels, values)):
+            bar_h = plot_h * value / max_value
+            x = left + i * slot + (slot - bar_w) / 2
+            cx = x + bar_w / 2
+            bars.append(f'M{x:.1f} {base_y}v-{bar_h:.1f}h{bar_w:.1f}v{bar_h:.1f}z')
+            parts.append(f'<text class="l" x="{cx:.1f}" y="{ly}" '
+                         f'transform="rotate(-45 {cx:.1f} {ly})">{html.escape(str(label))}</text>')
+        parts.append(f'<path fill="{color}" d="{"".join(bars)}"/>')
+        
+        parts.append(f'<text class="c" x="{left + plot_w / 2:g}" y="{height - 10}">{html.escape(xlabel)}</text>')
+        parts.append(f'<text class="c" x="20" y="{top + plot_h / 2:g}" '
+                     f'transform="rotate(-90 20 {top + plot_h / 2:g})">{html.escape(ylabel)}</text>')
+        parts.append('</svg>')
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
+    
+    @staticmethod
+    def _excel_sheets(stats):
+        """أوراق تقرير Excel: (اسم الورقة، الترويسة، الصفوف)"""
+        yield 'ملخص', ('المؤشر', 'القيمة'), (
+            ('إجمالي النتائج', stats['total_results']),
+            ('الكلمات الفريدة', stats['unique_words']),
+            ('عدد الأوزان', stats['total_patterns']),
+            ('عدد الجذور', stats['total_roots']),
+        )
+        if stats['top_patterns']:
+            yield 'الأوزان', ('الوزن', 'التكرار'), stats['top_patterns']
+        if stats['top_roots']:
+            yield 'الجذور', ('الجذر', 'التكرار'), stats['top_roots']
+
     def generate_excel_report(self, stats, output_file="report.xlsx"):
         """توليد تقرير Excel"""
         output_path = self.report_dir / output_file
         
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # ورقة الإحصائيات العامة
-            summary_data = {
-                'المؤشر': ['إجمالي النتائج', 'الكلمات الفريدة', 'عدد الأوزان', 'عدد الجذور'],
-                'القيمة': [stats['total_results'], stats['unique_words'], 
-                          stats['total_patterns'], stats['total_roots']]
-            }
-            df_summary = pd.DataFrame(summary_data)
-            df_summary.to_excel(writer, sheet_name='ملخص', index=False)
-            
-            # ورقة الأوزان
-            if stats['top_patterns']:
-                patterns_data = {
-                    'الوزن': [p for p, _ in stats['top_patterns']],
-                    'التكرار': [f for _, f in stats['top_patterns']]
-                }
-                df_patterns = pd.DataFrame(patterns_data)
-                df_patterns.to_excel(writer, sheet_name='الأوزان', index=False)
-            
-            # ورقة الجذور
-            if stats['top_roots']:
-                roots_data = {
-                    'الجذر': [r for r, _ in stats['top_roots']],
-                    'التكرار': [f for _, f in stats['top_roots']]
-                }
-                df_roots = pd.DataFrame(roots_data)
-                df_roots.to_excel(writer, sheet_name='الجذور', index=False)
+        xlsxwriter = import_optional('xlsxwriter') if XLSXWRITER_SUPPORT else None
+        openpyxl = import_optional('openpyxl') if xlsxwriter is None and OPENPYXL_SUPPORT else None
+        if xlsxwriter is not None:
+            # كتابة الصفوف مباشرة دون بناء DataFrame مع تدفق الأوراق إلى القرص
+            workbook = xlsxwriter.Workbook(str(output_path), {'constant_memory': True, 'use_zip64': True})
+            try:
+                for sheet_name, header, rows in self._excel_sheets(stats):
+                    ws = workbook.add_worksheet(sheet_name)
+                    ws.write_row(0, 0, header)
+                    for i, row in enumerate(rows, 1):
+                        ws.write_row(i, 0, row)
+            finally:
+                workbook.close()
+        elif openpyxl is not None:
+            # وضع الكتابة فقط: تُسلسل الصفوف عند إضافتها دون الاحتفاظ بشجرة الخلايا في الذاكرة
+            workbook = openpyxl.Workbook(write_only=True)
+            for sheet_name, header, rows in self._excel_sheets(stats):
+                ws = workbook.create_sheet(sheet_name)
+                ws.append(header)
+                for row in rows:
+                    ws.append(row)
+            workbook.save(output_path)
+        else:
+            logging.warning("لا تتوفر مكتبة xlsxwriter ولا openpyxl. لن يُنشأ تقرير Excel. قم بتثبيت إحداهما: pip install xlsxwriter")
+            return None
         
         logging.info(f"تم إنشاء تقرير Excel: {output_path}")
         return output_path
@@ -906,25 +1416,67 @@ class CrossValidator:
         self.validation_results.append(validation_result)
         return validation_result
     
+    def validate_batch(self, analyses):
+        """التحقق من مجموعة تحليلات دفعة واحدة
+
+        analyses: قائمة من (original_word, root, pattern, prefix, suffix)
+        التحليلات المتكررة في المدونة كثيرة، فتُحسب نسبة التشابه مرة واحدة لكل زوج فريد.
+        """
+        reconstruct_word = self.reconstruct_word
+        reconstructed = [reconstruct_word(root, pattern, prefix, suffix)
+                         for _, root, pattern, prefix, suffix in analyses]
+        
+        similarity = {}
+        for original, rebuilt in zip((a[0] for a in analyses), reconstructed):
+            if (original, rebuilt) not in similarity:
+                similarity[(original, rebuilt)] = self.calculate_similarity(original, rebuilt)
+        
+        batch = []
+        for (original_word, root, pattern, prefix, suffix), rebuilt in zip(analyses, reconstructed):
+            match_ratio = similarity[(original_word, rebuilt)]
+            batch.append({
+                'original': original_word,
+                'reconstructed': rebuilt,
+                'root': root,
+                'pattern': pattern,
+                'prefix': prefix,
+                'suffix': suffix,
+                'match_ratio': match_ratio,
+                'is_valid': match_ratio > 0.8  # عتبة 80% للصحة
+            })
+        
+        self.validation_results.extend(batch)
+        return batch
+    
     def calculate_similarity(self, word1, word2):
         """حساب نسبة التشابه بين كلمتين"""
         # إزالة التشكيل للمقارنة
-        word1_clean = re.sub(r'[ًٌٍَُِّْ]', '', word1)
-        word2_clean = re.sub(r'[ًٌٍَُِّْ]', '', word2)
+        word1_clean = word1.translate(DROP_DIACRITICS_TABLE)
+        word2_clean = word2.translate(DROP_DIACRITICS_TABLE)
         
         if word1_clean == word2_clean:
             return 1.0
         
-        # حساب نسبة التشابه باستخدام Levenshtein distance
+        # المسافة لا تقل عن فرق الطولين، فإذا بلغ الفرق 20% من أطول الكلمتين
+        # لم تتجاوز النسبة عتبة الصحة (0.8)، فيُعاد هذا الحد الأعلى دون حساب المسافة
         max_len = max(len(word1_clean), len(word2_clean))
-        if max_len == 0:
-            return 0.0
+        length_gap = abs(len(word1_clean) - len(word2_clean))
+        if length_gap / max_len >= 0.2:
+            return 1.0 - length_gap / max_len
+        
+        if RAPIDFUZZ_SUPPORT:
+            # تساوي 1 - المسافة / أطول الكلمتين
+            return RapidLevenshtein.normalized_similarity(word1_clean, word2_clean)
         
+        # حساب نسبة التشابه باستخدام Levenshtein distance
         distance = self.levenshtein_distance(word1_clean, word2_clean)
         return 1.0 - (distance / max_len)
     
     def levenshtein_distance(self, s1, s2):
         """حساب مسافة Levenshtein"""
+        if RAPIDFUZZ_SUPPORT:
+            return RapidLevenshtein.distance(s1, s2)
+        
         if len(s1) < len(s2):
             return self.levenshtein_distance(s2, s1)
         
@@ -943,14 +1495,19 @@ class CrossValidator:
         
         return previous_row[-1]
     
+    def get_validation_stats(self):
+        """أعداد التحقق دون بناء التقرير: {'total', 'valid', 'invalid'}"""
+        total = len(self.validation_results)
+        valid = sum(1 for r in self.validation_results if r['is_valid'])
+        return {'total': total, 'valid': valid, 'invalid': total - valid}
+    
     def get_validation_report(self):
         """الحصول على تقرير التحقق"""
         if not self.validation_results:
             return "لا توجد نتائج للتحقق"
         
-        total = len(self.validation_results)
-        valid = sum(1 for r in self.validation_results if r['is_valid'])
-        invalid = total - valid
+        validation_stats = self.get_validation_stats()
+        total, valid, invalid = validation_stats['total'], validation_stats['valid'], validation_stats['invalid']
         
         report = f"""
         تقرير التحقق التبادلي:
@@ -1008,61 +1565,99 @@ class MemoryOptimizer:
 
 class ArabicProcessor:
    def __init__(self, optional_tashkeel=False, symbols_map=None, cache_manager=None):
-       self.arabic_diacritics_pattern = re.compile("[ًٌٍَُِّْ]")
+       self.arabic_diacritics_pattern = DIACRITICS_RE
        self.optional_tashkeel = optional_tashkeel
        self.arabic_symbols = symbols_map if symbols_map else {}
        self.cache_manager = cache_manager
 
    def add_optional_tashkeel_and_grouping(self, pattern):
        if self.optional_tashkeel:
-           return re.sub(self.arabic_diacritics_pattern, lambda m: f"[{m.group()}]?", pattern)
+           return self.arabic_diacritics_pattern.sub(lambda m: f"[{m.group()}]?", pattern)
        else:
-           return re.sub(self.arabic_diacritics_pattern, lambda m: m.group(), pattern)
+           return pattern
 
    def replace_symbols(self, word):
        return ''.join(self.arabic_symbols.get(letter, letter) for letter in word)
 
+   @staticmethod
+   @functools.lru_cache(maxsize=None)
+   def required_literal(pattern):
+       """أطول نص ثابت لا بد أن يظهر في كل تطابق للنمط
+
+       يُستعمل مرشّحاً سريعاً: السطر الذي لا يحتوي هذا النص لا يمكن أن يطابق النمط.
+       الصنف ذو الحرف الواحد مثل [م] يُعدّ حرفاً ثابتاً، والعنصر الاختياري يقطع السلسلة.
+       يُعاد نص فارغ إذا احتوى النمط تراكيب لا يمكن تحليلها بأمان.
+       """
+       atoms = []  # (الحرف الثابت أو None، هل هو إلزامي)
+       i = 0
+       while i < len(pattern):
+           char = pattern[i]
+           if char == '[':
+               end = pattern.find(']', i + 2)
+               if end == -1:
+                   return ''
+               body = pattern[i + 1:end]
+               literal = body if len(body) == 1 and body not in '^-\\' else None
+               i = end + 1
+           elif char in '.^$*+?{}()|\\]':
+               return ''
+           else:
+               literal = char
+               i += 1
+           # المكمّمات الاختيارية تجعل العنصر غير إلزامي
+           quantifier = pattern[i] if i < len(pattern) else ''
+           if quantifier in ('?', '*', '{'):
+               if quantifier == '{':
+                   return ''
+               atoms.append((None, False))
+               i += 1
+           elif quantifier == '+':
+               atoms.append((literal, True))
+               atoms.append((None, True))
+               i += 1
+           else:
+               atoms.append((literal, True))
+
+       best = current = ''
+       for literal, required in atoms:
+           if literal is not None and required:
+               current += literal
+               if len(current) > len(best):
+                   best = current
+           else:
+               current = ''
+       return best
+
 
 class DiacriticsHandler:
    DIACRITICS = 'ًٌٍَُِّْْٰ'
+   # جدول حذف التشكيل (مرور واحد بـ str.translate)
+   _DROP_DIAC_TABLE = str.maketrans('', '', DIACRITICS)
 
    @staticmethod
    def remove_diacritics(word):
-       return ''.join(c for c in word if c not in DiacriticsHandler.DIACRITICS)
+       return word.translate(DiacriticsHandler._DROP_DIAC_TABLE)
+
+   # حرف (غير حركة) تتبعه حركاته؛ الحركات التي لا يسبقها حرف تُهمل
+   _LETTER_WITH_DIACRITICS_RE = re.compile(f"[^{DIACRITICS}][{DIACRITICS}]*", re.DOTALL)
 
    @staticmethod
    def group_letters_with_diacritics(word):
-       letters_with_diacritics = []
-       i = 0
-       while i < len(word):
-           c = word[i]
-           if c not in DiacriticsHandler.DIACRITICS:
-               letter = c
-               i += 1
-               while i < len(word) and word[i] in DiacriticsHandler.DIACRITICS:
-                   letter += word[i]
-                   i += 1
-               letters_with_diacritics.append(letter)
-           else:
-               i += 1
-       return letters_with_diacritics
+       return DiacriticsHandler._LETTER_WITH_DIACRITICS_RE.findall(word)
 
    @staticmethod
    def normalize_quranic_text(word):
        """تطبيع النص القرآني - توحيد الحروف والهمزات"""
-       # توحيد الهمزات
-       word = re.sub(r'[ءأإآ]', 'أ', word)
-       
-       # توحيد الألفات
-       word = re.sub(r'[اٱ]', 'ا', word)
-       
-       # إزالة الحروف القرآنية الخاصة
-       word = re.sub(r'[ٰٱٲٳٴٵٶٷٸٹٺٻټٽپٿۖۗۘۙۚۛۜ۝۞ۣ۟۠ۡۢۤۥۦۧۨ۩۪ۭ۫۬ۮۯ]', '', word)
-       
-       # توحيد التاءات
-       word = re.sub(r'ة', 'ت', word)
-       
-       return word
+       # توحيد الهمزات والألفات والتاءات وإزالة الحروف القرآنية الخاصة
+       return word.translate(NORMALIZE_TABLE)
+
+   # حذف التشكيل ثم التطبيع في جدول واحد: الحركات ليست من الحروف التي يوحّدها التطبيع
+   _STRIP_NORMALIZE_TABLE = {**NORMALIZE_TABLE, **_DROP_DIAC_TABLE}
+
+   @staticmethod
+   def strip_and_normalize(word):
+       """حذف التشكيل وتطبيع النص القرآني في مرور واحد (كـ remove_diacritics ثم normalize_quranic_text)"""
+       return word.translate(DiacriticsHandler._STRIP_NORMALIZE_TABLE)
 
 
 class WordSplitter:
@@ -1083,38 +1678,96 @@ class WordSplitter:
        if not root_positions:
            return '', '', target_word, ''
 
-       prefix_letters = []
-       root_letters = []
-       intermediate_letters = []
-       suffix_letters = []
-
        first_root_pos = root_positions[0]
        last_root_pos = root_positions[-1]
 
-       for idx, c in enumerate(template_letters):
-           target_char = target_letters[idx]
-           if c in WordSplitter.ROOT_INDICATORS:
-               root_letters.append(target_char)
-           else:
-               if idx < first_root_pos:
-                   prefix_letters.append(target_char)
-               elif idx > last_root_pos:
-                   suffix_letters.append(target_char)
-               else:
-                   intermediate_letters.append(target_char)
-
-       prefix = ''.join(prefix_letters)
-       intermediate = ''.join(intermediate_letters)
-       root = ''.join(root_letters)
-       suffix = ''.join(suffix_letters)
+       # ما قبل أول حرف أصلي سابقة، وما بعد آخرها لاحقة، والزوائد بينها حروف وسطى
+       prefix = ''.join(target_letters[:first_root_pos])
+       suffix = ''.join(target_letters[last_root_pos + 1:])
+       root = ''.join([target_letters[idx] for idx in root_positions])
+       intermediate = ''.join([target_letters[idx] for idx in range(first_root_pos + 1, last_root_pos)
+                               if template_letters[idx] not in WordSplitter.ROOT_INDICATORS])
 
        return prefix, intermediate, root, suffix
 
+##################################
+# قراءة فقرات ملفات docx
+##################################
+
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P, _W_R, _W_HYPERLINK = _W_NS + 'p', _W_NS + 'r', _W_NS + 'hyperlink'
+_W_T, _W_BR, _W_TYPE = _W_NS + 't', _W_NS + 'br', _W_NS + 'type'
+# عناصر المقطع الأخرى التي لها نص في python-docx
+_W_RUN_CHARS = {_W_NS + 'tab': '\t', _W_NS + 'ptab': '\t', _W_NS + 'cr': '\n', _W_NS + 'noBreakHyphen': '-'}
+# مواضع المقاطع التي تقرأ python-docx نصها: مقاطع الفقرة المباشرة ومقاطع روابطها
+_W_RUN_PATHS = {(_W_R,), (_W_HYPERLINK, _W_R)}
+
+def _docx_run_child_text(elem):
+    """نص عنصر داخل مقطع (w:r) كما تقرؤه python-docx (None لما لا نص له)"""
+    tag = elem.tag
+    if tag == _W_T:
+        return elem.text or ''
+    if tag == _W_BR:
+        # فاصل السطر سطر جديد، وفاصل الصفحة أو العمود لا نص له
+        return '\n' if elem.get(_W_TYPE, 'textWrapping') == 'textWrapping' else ''
+    return _W_RUN_CHARS.get(tag)
+
+def _iter_docx_xml_paragraphs(file_path):
+    """فقرات متن المستند من word/document.xml مباشرة بتحليل تدفقي دون بناء شجرة المستند
+
+    نص الفقرة كنص paragraph.text في python-docx: عناصر المقاطع المباشرة للفقرة ولروابطها فقط،
+    فلا يدخل فيه ما تحت w:ins أو w:smartTag أو w:fldSimple وأمثالها.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml_file:
+        depth = 0
+        path = None  # وسوم العناصر المفتوحة داخل الفقرة الحالية (None خارج الفقرات)
+        parts = []
+        for event, elem in xml_iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if path is not None:
+                    path.append(elem.tag)
+                elif elem.tag == _W_P and depth == 3:
+                    # فقرات المتن المباشرة فقط (كما في python-docx)، لا فقرات الجداول ومربعات النص
+                    path = []
+                    parts = []
+                continue
+            depth -= 1
+            if path is not None:
+                if not path:
+                    path = None
+                    yield ''.join(parts)
+                else:
+                    path.pop()
+                    if tuple(path) in _W_RUN_PATHS:
+                        text = _docx_run_child_text(elem)
+                        if text is not None:
+                            parts.append(text)
+            # تحرير العناصر المكتملة خارج الفقرات المفتوحة لإبقاء الذاكرة ثابتة
+            if path is None and depth <= 2:
+                elem.clear()
+
+def iter_docx_paragraphs(file_path):
+    """نصوص فقرات ملف docx، مع الرجوع إلى python-docx إذا تعذر تحليل XML مباشرة"""
+    yielded = False
+    try:
+        for text in _iter_docx_xml_paragraphs(file_path):
+            yielded = True
+            yield text
+    except (zipfile.BadZipFile, KeyError, SyntaxError) as e:
+        # ParseError في lxml وElementTree كلاهما مشتق من SyntaxError
+        docx = import_optional('docx') if DOCX_SUPPORT and not yielded else None
+        if docx is None:
+            raise
+        logging.warning(f"تعذر تحليل XML لملف docx {file_path}: {e}. استخدام python-docx.")
+        for paragraph in docx.Document(file_path).paragraphs:
+            yield paragraph.text
+
 ##################################
 # دالة اكتشاف نوع الملف تلقائياً
 ##################################
 
-def detect_file_type(file_path, sample_lines=50):
+def detect_file_type(file_path, sample_lines=50, sample_chars=64 * 1024):
     """
     اكتشاف نوع الملف تلقائياً: 'list' أو 'text'
     
@@ -1124,56 +1777,44 @@ def detect_file_type(file_path, sample_lines=50):
     - إذا كان أكثر من 80% من الأسطر تحتوي على كلمة واحدة فقط → 'list'
     - إذا كان أكثر من 50% من الأسطر تحتوي على أكثر من 3 كلمات → 'text'
     """
-    arabic_word_re = re.compile(r"[\u0621-\u064A\u064B-\u065F\u0670\u06D6-\u06DC\u06DF-\u06E8\u06EA-\u06ED]+")
-    word_counts = []
-    single_word_lines = 0
-    multi_word_lines = 0
-    
     file_ext = os.path.splitext(file_path)[1].lower()
     lines = []
     
     try:
         if file_ext == '.docx':
             # قراءة ملف docx
-            if not DOCX_SUPPORT:
-                logging.warning(f"مكتبة python-docx غير مثبتة. استخدام 'text' كافتراضي للملف: {file_path}")
-                return 'text'
-            
             try:
-                doc = Document(file_path)
-                for i, paragraph in enumerate(doc.paragraphs):
+                for i, paragraph_text in enumerate(iter_docx_paragraphs(file_path)):
                     if i >= sample_lines:
                         break
-                    text = paragraph.text.strip()
+                    text = paragraph_text.strip()
                     if text:
                         lines.append(text)
             except Exception as e:
                 logging.warning(f"خطأ في قراءة ملف docx {file_path}: {e}. استخدام 'text' كافتراضي.")
                 return 'text'
         else:
-            # قراءة ملف txt
+            # قراءة ملف txt: جزء محدود من بداية الملف في قراءة واحدة (لا يُقرأ سطر طويل كاملاً)
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    for i, line in enumerate(f):
-                        if i >= sample_lines:
-                            break
-                        line = line.strip()
-                        if line:
-                            lines.append(line)
+                    head = f.read(sample_chars)
+                    truncated = bool(f.read(1))
             except Exception as e:
                 logging.warning(f"خطأ في اكتشاف نوع الملف {file_path}: {e}. استخدام 'text' كافتراضي.")
                 return 'text'  # افتراضي في حالة الخطأ
+            
+            raw_lines = head.split('\n', sample_lines)
+            if len(raw_lines) > sample_lines:
+                raw_lines = raw_lines[:sample_lines]
+            elif truncated and len(raw_lines) > 1:
+                # السطر الأخير مقطوع عند حد القراءة
+                raw_lines.pop()
+            lines = [line for line in map(str.strip, raw_lines) if line]
         
         # تحليل الأسطر
-        for line in lines:
-            words = arabic_word_re.findall(line)
-            word_count = len(words)
-            if word_count > 0:
-                word_counts.append(word_count)
-                if word_count == 1:
-                    single_word_lines += 1
-                elif word_count > 3:
-                    multi_word_lines += 1
+        word_counts = [count for count in (len(ARABIC_WORD_RE.findall(line)) for line in lines) if count]
+        single_word_lines = word_counts.count(1)
+        multi_word_lines = sum(count > 3 for count in word_counts)
     except Exception as e:
         logging.warning(f"خطأ في اكتشاف نوع الملف {file_path}: {e}. استخدام 'text' كافتراضي.")
         return 'text'  # افتراضي في حالة الخطأ
@@ -1211,7 +1852,7 @@ def detect_file_type(file_path, sample_lines=50):
 ##################################
 
 class FileManager:
-   EXTRA_CHARS = "سأؤئءآإتمونيهىّا"
+   EXTRA_CHARS = EXTRA_CHARS
 
    def __init__(self, corpus_type='text', match_whole_word=True, affixes_data=None, 
                 tags_map=None, db_manager=None, cache_manager=None, 
@@ -1254,108 +1895,145 @@ class FileManager:
        self.cache_manager = cache_manager
        self.pattern_ranker = pattern_ranker
        self.cross_validator = cross_validator
+       # النمط الكامل لكل وزن يُبنى مرة واحدة ثم يُعاد استعماله لكل ملف
+       self._full_patterns = {}
 
-   def search_patterns_in_file(self, file_path, pattern, weight):
-       """البحث عن الأنماط في الملف مع استخدام الكاش والتطبيع"""
-       # التحقق من الكاش أولاً
-       if self.cache_manager:
-           cache_key = f"{file_path}_{pattern}"
-           cached_result = self.cache_manager.get(cache_key, pattern)
-           if cached_result:
-               logging.info(f"تم العثور على نتيجة في الكاش للنمط: {pattern}")
-               return cached_result
-       
-       # بناء الأنماط حسب corpus_type (كما في الكود الأصلي)
-       results = []
+   def _build_full_pattern(self, pattern):
+       """بناء النمط الكامل (الحدود والسوابق واللواحق حول الوزن) حسب corpus_type (كما في الكود الأصلي)"""
        if self.corpus_type == 'list':
-           full_pattern = f"{self.word_boundary_start}(?P<prefix>{self.prefix_pattern})?(?P<root>{pattern})(?P<suffix>{self.suffix_pattern})?{self.word_boundary_end}"
+           return f"{self.word_boundary_start}(?P<prefix>{self.prefix_pattern})?(?P<root>{pattern})(?P<suffix>{self.suffix_pattern})?{self.word_boundary_end}"
        elif self.corpus_type == 'text':
            if self.match_whole_word:
                # استخدام حدود الكلمة الكاملة للنص
-               full_pattern = f"{self.word_boundary_start}(?P<prefix>{self.prefix_pattern})?(?P<root>{pattern})(?P<suffix>{self.suffix_pattern})?{self.word_boundary_end}"
+               return f"{self.word_boundary_start}(?P<prefix>{self.prefix_pattern})?(?P<root>{pattern})(?P<suffix>{self.suffix_pattern})?{self.word_boundary_end}"
            else:
-               full_pattern = f"{self.word_boundary}(?P<prefix>{self.prefix_pattern})?(?P<root>{pattern})(?P<suffix>{self.suffix_pattern})?{self.word_boundary}"
+               return f"{self.word_boundary}(?P<prefix>{self.prefix_pattern})?(?P<root>{pattern})(?P<suffix>{self.suffix_pattern})?{self.word_boundary}"
        else:
-           full_pattern = f"(?P<prefix>{self.prefix_pattern})?(?P<root>{pattern})(?P<suffix>{self.suffix_pattern})?"
+           return f"(?P<prefix>{self.prefix_pattern})?(?P<root>{pattern})(?P<suffix>{self.suffix_pattern})?"
 
-       compiled_pattern = re.compile(full_pattern)
-       logging.debug(f"استخدام النمط: {compiled_pattern.pattern}")
+   @staticmethod
+   @functools.lru_cache(maxsize=1)
+   def _read_text(file_path, file_sig):
+       """النص المطبَّع للملف (None إذا تعذرت القراءة)
+
+       إذا حمّلت العملية الرئيسية المدونة في ذاكرة مشتركة يُؤخذ النص المطبَّع منها مباشرة.
+       يُحفظ نص آخر ملف فقط: الوزن وأوزانه المشتقة تُمسح ملفاً ملفاً فيُقرأ كل ملف مرة لكل وزن،
+       ولا تحمل كل عملية نسخة من المدونة كاملة. يُفرَّغ بـ clear_corpus_caches عند بدء كل تحليل.
+       """
+       shared_text = read_shared_text(file_path, file_sig)
+       if shared_text is not None:
+           return shared_text
+       return FileManager.load_normalized_text(file_path)
+
+   @staticmethod
+   def clear_corpus_caches():
+       """تفريغ كاش نصوص المدونة في هذه العملية
+
+       العملية طويلة العمر (الواجهة) لا تحتفظ بذلك بنص تحليل سابق أو نسخة قديمة من ملف.
+       """
+       FileManager._read_text.cache_clear()
 
+   @staticmethod
+   def load_normalized_text(file_path):
+       """قراءة نص الملف من القرص وتطبيعه (None إذا تعذرت القراءة)"""
        # قراءة الملف حسب نوعه
        file_ext = os.path.splitext(file_path)[1].lower()
        
        if file_ext == '.docx':
            # قراءة ملف docx
-           if not DOCX_SUPPORT:
-               logging.warning(f"مكتبة python-docx غير مثبتة. تخطي الملف: {file_path}")
-               return results
-           
            try:
-               doc = Document(file_path)
-               lines = []
-               for paragraph in doc.paragraphs:
-                   if paragraph.text.strip():
-                       lines.append(paragraph.text)
+               text = '\n'.join(paragraph_text for paragraph_text in iter_docx_paragraphs(file_path)
+                                if paragraph_text.strip())
            except Exception as e:
                logging.error(f"خطأ في قراءة ملف docx {file_path}: {e}")
-               return results
-           
-           # معالجة محتوى docx
-           for line in lines:
-               # تطبيع السطر قبل البحث
-               normalized_line = self.diacritics_handler.normalize_quranic_text(line)
-               
-               for match in compiled_pattern.finditer(normalized_line):
-                   prefix = match.group('prefix') or ''
-                   root = match.group('root')
-                   suffix = match.group('suffix') or ''
-                   
-                   # التحقق التبادلي
-                   if self.cross_validator:
-                       word = prefix + root + suffix
-                       validation = self.cross_validator.validate_analysis(
-                           word, root, pattern, prefix, suffix
-                       )
-                       if validation['is_valid']:
-                           results.append((prefix, root, suffix))
-                   else:
-                       results.append((prefix, root, suffix))
+               return None
        else:
-           # قراءة ملف txt سطراً بسطر (كما في الكود الأصلي)
+           # قراءة ملف txt دفعة واحدة
            with open(file_path, 'r', encoding='utf-8') as file:
-               for line in file:
-                   # تطبيع السطر قبل البحث
-                   normalized_line = self.diacritics_handler.normalize_quranic_text(line)
-                   
-                   for match in compiled_pattern.finditer(normalized_line):
-                       prefix = match.group('prefix') or ''
-                       root = match.group('root')
-                       suffix = match.group('suffix') or ''
-                       
-                       # التحقق التبادلي
-                       if self.cross_validator:
-                           word = prefix + root + suffix
-                           validation = self.cross_validator.validate_analysis(
-                               word, root, pattern, prefix, suffix
-                           )
-                           if validation['is_valid']:
-                               results.append((prefix, root, suffix))
-                       else:
-                           results.append((prefix, root, suffix))
+               text = file.read()
+       
+       # تطبيع النص مرة واحدة قبل البحث
+       return DiacriticsHandler.normalize_quranic_text(text)
+
+   @staticmethod
+   def _scan_file(file_path, file_sig, full_pattern, required):
+       """مسح الملف بالنمط الكامل وإرجاع (السابقة، الجذر، اللاحقة) لكل تطابق"""
+       # البحث يجري على نص الملف كاملاً؛ MULTILINE يجعل ^ و$ تطابق حدود كل سطر كما في البحث سطراً بسطر
+       compiled_pattern = compile_pattern(full_pattern, re.MULTILINE)
+       logging.debug(f"استخدام النمط: {compiled_pattern.pattern}")
+       
+       text = FileManager._read_text(file_path, file_sig)
+       if text is None:
+           return []
+       
+       # نص ثابت يلزم وجوده في الملف ليُجرى عليه البحث بالنمط
+       if required and required not in text:
+           return []
+       
+       if compiled_pattern.search(''):
+           # النمط الذي يطابق نصاً فارغاً يتبع عدد تطابقاته عدد الأسطر، فيُبحث فيه سطراً بسطر
+           compiled_pattern = compile_pattern(full_pattern)
+           chunks = io.StringIO(text)
+       else:
+           chunks = (text,)
+       return [
+           (match.group('prefix') or '', match.group('root'), match.group('suffix') or '')
+           for chunk in chunks
+           for match in compiled_pattern.finditer(chunk)
+       ]
+
+   def search_patterns_in_file(self, file_path, pattern, weight):
+       """البحث عن الأنماط في الملف مع استخدام الكاش والتطبيع"""
+       # مفتاح الكاش يتضمن توقيع الملف حتى لا تُعاد نتائج نسخة قديمة منه
+       file_sig = file_signature(file_path)
+       cache_key = f"{file_path}@{file_sig}"
+       
+       # التحقق من الكاش أولاً
+       if self.cache_manager:
+           cached_result = self.cache_manager.get(cache_key, pattern)
+           if cached_result:
+               logging.info(f"تم العثور على نتيجة في الكاش للنمط: {pattern}")
+               return list(cached_result)
+       
+       full_pattern = self._full_patterns.get(pattern)
+       if full_pattern is None:
+           full_pattern = self._full_patterns[pattern] = self._build_full_pattern(pattern)
+
+       results = self._scan_file(file_path, file_sig, full_pattern, ArabicProcessor.required_literal(pattern))
+       
+       # التحقق التبادلي (دفعة واحدة بعد انتهاء المسح)
+       if self.cross_validator and results:
+           validations = self.cross_validator.validate_batch(
+               [(prefix + root + suffix, root, pattern, prefix, suffix) for prefix, root, suffix in results]
+           )
+           results = [result for result, validation in zip(results, validations) if validation['is_valid']]
        
        # حفظ في الكاش
        if self.cache_manager and results:
-           cache_key = f"{file_path}_{pattern}"
            self.cache_manager.set(cache_key, pattern, results)
        
        return results
 
+   def search_all_patterns_in_file(self, file_path, weight_patterns):
+       """البحث عن عدة أنماط في الملف نفسه: [(الوزن، النمط)] ← قائمة النتائج بالترتيب نفسه
+
+       يُقرأ الملف ويُطبَّع مرة واحدة ثم تمر عليه الأنماط كلها، ويُمسح بالنمط المكرر
+       (وزن مكرر في قائمة المشتقات) مرة واحدة.
+       """
+       found = {}
+       all_results = []
+       for weight, pattern in weight_patterns:
+           if pattern in found:
+               all_results.append(list(found[pattern]))
+           else:
+               all_results.append(found.setdefault(pattern, self.search_patterns_in_file(file_path, pattern, weight)))
+       return all_results
+
    def _count_results(self, results):
-       counts = defaultdict(int)
-       for prefix, root, suffix in results:
-           matched_word = prefix + root + suffix
-           counts[(matched_word, prefix, root, suffix)] += 1
-       return counts
+       # العدّ على الثلاثيات نفسها، ثم تُبنى الكلمة المطابقة مرة واحدة لكل ثلاثية فريدة
+       counts = Counter(map(tuple, results))
+       return {(prefix + root + suffix, prefix, root, suffix): count
+               for (prefix, root, suffix), count in counts.items()}
 
    def write_results(self, folder_path, weight, results):
        """كتابة النتائج مع الحفظ في قاعدة البيانات"""
@@ -1367,24 +2045,27 @@ class FileManager:
            os.makedirs(folder_path, exist_ok=True)
 
        # حساب عدد أحرف الزيادة للوزن
-       extra_chars_count = sum(1 for c in weight if c in FileManager.EXTRA_CHARS)
+       extra_chars_count = count_extra_chars(weight)
        
        # إدراج الوزن في قاعدة البيانات
        if self.db_manager:
            pattern_type = 'اسم' if 'الأسماء' in folder_path else 'فعل'
            self.db_manager.insert_pattern(weight, pattern_type, extra_chars_count)
 
+       counted_results = self._count_results(results)
+       # تقسيم كل جذر مرة واحدة، فالجذر يتكرر مع سوابق ولواحق مختلفة
+       root_analysis = analyze_weight_roots(
+           weight, [(prefix, root, suffix) for _, prefix, root, suffix in counted_results], self.word_splitter
+       )
+
        file_path = os.path.join(folder_path, f"{weight}.txt")
        with open(file_path, 'w', encoding='utf-8') as file:
-           for (matched_word, prefix, root, suffix), count in self._count_results(results).items():
+           for (matched_word, prefix, root, suffix), count in counted_results.items():
                original_word = matched_word
                template_word = weight
                target_word = root
 
-               prefix_morph, intermediate_morph, root_morph, suffix_morph = self.word_splitter.split_word(
-                   template_word, target_word
-               )
-               root_without_diacritics = self.diacritics_handler.remove_diacritics(root_morph)
+               intermediate_morph, root_without_diacritics = root_analysis[root]
 
                prefix_output = f"[{prefix if prefix else '#'}]"
                suffix_output = f"[{suffix if suffix else '#'}]"
@@ -1432,13 +2113,6 @@ class FileManager:
        return weights
 
    def _reorder_weights(self, weights_dict):
-       # أحرف الزيادة المقترحة
-       extra_chars = set(FileManager.EXTRA_CHARS)
-
-       def count_extra_chars(word):
-           # يحسب عدد الأحرف الزائدة في الوزن
-           return sum(letter in extra_chars for letter in word)
-
        # تحويل الدكت إلى قائمة من tuples: (weight, derived_words)
        weights_list = [(w, d) for w, d in weights_dict.items()]
 
@@ -1451,12 +2125,172 @@ class FileManager:
            new_weights_dict[w] = d
        return new_weights_dict
 
+##################################
+# المدونة المشتركة بين العمليات
+##################################
+
+# كتل الذاكرة المشتركة في العملية الفرعية: {مسار الملف: (اسم الكتلة، الحجم بالبايت، توقيع الملف)}
+_shared_corpus_blocks = {}
+
+# مجلد الذاكرة المشتركة في لينكس، ومساحة تُترك فيه حرة لغير المدونة
+SHARED_MEMORY_DIR = '/dev/shm'
+SHARED_MEMORY_HEADROOM = 16 * 1024 * 1024
+
+def shared_memory_free_bytes():
+    """المساحة الحرة للذاكرة المشتركة (None إذا لم تكن مجلداً يمكن قياسه، كما في ويندوز)"""
+    try:
+        return shutil.disk_usage(SHARED_MEMORY_DIR).free
+    except OSError:
+        return None
+
+def attach_shared_corpus(blocks):
+    """مُهيئ عمليات المعالجة: تسجيل كتل المدونة المشتركة"""
+    global _shared_corpus_blocks
+    _shared_corpus_blocks = blocks
+
+def read_shared_text(file_path, file_sig):
+    """قراءة النص المطبَّع للملف من الذاكرة المشتركة (None إذا لم يكن محمّلاً أو تغيّر الملف)"""
+    block = _shared_corpus_blocks.get(file_path)
+    if block is None or block[2] != file_sig:
+        return None
+    name, size, _ = block
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return None
+    try:
+        return str(shm.buf[:size], 'utf-8')
+    finally:
+        shm.close()
+
+
+class SharedCorpus:
+    """تحميل ملفات المدونة مطبَّعةً في ذاكرة مشتركة مرة واحدة في العملية الرئيسية
+
+    تقرأ العمليات الفرعية النص من الذاكرة المشتركة بدل أن يقرأ كل منها الملفات
+    من القرص ويطبّعها من جديد. تُستعمل كمدير سياق لتحرير الكتل عند الانتهاء:
+
+        with SharedCorpus(file_paths) as corpus:
+            ProcessPoolExecutor(initializer=attach_shared_corpus, initargs=(corpus.blocks,))
+    """
+    def __init__(self, file_paths):
+        # بداية تحليل جديد: ما في كاش هذه العملية (وما ترثه العمليات المتفرعة منها) يخص تحليلاً سابقاً
+        FileManager.clear_corpus_caches()
+        self.blocks = {}
+        self._segments = []
+        for file_path in file_paths:
+            file_sig = file_signature(file_path)
+            text = FileManager.load_normalized_text(file_path)
+            if text is None:
+                continue
+            data = text.encode('utf-8')
+            # حجز الكتلة لا يحجز صفحاتها في /dev/shm، فالكتابة فيها بعد امتلائه تُنهي العملية (SIGBUS)
+            # بدل أن ترفع خطأ؛ الملف الذي لا يتسع له تقرؤه العمليات من القرص
+            free_bytes = shared_memory_free_bytes()
+            if free_bytes is not None and len(data) + SHARED_MEMORY_HEADROOM > free_bytes:
+                logging.warning(f"لا مساحة كافية في الذاكرة المشتركة للملف {file_path}؛ سيُقرأ من القرص")
+                continue
+            try:
+                shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+            except OSError as e:
+                logging.warning(f"تعذر تحميل الملف في الذاكرة المشتركة {file_path}: {e}")
+                continue
+            shm.buf[:len(data)] = data
+            self._segments.append(shm)
+            self.blocks[file_path] = (shm.name, len(data), file_sig)
+
+    def close(self):
+        """تحرير كتل الذاكرة المشتركة"""
+        for shm in self._segments:
+            shm.close()
+            shm.unlink()
+        self._segments = []
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 ##################################
 # وظائف المعالجة الرئيسية المحسّنة
 ##################################
 
+# إعدادات المعالجة المشتركة بين المهام في العملية الفرعية (تُضبط مرة واحدة عبر init_weight_worker)
+_worker_context = {}
+
+# نتيجة معالجة وزن واحد كما تُعاد من العمليات المتوازية (صف مسمّى: تسلسل أصغر ووصول أسرع من القاموس)
+# match_count: عدد نتائج الوزن الأساسي (لا count، فهو اسم دالة tuple.count)
+# root_analysis: {root: (intermediate, root_without_diacritics)} أو None إن لم يُعدّ
+WeightResult = namedtuple('WeightResult', ['weight', 'pattern_type', 'results', 'patterns_results', 'match_count',
+                                           'root_analysis', 'validation_results'],
+                          defaults=(None, ()))
+
+# نوع الوزن في قاعدة البيانات حسب مجموعة أوزانه (يُحدد عند إنشاء المهمة)
+WEIGHT_PATTERN_TYPES = {'names': 'اسم', 'verbs': 'فعل'}
+
+def weight_task_positions(tasks):
+   """موضع كل مهمة مختصرة في قائمة المهام: {(الوزن، نوعه): موضعه}
+
+   الوزن الوارد في ملفي الأسماء والأفعال له مهمتان، فيُميَّز بنوعه.
+   """
+   return {(weight, WEIGHT_PATTERN_TYPES[affixes_key]): position
+           for position, (weight, _, _, affixes_key) in enumerate(tasks)}
+
+def release_in_task_order(tasks, results):
+   """تمرير نتائج الأوزان بترتيب مهامها (الأسماء ثم الأفعال) مهما كان ترتيب اكتمالها
+
+   النتيجة المكتملة قبل أوانها تُحجز حتى تكتمل النتائج التي تسبقها. بذلك يُحفظ الوزن الوارد
+   في الملفين اسماً أولاً (INSERT OR IGNORE يُبقي النوع الأول)، ويكون تكرار الأوزان في حساب
+   النقاط واحداً في كل تشغيل.
+   """
+   positions = weight_task_positions(tasks)
+   ready = {}
+   next_position = 0
+   for result_data in results:
+       ready[positions[(result_data.weight, result_data.pattern_type)]] = result_data
+       while next_position in ready:
+           yield ready.pop(next_position)
+           next_position += 1
+
+def init_weight_worker(shared_blocks=None, context=None):
+   """مُهيئ عمليات معالجة الأوزان: كتل المدونة المشتركة والإعدادات الثابتة لكل المهام
+
+   context قاموس فيه: file_paths, corpus_type, match_whole_word, affixes ({'names': ..., 'verbs': ...}),
+   tags_map, symbols_map, optional_tashkeel, use_cross_validation. بذلك تُرسل البيانات الكبيرة
+   مرة واحدة لكل عملية، وتكفي المهمة المختصرة (weight, derived_weights, results_dir_name, affixes_key).
+   """
+   global _worker_context
+   attach_shared_corpus(shared_blocks or {})
+   _worker_context = context or {}
+
+def analyze_weight_roots(weight, results, word_splitter):
+   """تحليل جذور نتائج وزن واحد: {root: (intermediate, root_without_diacritics)}
+
+   يُحلَّل كل جذر مرة واحدة، فالجذر يتكرر مع سوابق ولواحق مختلفة.
+   """
+   remove_diacritics = word_splitter.diacritics_handler.remove_diacritics
+   root_analysis = {}
+   for _, root, _ in results:
+       if root not in root_analysis:
+           prefix_morph, intermediate_morph, root_morph, suffix_morph = word_splitter.split_word(weight, root)
+           root_analysis[root] = (intermediate_morph, remove_diacritics(root_morph))
+   return root_analysis
+
 def process_weight(args):
-   weight, derived_weights, file_paths, results_dir_name, corpus_type, match_whole_word, affixes_data, tags_map, symbols_map, optional_tashkeel, use_cross_validation = args
+   if len(args) == 4:
+       # مهمة مختصرة: البيانات المشتركة مأخوذة من إعدادات العملية
+       weight, derived_weights, results_dir_name, affixes_key = args
+       ctx = _worker_context
+       file_paths, corpus_type, match_whole_word = ctx['file_paths'], ctx['corpus_type'], ctx['match_whole_word']
+       affixes_data, tags_map, symbols_map = ctx['affixes'][affixes_key], ctx['tags_map'], ctx['symbols_map']
+       optional_tashkeel, use_cross_validation = ctx['optional_tashkeel'], ctx['use_cross_validation']
+       pattern_type = WEIGHT_PATTERN_TYPES[affixes_key]
+   else:
+       # المهمة الكاملة، ويجوز أن يُلحق بها نوع الوزن عنصراً ثاني عشر
+       weight, derived_weights, file_paths, results_dir_name, corpus_type, match_whole_word, affixes_data, tags_map, symbols_map, optional_tashkeel, use_cross_validation = args[:11]
+       pattern_type = args[11] if len(args) > 11 else None
    logging.info(f"بدأ معالجة الوزن: {weight}")
    
    # إنشاء الكائنات المطلوبة داخل كل عملية
@@ -1486,106 +2320,224 @@ def process_weight(args):
    pattern = processor.add_optional_tashkeel_and_grouping(weight)
    pattern = processor.replace_symbols(pattern)
 
-   all_results = []
-   patterns_results = defaultdict(list)  # لتجميع النتائج حسب الوزن
-   
-   for file_path in file_paths:
-       logging.info(f"معالجة الملف: {file_path} للوزن: {weight}")
-       found_results = file_manager.search_patterns_in_file(file_path, pattern, weight)
-       all_results.extend(found_results)
-       patterns_results[weight].extend(found_results)
-
-   folder_path = os.path.join(results_dir_name, weight)
-   file_manager.write_results(folder_path, weight, all_results)
-
-   # معالجة الأوزان المشتقة
+   # الوزن الأساسي ثم الأوزان المشتقة، لتُمسح كلها في قراءة واحدة لكل ملف
+   weight_patterns = [(weight, pattern)]
    for derived_weight in derived_weights:
-       logging.info(f"بدأ معالجة الوزن المشتق: {derived_weight} للوزن الأساسي: {weight}")
        derived_pattern = processor.add_optional_tashkeel_and_grouping(derived_weight)
        derived_pattern = processor.replace_symbols(derived_pattern)
+       weight_patterns.append((derived_weight, derived_pattern))
+   if derived_weights:
+       # سطر واحد لكل الأوزان المشتقة بدل سطر لكل وزن، فهي تُمسح مع الوزن الأساسي
+       logging.info(f"بدأ معالجة الأوزان المشتقة: {'، '.join(derived_weights)} للوزن الأساسي: {weight}")
 
-       all_derived_results = []
-       for file_path in file_paths:
-           logging.info(f"معالجة الملف: {file_path} للوزن المشتق: {derived_weight}")
-           found_results = file_manager.search_patterns_in_file(file_path, derived_pattern, derived_weight)
-           all_derived_results.extend(found_results)
-           patterns_results[derived_weight].extend(found_results)
+   weight_results = [[] for _ in weight_patterns]
+   for file_path in file_paths:
+       logging.info(f"معالجة الملف: {file_path} للوزن: {weight} ({len(weight_patterns)} نمطاً)")
+       found = file_manager.search_all_patterns_in_file(file_path, weight_patterns)
+       for results, found_results in zip(weight_results, found):
+           results.extend(found_results)
 
-       file_manager.write_results(folder_path, derived_weight, all_derived_results)
+   all_results = weight_results[0]
+   patterns_results = defaultdict(list)  # لتجميع النتائج حسب الوزن
+   folder_path = os.path.join(results_dir_name, weight)
+   for (current_weight, _), results in zip(weight_patterns, weight_results):
+       patterns_results[current_weight].extend(results)
+       file_manager.write_results(folder_path, current_weight, results)
 
    logging.info(f"انتهى معالجة الوزن: {weight}")
    # إرجاع البيانات للحفظ في قاعدة البيانات
-   return {
-       'weight': weight,
-       'results': all_results,
-       'patterns_results': dict(patterns_results),
-       'count': len(all_results),
-       'validation_results': []  # لا نستخدم cross_validator في multiprocessing
-   }
+   return WeightResult(
+       weight=weight,
+       pattern_type=pattern_type,
+       results=all_results,
+       patterns_results=dict(patterns_results),
+       match_count=len(all_results),
+       # تقسيم الجذور يجري هنا في العمليات المتوازية بدل حلقة الحفظ في العملية الرئيسية
+       root_analysis=analyze_weight_roots(weight, all_results, file_manager.word_splitter),
+       validation_results=[]  # لا نستخدم cross_validator في multiprocessing
+   )
+
+def process_weight_chunk(tasks):
+   """معالجة دفعة من مهام الأوزان في عملية واحدة (مهمة واحدة للمجمّع لكل دفعة)"""
+   return [process_weight(task) for task in tasks]
+
+##################################
+# كاش نتائج الأوزان بين الجلسات
+##################################
+
+# يُرفع عند تغيير منطق البحث أو صيغة WeightResult ليبطل ما خُزّن قبله
+WEIGHT_CACHE_VERSION = 2
+
+def weight_context_fingerprint(context):
+   """بصمة إعدادات المعالجة المؤثرة في النتائج (تُحسب مرة واحدة لكل تحليل)
+
+   تشمل ملفات المدونة بتوقيعاتها والسوابق واللواحق والرموز والخيارات. الوسم غير داخل فيها
+   لأنه لا يغيّر النتائج بل ملفاتها المكتوبة، وهذه تُعاد كتابتها بالوسم الحالي عند الاسترجاع.
+   """
+   data = [
+       WEIGHT_CACHE_VERSION,
+       [[file_path, file_signature(file_path)] for file_path in context['file_paths']],
+       context['corpus_type'], context['match_whole_word'], context['optional_tashkeel'],
+       context['affixes'], context['symbols_map'],
+   ]
+   return hashlib.blake2b(json_dumps_bytes(data), digest_size=16).digest()
+
+def weight_task_key(task, context_fingerprint):
+   """مفتاح نتيجة مهمة مختصرة (weight, derived_weights, results_dir_name, affixes_key) في الكاش"""
+   weight, derived_weights, _, affixes_key = task
+   data = json_dumps_bytes([weight, list(derived_weights), affixes_key])
+   return hashlib.blake2b(context_fingerprint + data, digest_size=16).digest()
+
+def split_cached_weight_tasks(tasks, cache_manager, context_fingerprint):
+   """فصل المهام المخزنة نتائجها في الكاش عن المهام التي تحتاج إلى معالجة
+
+   تُرجع (cached, pending_tasks, pending_keys): أزواج (المهمة، نتيجتها) من الكاش،
+   والمهام الباقية مع مفاتيحها لتُخزَّن نتائجها بعد معالجتها.
+   تُستدعى عند بدء التحليل، فتحذف أولاً ما خُزّن بإعدادات أخرى لئلا يتراكم في الكاش.
+   """
+   cache_manager.prune_weight_results(context_fingerprint)
+   cached, pending_tasks, pending_keys = [], [], []
+   for task in tasks:
+       key = weight_task_key(task, context_fingerprint)
+       stored = cache_manager.get_weight_result(key)
+       if stored is not None:
+           cached.append((task, weight_result_from_json(stored)))
+       else:
+           pending_tasks.append(task)
+           pending_keys.append(key)
+   return cached, pending_tasks, pending_keys
+
+def weight_result_from_json(stored):
+   """إعادة بناء WeightResult من صيغته المخزنة في JSON (القوائم تعود صفوفاً كما أعادتها process_weight)"""
+   weight, pattern_type, results, patterns_results, match_count, root_analysis, validation_results = stored
+   return WeightResult(
+       weight, pattern_type,
+       list(map(tuple, results)),
+       {current_weight: list(map(tuple, found)) for current_weight, found in patterns_results.items()},
+       match_count,
+       None if root_analysis is None else {root: tuple(analysis) for root, analysis in root_analysis.items()},
+       validation_results,
+   )
+
+def cache_weight_result(cache_manager, context_fingerprint, key, result_data):
+   """تخزين نتيجة وزن في الكاش (صفاً عادياً في JSON) مع بصمة إعدادات المعالجة"""
+   cache_manager.put_weight_result(key, context_fingerprint, tuple(result_data))
+
+def write_weight_result_files(file_manager, task, result_data):
+   """كتابة ملفات نتائج وزن مسترجع من الكاش كما تكتبها process_weight
+
+   الوزن المكرر في قائمة الأوزان المشتقة تتكرر نتائجه في patterns_results بعدد مرات بحثه،
+   أما ملفه فيحمل نتائج بحث واحد.
+   """
+   weight, derived_weights, results_dir_name, _ = task
+   folder_path = os.path.join(results_dir_name, weight)
+   for current_weight, searches in Counter([weight, *derived_weights]).items():
+       results = result_data.patterns_results.get(current_weight, [])
+       file_manager.write_results(folder_path, current_weight, results[:len(results) // searches])
+
+def save_weight_results(db_manager, result_data, pattern_type, pattern_ranker=None, word_splitter=None):
+   """حفظ نتائج وزن واحد في قاعدة البيانات: إدراج الوزن ثم نتائجه دفعة واحدة
+
+   تُرجع الكلمات المطابقة (prefix + root + suffix) بترتيب النتائج ليعيد المستدعي استعمالها.
+   """
+   weight = result_data.weight
+   
+   # إدراج الوزن مع عدد أحرف الزيادة فيه
+   db_manager.insert_pattern(weight, pattern_type, count_extra_chars(weight))
+   
+   # بيانات الوزن تُجلب مرة واحدة؛ تكراره فيها هو تكرار بداية الدفعة،
+   # وcalculate_scores_batch تزيده لكل نتيجة كما يزيده إدراجها
+   weight_meta = pattern_ranker.get_pattern_meta([weight])[weight] if pattern_ranker else None
+   
+   # حساب نقاط كل النتائج دفعة واحدة
+   results = result_data.results
+   matched = [(prefix + root + suffix, prefix, suffix) for prefix, root, suffix in results]
+   if pattern_ranker:
+       scores = pattern_ranker.calculate_scores_batch(weight, matched, meta=weight_meta)
+   else:
+       scores = [0] * len(matched)
+   
+   # تحليل الجذور كما أعدّته process_weight، أو هنا إن لم يُعدّ
+   root_analysis = result_data.root_analysis
+   if root_analysis is None:
+       root_analysis = analyze_weight_roots(weight, results, word_splitter or WordSplitter(DiacriticsHandler()))
+   
+   # حفظ النتائج (تجميعها ثم إدراجها دفعة واحدة لكل وزن)
+   rows = []
+   for (prefix, root, suffix), (matched_word, _, _), score in zip(results, matched, scores):
+       intermediate_morph, root_without_diacritics = root_analysis[root]
+       rows.append((
+           matched_word, root_without_diacritics, weight,
+           prefix, suffix, intermediate_morph, score
+       ))
+   
+   db_manager.insert_results_bulk(rows)
+   return [matched_word for matched_word, _, _ in matched]
 
 ##################################
 # تجميع كلمات المدونة
 ##################################
 
-def collect_corpus_words(file_paths, corpus_type='list'):
-    """تجميع كل الكلمات الواردة في المدونة (مع إزالة التشكيل والتطبيع)."""
-    diacritics_handler = DiacriticsHandler()
-    all_words = set()
-    # نمط استخراج الكلمات العربية (يشمل التشكيل)
-    arabic_word_re = re.compile(r"[\u0621-\u064A\u064B-\u065F\u0670\u06D6-\u06DC\u06DF-\u06E8\u06EA-\u06ED]+")
+def _collect_line_words(lines, file_type):
+    """كلمات مجموعة أسطر (تُقرأ سطراً بسطر دون تحميلها كاملة)، بعد حذف التشكيل والتطبيع
 
-    for fp in file_paths:
+    تُجمع الصيغ الخام الفريدة أولاً ثم يُطبَّع كل منها مرة واحدة، فالكلمة المتكررة
+    في الملف لا يُعاد تطبيعها.
+    """
+    raw_words = set()
+    if file_type == 'list':
+        raw_words.update(filter(None, map(str.strip, lines)))
+    else:  # text
+        findall = ARABIC_WORD_RE.findall
+        for line in lines:
+            raw_words.update(findall(line))
+    
+    # حذف التشكيل وتطبيع النص القرآني في مرور واحد
+    words = set(map(DiacriticsHandler.strip_and_normalize, raw_words))
+    if file_type != 'list':
+        words.discard('')
+    return words
+
+def _collect_file_words(fp):
+    """كلمات ملف واحد من المدونة (مجموعة فارغة إذا تعذرت قراءته)"""
+    try:
+        # اكتشاف نوع الملف تلقائياً
+        file_type = detect_file_type(fp)
+        
+        # قراءة الملف حسب نوعه
+        file_ext = os.path.splitext(fp)[1].lower()
+        
+        if file_ext == '.docx':
+            # قراءة ملف docx
+            try:
+                return _collect_line_words(iter_docx_paragraphs(fp), file_type)
+            except Exception as e:
+                logging.warning(f"خطأ في قراءة ملف docx {fp}: {e}")
+                return set()
+        
+        # قراءة ملف txt سطراً بسطر بمخزن قراءة 128 كيلوبايت
         try:
-            # اكتشاف نوع الملف تلقائياً
-            file_type = detect_file_type(fp)
-            
-            # قراءة الملف حسب نوعه
-            file_ext = os.path.splitext(fp)[1].lower()
-            lines = []
-            
-            if file_ext == '.docx':
-                # قراءة ملف docx
-                if not DOCX_SUPPORT:
-                    logging.warning(f"مكتبة python-docx غير مثبتة. تخطي الملف: {fp}")
-                    continue
-                
-                try:
-                    doc = Document(fp)
-                    for paragraph in doc.paragraphs:
-                        if paragraph.text.strip():
-                            lines.append(paragraph.text)
-                except Exception as e:
-                    logging.warning(f"خطأ في قراءة ملف docx {fp}: {e}")
-                    continue
-            else:
-                # قراءة ملف txt
-                try:
-                    with open(fp, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                except Exception as e:
-                    logging.warning(f"خطأ في قراءة الملف {fp}: {e}")
-                    continue
-            
-            # معالجة الأسطر
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                if file_type == 'list':
-                    word = diacritics_handler.remove_diacritics(line)
-                    # تطبيع النص القرآني
-                    word = diacritics_handler.normalize_quranic_text(word)
-                    all_words.add(word)
-                else:  # text
-                    for m in arabic_word_re.findall(line):
-                        word = diacritics_handler.remove_diacritics(m)
-                        if word:
-                            # تطبيع النص القرآني
-                            word = diacritics_handler.normalize_quranic_text(word)
-                            all_words.add(word)
+            with open(fp, 'r', encoding='utf-8', buffering=1 << 17) as f:
+                return _collect_line_words(f, file_type)
         except Exception as e:
-            logging.warning(f"تعذّر قراءة الملف للتجميع: {fp} - {e}")
-    return all_words
+            logging.warning(f"خطأ في قراءة الملف {fp}: {e}")
+            return set()
+    except Exception as e:
+        logging.warning(f"تعذّر قراءة الملف للتجميع: {fp} - {e}")
+        return set()
+
+def collect_corpus_words(file_paths, corpus_type='list', max_workers=None):
+    """تجميع كل الكلمات الواردة في المدونة (مع إزالة التشكيل والتطبيع).
+
+    عند تعدد الملفات تُوزَّع على عمليات متوازية وتُدمج مجموعات كلماتها؛
+    max_workers=1 يفرض المعالجة التسلسلية.
+    """
+    if len(file_paths) > 1 and max_workers != 1:
+        workers = min(max_workers or available_cpu_count(), len(file_paths))
+        chunksize = max(1, len(file_paths) // (4 * workers))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return set().union(*executor.map(_collect_file_words, file_paths, chunksize=chunksize))
+    return set().union(*map(_collect_file_words, file_paths))
 
 ##################################
 # دالة لتحميل الوسم
@@ -1594,14 +2546,10 @@ def load_tags(tags_file_path):
    tags_map = {}
    if os.path.exists(tags_file_path):
        with open(tags_file_path, 'r', encoding='utf-8') as f:
-           pattern = re.compile(r'"([^"]+)"\s*=\s*"([^"]+)"')
-           for line in f:
-               line = line.strip()
-               match = pattern.match(line)
-               if match:
-                   word = match.group(1)
-                   tag = match.group(2)
-                   tags_map[word] = tag
+           text = f.read()
+       # مرور واحد على الملف كاملاً؛ الوسم الأخير للكلمة هو المعتمد كما في القراءة سطراً بسطر.
+       # الوسوم قليلة التنوع فتُوحَّد نسخها (sys.intern) ليُسلسلها pickle مرة واحدة عند إرسالها للعمليات
+       tags_map = {word: sys.intern(tag) for word, tag in TAG_LINE_RE.findall(text)}
    return tags_map
 
 ##################################
@@ -1639,21 +2587,18 @@ def main():
    verbs_affixes_file = os.path.join(database_folder, "0.3 سوابق ولواحق_أفعال.txt")
 
    # تحميل الرموز
-   with open(symbols_file_path, "r", encoding="utf-8") as sf:
-       symbols_map = ast.literal_eval(sf.read())
+   symbols_map = load_literal_file(symbols_file_path)
 
    # تحميل السوابق واللواحق للأسماء
    if os.path.exists(names_affixes_file):
-       with open(names_affixes_file, 'r', encoding='utf-8') as f:
-           names_affixes_data = ast.literal_eval(f.read())
+       names_affixes_data = load_literal_file(names_affixes_file)
    else:
        logging.warning("لم يتم توفير ملف السوابق واللواحق للأسماء أو المسار غير صحيح. سيتم استخدام قوائم فارغة.")
        names_affixes_data = {'prefixes': [], 'suffixes': []}
    
    # تحميل السوابق واللواحق للأفعال
    if os.path.exists(verbs_affixes_file):
-       with open(verbs_affixes_file, 'r', encoding='utf-8') as f:
-           verbs_affixes_data = ast.literal_eval(f.read())
+       verbs_affixes_data = load_literal_file(verbs_affixes_file)
    else:
        logging.warning("لم يتم توفير ملف السوابق واللواحق للأفعال أو المسار غير صحيح. سيتم استخدام قوائم فارغة.")
        verbs_affixes_data = {'prefixes': [], 'suffixes': []}
@@ -1688,91 +2633,118 @@ def main():
    temp_file_manager.affixes_data = verbs_affixes_data  # تحديث السوابق واللواحق للأفعال
    verbs_weights = temp_file_manager.read_weights_and_derived_words(verbs_weights_file)
    
-   # دمج الأوزان
-   all_weights = {**names_weights, **verbs_weights}
 
-   file_paths = [os.path.join(corpus_folder, file_name) 
-                 for file_name in os.listdir(corpus_folder) 
-                 if file_name.endswith('.txt')]
+   # scandir يعيد نوع المدخل مع أسماء المجلد فلا يحتاج is_file إلى استدعاء stat إضافي
+   with os.scandir(corpus_folder) as entries:
+       file_paths = [entry.path for entry in entries
+                     if entry.name.endswith('.txt') and entry.is_file()]
 
    # جمع كلمات المدونة قبل المعالجة لحساب التغطية لاحقًا
    all_corpus_words = collect_corpus_words(file_paths, corpus_type=corpus_type)
 
     # معالجة الأوزان
    print(f"\n{'='*60}")
-   print(f"بدء معالجة {len(all_weights)} وزن صرفي (أسماء وأفعال)...")
+   print(f"بدء معالجة {len(names_weights) + len(verbs_weights)} وزن صرفي (أسماء وأفعال)...")
    print(f"{'='*60}\n")
    
+   # البيانات الثابتة المشتركة بين كل المهام تُرسل مرة واحدة لكل عملية عبر المُهيئ
+   worker_context = {
+       'file_paths': file_paths,
+       'corpus_type': corpus_type,
+       'match_whole_word': match_whole_word,
+       'affixes': {'names': names_affixes_data, 'verbs': verbs_affixes_data},
+       'tags_map': tags_map,
+       'symbols_map': symbols_map,
+       'optional_tashkeel': optional_tashkeel,
+       'use_cross_validation': use_cross_validation,
+   }
+   
    # إنشاء مهام للأسماء
-   names_tasks = [(weight, derived_weights, file_paths, names_results_dir, corpus_type, match_whole_word, names_affixes_data, tags_map, symbols_map, optional_tashkeel, use_cross_validation) 
+   names_tasks = [(weight, derived_weights, names_results_dir, 'names')
                   for weight, derived_weights in names_weights.items()]
    
    # إنشاء مهام للأفعال
-   verbs_tasks = [(weight, derived_weights, file_paths, verbs_results_dir, corpus_type, match_whole_word, verbs_affixes_data, tags_map, symbols_map, optional_tashkeel, use_cross_validation) 
+   verbs_tasks = [(weight, derived_weights, verbs_results_dir, 'verbs')
                   for weight, derived_weights in verbs_weights.items()]
    
    # دمج المهام
    all_tasks = names_tasks + verbs_tasks
 
-   # معالجة الأوزان وجمع النتائج
-   all_processing_results = []
-   with concurrent.futures.ProcessPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
-       all_processing_results = list(tqdm(
-           executor.map(process_weight, all_tasks),
-           total=len(all_tasks),
-           desc="معالجة الأوزان",
-           unit="وزن"
-       ))
-   
-   # حفظ النتائج في قاعدة البيانات
+   # معالجة الأوزان
+   # تُستهلك نتائج كل دفعة فور اكتمالها (حفظ في قاعدة البيانات وجمع الكلمات المتعرّف عليها)
+   # ثم تُترك، فلا تتراكم نتائج كل الأوزان في الذاكرة حتى نهاية المعالجة
+   recognized_words = set()
+   remove_diacritics = DiacriticsHandler.remove_diacritics
    if db_manager:
        print(f"\n{'='*60}")
-       print("💾 حفظ النتائج في قاعدة البيانات...")
+       print("💾 حفظ النتائج في قاعدة البيانات أثناء المعالجة...")
        print(f"{'='*60}\n")
+       word_splitter = WordSplitter(DiacriticsHandler())
+   
+   def consume_result(result_data):
+       """حفظ نتيجة وزن في قاعدة البيانات وجمع كلماتها المتعرّف عليها"""
+       progress.update(1)
        
-       diacritics_handler = DiacriticsHandler()
-       word_splitter = WordSplitter(diacritics_handler)
+       if not db_manager:
+           return
        
-       for result_data in tqdm(all_processing_results, desc="حفظ في قاعدة البيانات"):
-           weight = result_data['weight']
-           results = result_data['results']
-           
-           # حساب عدد أحرف الزيادة للوزن
-           extra_chars_count = sum(1 for c in weight if c in FileManager.EXTRA_CHARS)
-           
-           # تحديد نوع الوزن بناءً على وجوده في أوزان الأسماء أو الأفعال
-           if weight in names_weights:
-               pattern_type = 'اسم'
-           elif weight in verbs_weights:
-               pattern_type = 'فعل'
-           else:
-               pattern_type = 'غير محدد'  # في حالة وجود تداخل
-           
-           # إدراج الوزن في قاعدة البيانات
-           db_manager.insert_pattern(weight, pattern_type, extra_chars_count)
+       # نوع الوزن محدد في المهمة نفسها (أسماء أو أفعال)
+       matched_words = save_weight_results(
+           db_manager, result_data, result_data.pattern_type, pattern_ranker, word_splitter
+       )
+       
+       # الكلمات المتعرّف عليها من الكلمات المطابقة التي بناها الحفظ (تقرير التغطية)
+       if generate_report:
+           recognized_words.update(map(remove_diacritics, matched_words))
+   
+   # الأوزان التي لم تتغير مدخلاتها منذ تحليل سابق تُسترجع نتائجها من الكاش ولا تُرسل إلى العمليات
+   cached_results, pending_tasks, pending_keys = [], all_tasks, []
+   if cache_manager:
+       context_fingerprint = weight_context_fingerprint(worker_context)
+       cached_results, pending_tasks, pending_keys = split_cached_weight_tasks(
+           all_tasks, cache_manager, context_fingerprint
+       )
+       print(f"نتائج مسترجعة من الكاش: {len(cached_results)} وزن، للمعالجة: {len(pending_tasks)} وزن")
+   
+   # إرسال المهام إلى العمليات على دفعات لتقليل كلفة التسلسل والاتصال لكل مهمة
+   workers = available_cpu_count()
+   chunksize = max(1, len(pending_tasks) // (workers * 4))
+   task_chunks = [pending_tasks[i:i + chunksize] for i in range(0, len(pending_tasks), chunksize)]
+   if cache_manager:
+       key_chunks = [pending_keys[i:i + chunksize] for i in range(0, len(pending_keys), chunksize)]
+   else:
+       key_chunks = [None] * len(task_chunks)
+   with SharedCorpus(file_paths) as shared_corpus, \
+        concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_weight_worker, initargs=(shared_corpus.blocks, worker_context)
+        ) as executor, \
+        tqdm(total=len(all_tasks), desc="معالجة الأوزان", unit="وزن") as progress, \
+        (db_manager.fast_ingest() if db_manager else contextlib.nullcontext()), \
+        (db_manager.transaction() if db_manager else contextlib.nullcontext()):
+       # كل نتائج التشغيل تُكتب في معاملة واحدة تُودع بعد آخر وزن،
+       # بلا مزامنة مع القرص حتى إيداعها (تُعاد المزامنة عند الخروج ولو بخطأ)
+       pending = {executor.submit(process_weight_chunk, chunk): keys
+                  for chunk, keys in zip(task_chunks, key_chunks)}
+       
+       def completed_results():
+           # نتائج الكاش تُستهلك أثناء عمل العمليات على بقية الأوزان
+           for task, result_data in cached_results:
+               write_weight_result_files(temp_file_manager, task, result_data)
+               yield result_data
            
-           # حفظ النتائج
-           for prefix, root, suffix in results:
-               matched_word = prefix + root + suffix
-               
-               # تحليل الكلمة
-               prefix_morph, intermediate_morph, root_morph, suffix_morph = word_splitter.split_word(
-                   weight, root
-               )
-               root_without_diacritics = diacritics_handler.remove_diacritics(root_morph)
-               
-               # حساب النقاط
-               score = 0
-               if pattern_ranker:
-                   score = pattern_ranker.calculate_score(
-                       weight, matched_word, prefix, suffix, 1
-                   )
-               
-               # حفظ في قاعدة البيانات
-               db_manager.insert_result(
-                   matched_word, root_without_diacritics, weight,
-                   prefix, suffix, intermediate_morph, score
-               )
+           for future in concurrent.futures.as_completed(pending):
+               # إسقاط المرجع إلى الدفعة المكتملة ليُحرَّر ما تحمله من نتائج بعد استهلاكها
+               keys = pending.pop(future)
+               chunk_results = future.result()
+               if keys is not None:
+                   for key, result_data in zip(keys, chunk_results):
+                       cache_weight_result(cache_manager, context_fingerprint, key, result_data)
+               yield from chunk_results
+       
+       # الحفظ بترتيب المهام لا بترتيب الاكتمال، فيتطابق ما يُحفظ في كل تشغيل
+       for result_data in release_in_task_order(all_tasks, completed_results()):
+           consume_result(result_data)
 
    # حفظ الكاش
    if cache_manager:
@@ -1784,16 +2756,8 @@ def main():
        report_generator = ReportGenerator(db_manager)
        stats = db_manager.get_statistics()
 
-       # حساب مجموعة الكلمات المتعرّف عليها من نتائج المعالجة
-       diacritics_handler = DiacriticsHandler()
-       recognized_words = set()
-       for result_data in all_processing_results:
-           for prefix, root, suffix in result_data['results']:
-               matched_word = prefix + root + suffix
-               matched_word = diacritics_handler.remove_diacritics(matched_word)
-               if matched_word:
-                   recognized_words.add(matched_word)
-
+       # مجموعة الكلمات المتعرّف عليها جُمعت أثناء استهلاك النتائج
+       recognized_words.discard('')
        coverage_info = report_generator.generate_coverage_outputs(
            all_words_set=all_corpus_words,
            recognized_set=recognized_words
@@ -4,23 +4,31 @@
 """
 import sys
 import os
-import ast
 import json
 import logging
+import sqlite3
+import time
+import platform
+import subprocess
+import concurrent.futures
+from functools import partial, lru_cache
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, ChainMap, deque
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTextEdit, QFileDialog, QMessageBox,
+    QPushButton, QTextEdit, QPlainTextEdit, QFileDialog, QMessageBox,
     QScrollArea, QLabel, QProgressBar, QSplitter,
-    QListWidget, QListWidgetItem, QTabWidget, QTreeWidget,
+    QListWidget, QListWidgetItem, QListView, QTabWidget, QTreeWidget,
     QTreeWidgetItem, QGroupBox, QCheckBox, QRadioButton,
     QLineEdit, QDialog, QDialogButtonBox, QFormLayout,
     QSpinBox, QDoubleSpinBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer
+from PyQt6.QtCore import (
+    Qt, QThread, pyqtSignal, QSize, QTimer,
+    QAbstractListModel, QSortFilterProxyModel, QModelIndex
+)
 from PyQt6.QtGui import QFont, QColor, QPainter
 
 # استيراد جميع الفئات من الكود الأصلي
@@ -45,8 +53,114 @@ DiacriticsHandler = morphology_core.DiacriticsHandler
 WordSplitter = morphology_core.WordSplitter
 ReportGenerator = morphology_core.ReportGenerator
 process_weight = morphology_core.process_weight
+process_weight_chunk = morphology_core.process_weight_chunk
+analyze_weight_roots = morphology_core.analyze_weight_roots
+SharedCorpus = morphology_core.SharedCorpus
+init_weight_worker = morphology_core.init_weight_worker
 collect_corpus_words = morphology_core.collect_corpus_words
 load_tags = morphology_core.load_tags
+load_literal_file = morphology_core.load_literal_file
+count_extra_chars = morphology_core.count_extra_chars
+file_signature = morphology_core.file_signature
+available_cpu_count = morphology_core.available_cpu_count
+weight_context_fingerprint = morphology_core.weight_context_fingerprint
+split_cached_weight_tasks = morphology_core.split_cached_weight_tasks
+cache_weight_result = morphology_core.cache_weight_result
+write_weight_result_files = morphology_core.write_weight_result_files
+weight_task_positions = morphology_core.weight_task_positions
+
+# نظام التشغيل لا يتغير أثناء عمل البرنامج فيُقرأ مرة واحدة
+SYSTEM_NAME = platform.system()
+
+# ملفات البيانات داخل مجلد قاعدة البيانات: {مفتاح الإعداد: اسم الملف}
+DATA_FILE_NAMES = {
+    'symbols_file_path': "الخريطة.txt",
+    'tags_file_path': "0.3 الوسم.txt",
+    'names_weights_file': "0.3 أوزان_الأسماء.txt",
+    'verbs_weights_file': "0.3 أوزان_الأفعال.txt",
+    'names_affixes_file': "0.3 سوابق ولواحق_أسماء.txt",
+    'verbs_affixes_file': "0.3 سوابق ولواحق_أفعال.txt",
+}
+
+# مفاتيح الإعدادات التي تحمل مجلدات قد تكون نسبية إلى مجلد البرنامج
+FOLDER_SETTINGS = ('database_folder', 'corpus_folder', 'names_results_dir', 'verbs_results_dir')
+
+# امتدادات ملفات المدونة المدعومة في اختيار المجلد
+CORPUS_FILE_EXTENSIONS = ('.txt', '.docx')
+
+# التقارير الأطول من هذا تُعرض على أجزاء (بحجم CHUNK تقريباً) بدل تخطيطها كاملة قبل ظهور النافذة
+LARGE_TEXT_THRESHOLD = 200_000
+LARGE_TEXT_CHUNK_SIZE = 64 * 1024
+
+# ملفات البيانات المحمّلة بين تحليل وآخر: {المسار: (توقيع الملف، البيانات)}
+_data_files_cache = {}
+
+def load_data_file(file_path, loader):
+    """تحميل ملف بيانات بـ loader مع الاحتفاظ بالنتيجة ما دام الملف لم يتغير
+
+    تكرار التحليل بالإعدادات نفسها لا يعيد قراءة الرموز والسوابق والوسم والأوزان.
+    """
+    signature = file_signature(file_path)
+    cached = _data_files_cache.get(file_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    data = loader(file_path)
+    _data_files_cache[file_path] = (signature, data)
+    return data
+
+
+# خط الواجهة (QFont لا يرفع استثناء إذا لم يوجد الخط، بل يستبدل به أقرب خط متاح)
+UI_FONT_FAMILY = "Sakkal Majalla"
+
+# حجم خط مربعات النصوص (السجل والنتائج والتقارير): 11pt يعادل 15px عند 96 DPI.
+# يُضبط بـ setFont لا بـ font-size في ورقة الأنماط، فلا يعيد Qt حل الخط فوق خط الويدجت
+TEXT_VIEW_POINT_SIZE = 11
+
+
+@lru_cache(maxsize=None)
+def ui_font(point_size):
+    """خط الواجهة بالحجم المطلوب، يُنشأ مرة واحدة لكل حجم ويُشارك بين النوافذ (لا يُعدَّل)"""
+    return QFont(UI_FONT_FAMILY, point_size)
+
+
+def split_text_lines(text, chunk_size):
+    """تقسيم نص إلى أجزاء من أسطر كاملة لا يقل كل منها (عدا الأخير) عن chunk_size
+
+    ضم الأجزاء بسطر جديد يعيد النص، فتناسب الإضافة بـ appendPlainText.
+    """
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = text.find('\n', start + chunk_size)
+        if end == -1:
+            end = len(text)
+        chunks.append(text[start:end])
+        start = end + 1
+    return chunks
+
+
+def set_plain_text_streamed(text_edit, text):
+    """عرض نص في QPlainTextEdit: دفعة واحدة، أو على أجزاء عبر حلقة الأحداث إن كان كبيراً
+
+    يظهر الجزء الأول فوراً ويُضاف الباقي جزءاً جزءاً ما دام المحرر ظاهراً ولم يُحذف.
+    """
+    if len(text) <= LARGE_TEXT_THRESHOLD:
+        text_edit.setPlainText(text)
+        return
+    
+    chunks = split_text_lines(text, LARGE_TEXT_CHUNK_SIZE)
+    text_edit.setPlainText(chunks[0])
+    remaining = deque(chunks[1:])
+    # نافذة التقرير تُحذف عند إغلاقها، فتتوقف الإضافة
+    text_edit.destroyed.connect(remaining.clear)
+    
+    def append_next_chunk():
+        if not remaining or not text_edit.isVisible():
+            return
+        text_edit.appendPlainText(remaining.popleft())
+        QTimer.singleShot(0, append_next_chunk)
+    
+    QTimer.singleShot(0, append_next_chunk)
 
 
 class DotsHandle(QWidget):
@@ -78,6 +192,65 @@ class DotsHandle(QWidget):
             painter.drawEllipse(int(width / 2 - dot_size / 2), int(y - dot_size / 2), dot_size, dot_size)
 
 
+class WeightsListModel(QAbstractListModel):
+    """نموذج قائمة الأوزان: صفوف (النوع، الوزن، عدد المشتقات) تُبنى نصوصها عند العرض فقط
+
+    نموذج واحد لكل الأوزان تعرضه قائمة واحدة عبر مرشحات WeightsFilterProxy،
+    بدل ثلاث قوائم QListWidget لكل منها عناصرها.
+    """
+    KIND_LABELS = {'names': 'اسم', 'verbs': 'فعل'}
+    WeightRole = Qt.ItemDataRole.UserRole
+    KindRole = Qt.ItemDataRole.UserRole + 1
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+    
+    def set_rows(self, rows):
+        """استبدال كل الصفوف دفعة واحدة"""
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        kind, weight, derived_count = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{weight} ({derived_count} مشتق)" if derived_count else weight
+        if role == self.WeightRole:
+            return weight
+        if role == self.KindRole:
+            return kind
+        return None
+
+
+class WeightsFilterProxy(QSortFilterProxyModel):
+    """أوزان نوع واحد من WeightsListModel، أو كل الأوزان مسبوقة بنوعها (kind=None)"""
+    def __init__(self, kind=None, parent=None):
+        super().__init__(parent)
+        self.kind = kind
+    
+    def set_kind(self, kind):
+        """تبديل نوع الأوزان المعروضة في المرشح نفسه، فلا يتغير نموذج القائمة ولا نموذج تحديدها"""
+        if kind != self.kind:
+            self.kind = kind
+            self.invalidateFilter()
+    
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.kind is None or self.sourceModel().rows[source_row][0] == self.kind
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        value = super().data(index, role)
+        if role == Qt.ItemDataRole.DisplayRole and self.kind is None and value is not None:
+            kind = super().data(index, WeightsListModel.KindRole)
+            return f"[{WeightsListModel.KIND_LABELS[kind]}] {value}"
+        return value
+
+
 class MorphologyWorker(QThread):
     """عامل لتشغيل التحليل الصرفي في خيط منفصل"""
     finished = pyqtSignal(bool, dict, str)  # success, results, error
@@ -87,11 +260,7 @@ class MorphologyWorker(QThread):
     def __init__(self, config):
         super().__init__()
         self.config = config
-        self.should_stop = False
-        
-    def stop(self):
-        """إيقاف المعالجة"""
-        self.should_stop = True
+        self.db_manager = None  # اتصال قاعدة البيانات، يبقى مرجعه ليُغلق إن لم يُسلَّم في النتائج
     
     def run(self):
         """تنفيذ التحليل الصرفي"""
@@ -122,30 +291,32 @@ class MorphologyWorker(QThread):
             self.log_message.emit("بدء تحميل البيانات...")
             
             # تحميل الرموز
-            with open(symbols_file_path, "r", encoding="utf-8") as sf:
-                symbols_map = ast.literal_eval(sf.read())
+            symbols_map = load_data_file(symbols_file_path, load_literal_file)
             
             # تحميل السوابق واللواحق
             if os.path.exists(names_affixes_file):
-                with open(names_affixes_file, 'r', encoding='utf-8') as f:
-                    names_affixes_data = ast.literal_eval(f.read())
+                names_affixes_data = load_data_file(names_affixes_file, load_literal_file)
             else:
                 names_affixes_data = {'prefixes': [], 'suffixes': []}
             
             if os.path.exists(verbs_affixes_file):
-                with open(verbs_affixes_file, 'r', encoding='utf-8') as f:
-                    verbs_affixes_data = ast.literal_eval(f.read())
+                verbs_affixes_data = load_data_file(verbs_affixes_file, load_literal_file)
             else:
                 verbs_affixes_data = {'prefixes': [], 'suffixes': []}
             
             # تحميل الوسم
-            tags_map = load_tags(tags_file_path)
+            tags_map = load_data_file(tags_file_path, load_tags) if os.path.exists(tags_file_path) else {}
             
             # إنشاء المكونات
             cache_manager = CacheManager() if use_cache else None
-            db_manager = DatabaseManager() if use_database else None
+            # الاتصال يُسلَّم إلى النافذة بعد انتهاء العامل لتغلقه عند الخروج
+            db_manager = DatabaseManager(check_same_thread=False) if use_database else None
+            self.db_manager = db_manager
             pattern_ranker = PatternRanker(db_manager) if use_database else None
             cross_validator = CrossValidator() if use_cross_validation else None
+            # نسخة واحدة لكل التحليل، تُستعمل في الحفظ وفي جمع الكلمات المتعرّف عليها
+            diacritics_handler = DiacriticsHandler()
+            word_splitter = WordSplitter(diacritics_handler)
             
             # إنشاء FileManager لقراءة الأوزان
             temp_file_manager = FileManager(
@@ -160,33 +331,40 @@ class MorphologyWorker(QThread):
             )
             
             self.log_message.emit("تحميل أوزان الأسماء...")
-            names_weights = temp_file_manager.read_weights_and_derived_words(names_weights_file)
+            names_weights = load_data_file(names_weights_file, temp_file_manager.read_weights_and_derived_words)
             
             self.log_message.emit("تحميل أوزان الأفعال...")
             temp_file_manager.affixes_data = verbs_affixes_data
-            verbs_weights = temp_file_manager.read_weights_and_derived_words(verbs_weights_file)
+            verbs_weights = load_data_file(verbs_weights_file, temp_file_manager.read_weights_and_derived_words)
             
-            all_weights = {**names_weights, **verbs_weights}
+            # الوزن الوارد في الملفين يُعد مرة واحدة (المفاتيح الموحدة للقاموسين)
+            weights_count = len(ChainMap(names_weights, verbs_weights))
             
-            self.log_message.emit(f"تم تحميل {len(all_weights)} وزن صرفي")
-            self.progress.emit(f"بدء معالجة {len(all_weights)} وزن...", 0, len(all_weights))
+            self.log_message.emit(f"تم تحميل {weights_count} وزن صرفي")
+            self.progress.emit(f"بدء معالجة {weights_count} وزن...", 0, weights_count)
             
             # جمع كلمات المدونة
             all_corpus_words = collect_corpus_words(file_paths, corpus_type=corpus_type)
             self.log_message.emit(f"تم جمع {len(all_corpus_words)} كلمة من المدونة")
             
-            # إنشاء المهام (إضافة use_cross_validation للمهام)
-            names_tasks = [
-                (weight, derived_weights, file_paths, names_results_dir, corpus_type, 
-                 match_whole_word, names_affixes_data, tags_map, symbols_map, optional_tashkeel, use_cross_validation)
-                for weight, derived_weights in names_weights.items()
-            ]
+            # الإعدادات والجداول الثابتة تُرسل مرة واحدة لكل عملية عبر المُهيئ بدل تكرارها في كل مهمة
+            worker_context = {
+                'file_paths': file_paths,
+                'corpus_type': corpus_type,
+                'match_whole_word': match_whole_word,
+                'affixes': {'names': names_affixes_data, 'verbs': verbs_affixes_data},
+                'tags_map': tags_map,
+                'symbols_map': symbols_map,
+                'optional_tashkeel': optional_tashkeel,
+                'use_cross_validation': use_cross_validation,
+            }
+            
+            # إنشاء المهام المختصرة (نوع الوزن يُستنتج من مفتاح السوابق واللواحق)
+            names_tasks = [(weight, derived_weights, names_results_dir, 'names')
+                           for weight, derived_weights in names_weights.items()]
             
-            verbs_tasks = [
-                (weight, derived_weights, file_paths, verbs_results_dir, corpus_type,
-                 match_whole_word, verbs_affixes_data, tags_map, symbols_map, optional_tashkeel, use_cross_validation)
-                for weight, derived_weights in verbs_weights.items()
-            ]
+            verbs_tasks = [(weight, derived_weights, verbs_results_dir, 'verbs')
+                           for weight, derived_weights in verbs_weights.items()]
             
             # تحديد المهام حسب التبويب المختار
             selected_weights_tab = self.config.get('selected_weights_tab', 'all')
@@ -203,64 +381,100 @@ class MorphologyWorker(QThread):
             # معالجة الأوزان
             all_processing_results = []
             all_validation_results = []  # تجميع نتائج التحقق من جميع العمليات
-            import concurrent.futures
-            import multiprocessing
             
-            with concurrent.futures.ProcessPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
-                # إنشاء جميع المهام
-                futures = {executor.submit(process_weight, task): i 
-                           for i, task in enumerate(all_tasks)}
+            # الأوزان التي لم تتغير مدخلاتها منذ تحليل سابق تُسترجع نتائجها من الكاش ولا تُرسل إلى العمليات
+            pending_tasks, pending_keys = all_tasks, []
+            if cache_manager:
+                context_fingerprint = weight_context_fingerprint(worker_context)
+                cached_results, pending_tasks, pending_keys = split_cached_weight_tasks(
+                    all_tasks, cache_manager, context_fingerprint
+                )
+                for task, result_data in cached_results:
+                    write_weight_result_files(temp_file_manager, task, result_data)
+                    all_processing_results.append(result_data)
+                if cached_results:
+                    self.log_message.emit(f"تم استرجاع نتائج {len(cached_results)} وزن من الكاش")
+            completed = len(all_processing_results)
+            
+            # عدد العمليات: المحدد في الإعدادات، أو عدد المعالجات المتاحة فعلاً لهذه العملية
+            workers = self.config.get('max_workers') or available_cpu_count()
+            
+            with SharedCorpus(file_paths) as shared_corpus, \
+                 concurrent.futures.ProcessPoolExecutor(
+                     max_workers=workers,
+                     initializer=init_weight_worker, initargs=(shared_corpus.blocks, worker_context)
+                 ) as executor:
+                # إرسال المهام على دفعات (مهمة واحدة للمجمّع لكل دفعة) لتقليل كلفة الاتصال لكل وزن
+                chunksize = max(1, len(pending_tasks) // (workers * 4))
+                futures = [executor.submit(process_weight_chunk, pending_tasks[i:i + chunksize])
+                           for i in range(0, len(pending_tasks), chunksize)]
                 
-                completed = 0
+                def collect_chunk(chunk_index, future):
+                    """إضافة نتائج دفعة مكتملة ونتائج تحققها، وتخزينها في الكاش"""
+                    chunk_results = future.result()
+                    if cache_manager:
+                        chunk_keys = pending_keys[chunk_index * chunksize:(chunk_index + 1) * chunksize]
+                        for key, result_data in zip(chunk_keys, chunk_results):
+                            cache_weight_result(cache_manager, context_fingerprint, key, result_data)
+                    
+                    for result_data in chunk_results:
+                        all_processing_results.append(result_data)
+                        
+                        # تجميع نتائج التحقق من كل عملية
+                        if result_data.validation_results:
+                            all_validation_results.extend(result_data.validation_results)
+                    return chunk_results
+                
+                chunk_indexes = {future: chunk_index for chunk_index, future in enumerate(futures)}
                 for future in concurrent.futures.as_completed(futures):
-                    if self.should_stop:
+                    if self.isInterruptionRequested():
                         self.log_message.emit("جارٍ إيقاف المعالجة... إلغاء المهام المعلقة...")
                         
-                        # إلغاء جميع المهام المعلقة (pending)
+                        # إلغاء جميع الدفعات المعلقة (pending)
                         cancelled_count = 0
-                        for f in futures.keys():
+                        for chunk_index, f in enumerate(futures):
                             if not f.done():
                                 if f.cancel():
-                                    cancelled_count += 1
+                                    cancelled_count += len(pending_tasks[chunk_index * chunksize:(chunk_index + 1) * chunksize])
                         
                         if cancelled_count > 0:
                             self.log_message.emit(f"تم إلغاء {cancelled_count} مهمة معلقة")
                         
                         self.log_message.emit("انتظار انتهاء المهام الجارية...")
                         
-                        # الانتظار حتى تنتهي المهام الجارية فقط
-                        remaining_futures = {f: idx for f, idx in futures.items() if not f.done()}
+                        # الانتظار حتى تنتهي الدفعات الجارية فقط
+                        remaining_futures = [f for f in futures if not f.done()]
                         for future in concurrent.futures.as_completed(remaining_futures):
                             try:
-                                result_data = future.result()
-                                all_processing_results.append(result_data)
-                                
-                                # تجميع نتائج التحقق من كل عملية
-                                if result_data.get('validation_results'):
-                                    all_validation_results.extend(result_data['validation_results'])
-                                
-                                completed += 1
-                                self.log_message.emit(f"انتهت مهمة: {result_data['weight']}")
+                                chunk_results = collect_chunk(chunk_indexes[future], future)
+                                completed += len(chunk_results)
+                                self.log_message.emit('\n'.join(
+                                    f"انتهت مهمة: {result_data.weight}" for result_data in chunk_results
+                                ))
                             except Exception as e:
                                 logging.warning(f"خطأ في مهمة: {e}")
                         
                         self.log_message.emit("تم إيقاف المعالجة بنجاح")
                         break
                     
-                    completed += 1
-                    result_data = future.result()
-                    all_processing_results.append(result_data)
-                    
-                    # تجميع نتائج التحقق من كل عملية
-                    if result_data.get('validation_results'):
-                        all_validation_results.extend(result_data['validation_results'])
+                    chunk_results = collect_chunk(chunk_indexes[future], future)
                     
-                    self.progress.emit(
-                        f"معالجة الوزن: {result_data['weight']}",
-                        completed,
-                        len(all_tasks)
-                    )
-                    self.log_message.emit(f"تم معالجة: {result_data['weight']} ({completed}/{len(all_tasks)})")
+                    # إشارة تقدم واحدة ورسالة سجل مجمّعة لكل دفعة بدل إشارتين لكل وزن
+                    messages = []
+                    for result_data in chunk_results:
+                        completed += 1
+                        messages.append(f"تم معالجة: {result_data.weight} ({completed}/{len(all_tasks)})")
+                    if chunk_results:
+                        self.progress.emit(
+                            f"معالجة الوزن: {chunk_results[-1].weight}",
+                            completed,
+                            len(all_tasks)
+                        )
+                        self.log_message.emit('\n'.join(messages))
+            
+            # النتائج بترتيب المهام (الأسماء ثم الأفعال) لا بترتيب اكتمالها، فيتطابق ما يُحفظ في كل تشغيل
+            task_positions = weight_task_positions(all_tasks)
+            all_processing_results.sort(key=lambda result_data: task_positions[(result_data.weight, result_data.pattern_type)])
             
             # دمج نتائج التحقق من جميع العمليات
             merged_cross_validator = None
@@ -268,50 +482,66 @@ class MorphologyWorker(QThread):
                 merged_cross_validator = CrossValidator()
                 merged_cross_validator.validation_results = all_validation_results
             
-            if self.should_stop:
+            if self.isInterruptionRequested():
                 self.finished.emit(False, {}, "تم إيقاف المعالجة بواسطة المستخدم")
                 return
             
+            # الكلمات المتعرّف عليها تُجمع أثناء مرور الحفظ نفسه إن وُجدت قاعدة بيانات
+            remove_diacritics = diacritics_handler.remove_diacritics
+            recognized_words = set()
+            
             # حفظ في قاعدة البيانات
             if db_manager:
                 self.log_message.emit("حفظ النتائج في قاعدة البيانات...")
-                diacritics_handler = DiacriticsHandler()
-                word_splitter = WordSplitter(diacritics_handler)
                 
-                for i, result_data in enumerate(all_processing_results):
-                    weight = result_data['weight']
-                    results = result_data['results']
-                    
-                    extra_chars_count = sum(1 for c in weight if c in FileManager.EXTRA_CHARS)
-                    
-                    if weight in names_weights:
-                        pattern_type = 'اسم'
-                    elif weight in verbs_weights:
-                        pattern_type = 'فعل'
-                    else:
-                        pattern_type = 'غير محدد'
-                    
-                    db_manager.insert_pattern(weight, pattern_type, extra_chars_count)
+                # كل الحفظ في معاملة واحدة، تبدأ بإدراج الأوزان دفعة واحدة
+                # (نوع الوزن محدد في المهمة نفسها: أسماء أو أفعال)،
+                # مع تعطيل المزامنة خلالها وإعادتها عند الخروج ولو بخطأ
+                with db_manager.fast_ingest(), db_manager.transaction():
+                    db_manager.insert_patterns_bulk([
+                        (result_data.weight, result_data.pattern_type, count_extra_chars(result_data.weight))
+                        for result_data in all_processing_results
+                    ])
                     
-                    for prefix, root, suffix in results:
-                        matched_word = prefix + root + suffix
-                        prefix_morph, intermediate_morph, root_morph, suffix_morph = word_splitter.split_word(
-                            weight, root
-                        )
-                        root_without_diacritics = diacritics_handler.remove_diacritics(root_morph)
+                    for i, result_data in enumerate(all_processing_results):
+                        weight = result_data.weight
+                        results = result_data.results
+                        
+                        # بيانات الوزن تُجلب مرة واحدة؛ تكراره فيها هو تكرار بداية الدفعة،
+                        # وcalculate_scores_batch تزيده لكل نتيجة كما يزيده إدراجها
+                        weight_meta = pattern_ranker.get_pattern_meta([weight])[weight] if pattern_ranker else None
                         
-                        score = 0
+                        # حساب نقاط كل نتائج الوزن دفعة واحدة
+                        matched = [(prefix + root + suffix, prefix, suffix) for prefix, root, suffix in results]
                         if pattern_ranker:
-                            score = pattern_ranker.calculate_score(
-                                weight, matched_word, prefix, suffix, 1
-                            )
+                            scores = pattern_ranker.calculate_scores_batch(weight, matched, meta=weight_meta)
+                        else:
+                            scores = [0] * len(matched)
                         
-                        db_manager.insert_result(
-                            matched_word, root_without_diacritics, weight,
-                            prefix, suffix, intermediate_morph, score
-                        )
-                    
-                    self.progress.emit(f"حفظ في قاعدة البيانات...", i+1, len(all_processing_results))
+                        recognized_words.update(map(remove_diacritics, [matched_word for matched_word, _, _ in matched]))
+                        
+                        # تحليل الجذور أُعدّ في عمليات المعالجة المتوازية
+                        root_analysis = result_data.root_analysis
+                        if root_analysis is None:
+                            root_analysis = analyze_weight_roots(weight, results, word_splitter)
+                        
+                        # تجميع نتائج الوزن ثم إدراجها دفعة واحدة
+                        rows = []
+                        for (prefix, root, suffix), (matched_word, _, _), score in zip(results, matched, scores):
+                            intermediate_morph, root_without_diacritics = root_analysis[root]
+                            rows.append((
+                                matched_word, root_without_diacritics, weight,
+                                prefix, suffix, intermediate_morph, score
+                            ))
+                        
+                        db_manager.insert_results_bulk(rows)
+                        
+                        self.progress.emit(f"حفظ في قاعدة البيانات...", i+1, len(all_processing_results))
+            else:
+                for result_data in all_processing_results:
+                    recognized_words.update(remove_diacritics(prefix + root + suffix)
+                                            for prefix, root, suffix in result_data.results)
+            recognized_words.discard('')
             
             # حفظ الكاش
             if cache_manager:
@@ -321,21 +551,13 @@ class MorphologyWorker(QThread):
             # حساب النتائج
             processing_time = (datetime.now() - start_time).total_seconds()
             
-            # حساب الكلمات المتعرّف عليها
-            diacritics_handler = DiacriticsHandler()
-            recognized_words = set()
-            for result_data in all_processing_results:
-                for prefix, root, suffix in result_data['results']:
-                    matched_word = prefix + root + suffix
-                    matched_word = diacritics_handler.remove_diacritics(matched_word)
-                    if matched_word:
-                        recognized_words.add(matched_word)
-            
             # إحصائيات قاعدة البيانات (قبل إغلاق الاتصال)
             stats = None
             if db_manager:
                 stats = db_manager.get_statistics()
-                # لا نغلق قاعدة البيانات هنا - سيتم إغلاقها لاحقاً عند الحاجة
+                # لا نغلق قاعدة البيانات هنا - سيتم إغلاقها لاحقاً عند الحاجة،
+                # لكن يُدمج سجل WAL هنا في خيط العامل بدل أن يؤخر إغلاق النافذة
+                db_manager.checkpoint()
             
             results_dict = {
                 'all_processing_results': all_processing_results,
@@ -359,6 +581,45 @@ class MorphologyWorker(QThread):
             self.finished.emit(False, {}, error_msg)
 
 
+class ReportWorker(QThread):
+    """عامل لتوليد التقارير (الإحصائيات والتغطية والتقرير النصي) في خيط منفصل
+
+    يفتح اتصالاً خاصاً به بقاعدة البيانات نفسها، فلا يشارك اتصال التحليل
+    الذي تملكه النافذة الرئيسية.
+    """
+    log_message = pyqtSignal(str)  # log message
+    
+    def __init__(self, results, parent=None):
+        super().__init__(parent)
+        self.results = results
+    
+    def run(self):
+        """توليد التقارير"""
+        results = self.results
+        try:
+            db_manager = DatabaseManager(results['db_manager'].db_path)
+            try:
+                if results.get('stats'):
+                    stats = dict(results['stats'])
+                else:
+                    stats = db_manager.get_statistics()
+                
+                report_generator = ReportGenerator(db_manager)
+                coverage_info = report_generator.generate_coverage_outputs(
+                    all_words_set=results.get('all_corpus_words', set()),
+                    recognized_set=results.get('recognized_words', set())
+                )
+                
+                stats['processing_time'] = results.get('processing_time', 0)
+                report_generator.generate_text_report(stats, coverage=coverage_info)
+            finally:
+                db_manager.close()
+            
+            self.log_message.emit("✅ تم إنشاء التقارير بنجاح")
+        except Exception as e:
+            self.log_message.emit(f"⚠️ تحذير: فشل إنشاء بعض التقارير: {str(e)}")
+
+
 class SettingsDialog(QDialog):
     """نافذة الإعدادات الشاملة"""
     def __init__(self, parent=None, current_settings=None):
@@ -375,10 +636,7 @@ class SettingsDialog(QDialog):
         # تعيين اتجاه RTL للنافذة
         self.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
         
-        try:
-            self.default_font = QFont("Sakkal Majalla", 15)
-        except:
-            self.default_font = QFont("Arial", 15)
+        self.default_font = ui_font(15)
         
         layout = QVBoxLayout(self)
         layout.setSpacing(15)
@@ -447,6 +705,21 @@ class SettingsDialog(QDialog):
             checkbox.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
             system_layout.addWidget(checkbox)
         
+        # عدد عمليات المعالجة (0 = تلقائي حسب المعالجات المتاحة)
+        workers_container = QWidget()
+        workers_container.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
+        workers_layout = QHBoxLayout(workers_container)
+        workers_layout.setContentsMargins(0, 0, 0, 0)
+        workers_label = QLabel("عدد عمليات المعالجة (0 = تلقائي):")
+        workers_label.setFont(self.default_font)
+        self.max_workers = QSpinBox()
+        self.max_workers.setFont(self.default_font)
+        self.max_workers.setRange(0, available_cpu_count())
+        workers_layout.addWidget(workers_label)
+        workers_layout.addWidget(self.max_workers)
+        workers_layout.addStretch()
+        system_layout.addWidget(workers_container)
+        
         system_group.setLayout(system_layout)
         layout.addWidget(system_group)
         
@@ -551,6 +824,7 @@ class SettingsDialog(QDialog):
         self.use_database.setChecked(settings.get('use_database', True))
         self.generate_report.setChecked(settings.get('generate_report', True))
         self.use_cross_validation.setChecked(settings.get('use_cross_validation', True))
+        self.max_workers.setValue(settings.get('max_workers', 0))
         
         # مسارات الملفات
         self.database_folder.setText(settings.get('database_folder', 'قواعد البيانات'))
@@ -568,6 +842,7 @@ class SettingsDialog(QDialog):
             'use_database': self.use_database.isChecked(),
             'generate_report': self.generate_report.isChecked(),
             'use_cross_validation': self.use_cross_validation.isChecked(),
+            'max_workers': self.max_workers.value(),
             'database_folder': self.database_folder.text(),
             'corpus_folder': self.corpus_folder.text(),
             'names_results_dir': self.names_results_dir.text(),
@@ -575,6 +850,127 @@ class SettingsDialog(QDialog):
         }
 
 
+# أنماط النافذة الرئيسية في ورقة واحدة تُطبق على الويدجت المركزي فيحللها Qt مرة واحدة،
+# بدل ورقة مستقلة لكل ويدجت. الويدجتات تُميَّز باسم الكائن (#) أو بالخاصية class.
+# (النوافذ الحوارية ليست من أبناء الويدجت المركزي فلا تتأثر بها)
+MAIN_WINDOW_QSS = """
+    * {
+        background-color: #f5f5f5;
+    }
+    QWidget#buttonsBar {
+        background-color: #e8e8e8;
+        border-radius: 3px;
+    }
+    QPushButton[class="mainButton"] {
+        background-color: #d0d0d0;
+        color: #000000;
+        font-size: 15px;
+        font-weight: bold;
+        border: 1px solid #b0b0b0;
+        border-radius: 3px;
+        padding: 8px;
+    }
+    QPushButton[class="mainButton"]:hover {
+        background-color: #c0c0c0;
+    }
+    QPushButton[class="mainButton"]:pressed {
+        background-color: #b0b0b0;
+    }
+    QPushButton[class="mainButton"]:disabled {
+        background-color: #e8e8e8;
+        color: #888888;
+    }
+    QPushButton[class="smallButton"] {
+        background-color: #e0e0e0;
+        color: #000000;
+        border: 1px solid #c0c0c0;
+        border-radius: 3px;
+        padding: 5px 10px;
+        font-size: 15px;
+    }
+    QPushButton[class="smallButton"]:hover {
+        background-color: #d0d0d0;
+    }
+    QPushButton[class="tabButton"] {
+        background-color: #d0d0d0;
+        color: #000000;
+        border: 1px solid #b0b0b0;
+        border-radius: 3px;
+        padding: 3px 10px;
+        font-size: 12px;
+    }
+    QPushButton[class="tabButton"]:hover {
+        background-color: #c0c0c0;
+    }
+    QPushButton[class="tabButton"]:checked {
+        background-color: #a0a0a0;
+        font-weight: bold;
+    }
+    QSplitter::handle {
+        background-color: #f5f5f5;
+        border: none;
+    }
+    QSplitter::handle:hover {
+        background-color: #e8e8e8;
+    }
+    QLabel#weightsStats {
+        font-weight: bold;
+        font-size: 15px;
+        color: #666666;
+    }
+    QLabel[class="columnTitle"] {
+        font-weight: bold;
+        font-size: 15px;
+        color: #000000;
+    }
+    QLabel[class="sectionLabel"] {
+        font-weight: bold;
+        color: #000000;
+    }
+    QLabel#statsLabel {
+        background-color: #ffffff;
+        border: 1px solid #c0c0c0;
+        padding: 10px;
+        color: #000000;
+    }
+    QListView#weightsView, QListWidget#filesList {
+        background-color: #ffffff;
+        border: 1px solid #c0c0c0;
+        color: #000000;
+    }
+    QListView#weightsView::item, QListWidget#filesList::item {
+        padding: 5px;
+        border-bottom: 1px solid #e8e8e8;
+    }
+    QListView#weightsView::item:selected {
+        background-color: #d0d0d0;
+    }
+    QProgressBar {
+        background-color: #e0e0e0;
+        border: 1px solid #c0c0c0;
+        border-radius: 3px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        background-color: #b0b0b0;
+    }
+    QTextEdit, QPlainTextEdit {
+        background-color: #ffffff;
+        border: 1px solid #c0c0c0;
+        color: #000000;
+    }
+"""
+
+# نمط نص تقرير التحقق التبادلي: النص نفسه في كل فتح للنافذة الحوارية
+VALIDATION_REPORT_QSS = """
+    QPlainTextEdit {
+        background-color: #ffffff;
+        border: 1px solid #c0c0c0;
+        color: #000000;
+    }
+"""
+
+
 class MorphologyMainWindow(QMainWindow):
     """النافذة الرئيسية للمختار الصرفي"""
     
@@ -587,12 +983,33 @@ class MorphologyMainWindow(QMainWindow):
         self.all_weights = {}
         self.file_paths = []
         self.processing_worker = None
+        self.report_worker = None
+        self.pending_report_results = None  # نتائج تنتظر انتهاء عامل التقارير الحالي
+        self.close_after_reports = False  # الإغلاق مؤجل حتى ينتهي عامل التقارير
         self.db_manager = None
         self.last_results = None
+        self.weight_results_index = {}  # {الوزن: نتيجته} من آخر تحليل
+        self.weights_file_manager = None  # قارئ ملفات الأوزان، يُنشأ عند أول استيراد
         self.is_paused = False
         self.paused_state = None
+        self.close_after_worker = False  # الإغلاق مؤجل حتى يتوقف عامل التحليل
+        self.close_confirm_box = None  # تأكيد الإغلاق المعروض أثناء المعالجة
         self.current_weights_tab = 'all'  # التبويب المختار حالياً: 'names', 'verbs', أو 'all'
         
+        # آخر تقدم وصل من العامل (current, total)، يُطبق على شريط التقدم كل 50ms على الأكثر
+        self.pending_progress = None
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(50)
+        self.progress_timer.timeout.connect(self.apply_pending_progress)
+        
+        # رسائل السجل تُجمع وتُضاف إلى السجل دفعة واحدة بعد 50ms من أول رسالة فيها
+        self.log_buffer = []
+        self.log_timestamp = (None, '')  # (الثانية، نصها) لتُنسَّق مرة واحدة لكل ثانية
+        self.log_timer = QTimer(self)
+        self.log_timer.setSingleShot(True)
+        self.log_timer.setInterval(50)
+        self.log_timer.timeout.connect(self.flush_log)
+        
         self.init_ui()
         self.load_default_paths()
     
@@ -606,6 +1023,7 @@ class MorphologyMainWindow(QMainWindow):
             'use_database': True,
             'generate_report': True,
             'use_cross_validation': True,
+            'max_workers': 0,  # 0 = تلقائي حسب المعالجات المتاحة
             'database_folder': 'قواعد البيانات',
             'corpus_folder': 'قواعد البيانات/المدونة',
             'names_results_dir': 'قواعد البيانات/النتائج_الأسماء',
@@ -613,17 +1031,22 @@ class MorphologyMainWindow(QMainWindow):
         }
     
     def load_default_paths(self):
-        """تحميل المسارات الافتراضية"""
-        database_folder = self.settings['database_folder']
-        # تحويل المسار النسبي إلى مطلق إذا لزم الأمر
-        if not os.path.isabs(database_folder):
-            database_folder = os.path.join(self.base_dir, database_folder)
-        self.settings['symbols_file_path'] = os.path.join(database_folder, "الخريطة.txt")
-        self.settings['tags_file_path'] = os.path.join(database_folder, "0.3 الوسم.txt")
-        self.settings['names_weights_file'] = os.path.join(database_folder, "0.3 أوزان_الأسماء.txt")
-        self.settings['verbs_weights_file'] = os.path.join(database_folder, "0.3 أوزان_الأفعال.txt")
-        self.settings['names_affixes_file'] = os.path.join(database_folder, "0.3 سوابق ولواحق_أسماء.txt")
-        self.settings['verbs_affixes_file'] = os.path.join(database_folder, "0.3 سوابق ولواحق_أفعال.txt")
+        """تحميل المسارات الافتراضية
+
+        تُحسب مرة واحدة عند بدء النافذة وعند تغيير الإعدادات، ويعيد استعمالها
+        استيراد الأوزان وبدء التحليل بدل إعادة بنائها.
+        """
+        # تحويل مسارات المجلدات النسبية إلى مطلقة مرة واحدة
+        self.resolved_paths = {}
+        for key in FOLDER_SETTINGS:
+            folder = self.settings[key]
+            if not os.path.isabs(folder):
+                folder = os.path.join(self.base_dir, folder)
+            self.resolved_paths[key] = folder
+        
+        self.database_folder = database_folder = self.resolved_paths['database_folder']
+        for key, file_name in DATA_FILE_NAMES.items():
+            self.settings[key] = os.path.join(database_folder, file_name)
     
     def init_ui(self):
         """تهيئة الواجهة"""
@@ -631,18 +1054,13 @@ class MorphologyMainWindow(QMainWindow):
         self.setGeometry(50, 50, 1600, 950)
         
         # تعيين الخط الافتراضي (Sakkal Majalla)
-        try:
-            self.default_font = QFont("Sakkal Majalla", 15)
-            self.default_font.setBold(False)
-        except:
-            # استخدام خط عربي بديل
-            self.default_font = QFont("Arial", 15)
-            self.default_font.setBold(False)
-        
-        # الويدجت المركزي
+        self.default_font = ui_font(15)
+        
+        # الويدجت المركزي (خطه يرثه كل ما في النافذة فلا يُعيَّن لكل ويدجت)
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
-        central_widget.setStyleSheet("background-color: #f5f5f5;")
+        central_widget.setFont(self.default_font)
+        central_widget.setStyleSheet(MAIN_WINDOW_QSS)
         
         # التخطيط الرئيسي (عمودي)
         main_layout = QVBoxLayout(central_widget)
@@ -651,7 +1069,7 @@ class MorphologyMainWindow(QMainWindow):
         
         # ========== شريط الأزرار (صف واحد) ==========
         buttons_container = QWidget()
-        buttons_container.setStyleSheet("background-color: #e8e8e8; border-radius: 3px;")
+        buttons_container.setObjectName("buttonsBar")
         # تعيين الاتجاه من اليمين لليسار (RTL) للـ widget
         buttons_container.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
         buttons_layout = QHBoxLayout(buttons_container)
@@ -707,76 +1125,71 @@ class MorphologyMainWindow(QMainWindow):
         splitter = QSplitter(Qt.Orientation.Horizontal)
         splitter.setChildrenCollapsible(False)
         splitter.setHandleWidth(20)
-        splitter.setOpaqueResize(True)
-        splitter.setStyleSheet("""
-            QSplitter::handle {
-                background-color: #f5f5f5;
-                border: none;
-            }
-            QSplitter::handle:hover {
-                background-color: #e8e8e8;
-            }
-        """)
+        # السحب يُظهر خط الفاصل فقط، وتُعاد تخطيط الأعمدة مرة واحدة عند الإفلات
+        splitter.setOpaqueResize(False)
+        self.splitter = splitter
+        
+        # الأعمدة تُبنى بعد أول ظهور للنافذة (build_columns) لتُرسم النافذة أولاً
+        self.columns_built = False
+        
+        # الفواصل قابلة للسحب بدون إظهار النقاط
+        # (الـ handles موجودة بشكل افتراضي ويمكن السحب عليها)
         
+        main_layout.addWidget(splitter, stretch=1)
+    
+    def showEvent(self, event):
+        """عند أول ظهور للنافذة: جدولة بناء الأعمدة بعد رسمها"""
+        super().showEvent(event)
+        if not self.columns_built:
+            self.columns_built = True
+            QTimer.singleShot(0, self.build_columns)
+    
+    def build_columns(self):
+        """بناء الأعمدة السفلية داخل الـ Splitter"""
         # الترتيب المعكوس: النتائج (يمين) | المدخلات (وسط) | الأوزان (يسار)
         # العمود الأول: النتائج (على اليمين)
         results_widget = self.create_results_column()
-        splitter.addWidget(results_widget)
+        self.splitter.addWidget(results_widget)
         
         # العمود الثاني: المدخلات (في المنتصف)
         inputs_widget = self.create_inputs_column()
-        splitter.addWidget(inputs_widget)
+        self.splitter.addWidget(inputs_widget)
         
         # العمود الثالث: الأوزان (في الأخير/اليسار)
         weights_widget = self.create_weights_column()
-        splitter.addWidget(weights_widget)
-        
-        # تعيين النسب (تكبير الأعمدة)
-        splitter.setSizes([650, 600, 350])
-        
-        # الفواصل قابلة للسحب بدون إظهار النقاط
-        # (الـ handles موجودة بشكل افتراضي ويمكن السحب عليها)
+        self.splitter.addWidget(weights_widget)
         
-        main_layout.addWidget(splitter, stretch=1)
+        # تعيين النسب (تكبير الأعمدة)، وتوزيع تغير عرض النافذة على النتائج والمدخلات أكثر من الأوزان
+        self.splitter.setSizes([650, 600, 350])
+        self.splitter.setStretchFactor(0, 3)
+        self.splitter.setStretchFactor(1, 3)
+        self.splitter.setStretchFactor(2, 1)
     
     def create_button(self, text, slot):
-        """إنشاء زر بنمط موحد"""
+        """إنشاء زر بنمط موحد
+
+        النمط والخط (الحجم والسماكة) من قاعدة mainButton في MAIN_WINDOW_QSS وخط التطبيق،
+        فلا يُعيَّن للزر خط أو ورقة أنماط خاصة.
+        """
         btn = QPushButton(text)
-        btn.setFont(self.default_font)
         btn.setMinimumHeight(40)
         btn.setMinimumWidth(110)
-        btn.setStyleSheet("""
-            QPushButton {
-                background-color: #d0d0d0;
-                color: #000000;
-                font-size: 15px;
-                font-weight: bold;
-                border: 1px solid #b0b0b0;
-                border-radius: 3px;
-                padding: 8px;
-            }
-            QPushButton:hover {
-                background-color: #c0c0c0;
-            }
-            QPushButton:pressed {
-                background-color: #b0b0b0;
-            }
-            QPushButton:disabled {
-                background-color: #e8e8e8;
-                color: #888888;
-            }
-        """)
+        btn.setProperty("class", "mainButton")
         btn.clicked.connect(slot)
         return btn
     
+    def create_column_layout(self, widget):
+        """تخطيط عمودي موحد المسافات والهوامش لأعمدة النافذة"""
+        layout = QVBoxLayout(widget)
+        layout.setSpacing(8)
+        layout.setContentsMargins(8, 8, 8, 8)
+        return layout
+    
     def create_weights_column(self):
         """إنشاء عمود الأوزان"""
         widget = QWidget()
-        widget.setStyleSheet("background-color: #f5f5f5;")
         widget.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للويدجت الرئيسي
-        layout = QVBoxLayout(widget)
-        layout.setSpacing(8)
-        layout.setContentsMargins(8, 8, 8, 8)
+        layout = self.create_column_layout(widget)
         
         # السطر الأول: عدد الأوزان والتبويبات
         header_layout = QHBoxLayout()
@@ -785,168 +1198,102 @@ class MorphologyMainWindow(QMainWindow):
         
         # عدد الأوزان
         self.weights_stats = QLabel("عدد الأوزان: 0")
-        self.weights_stats.setFont(self.default_font)
         self.weights_stats.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للـ Label
-        self.weights_stats.setStyleSheet("font-weight: bold; font-size: 15px; color: #666666;")
+        self.weights_stats.setObjectName("weightsStats")
         header_layout.addWidget(self.weights_stats)
         
         header_layout.addStretch()
         
         # أزرار التبويبات
         self.btn_names_tab = QPushButton("الأسماء")
-        self.btn_names_tab.setFont(self.default_font)
         self.btn_names_tab.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للزر
         self.btn_names_tab.setCheckable(True)
         self.btn_names_tab.setChecked(True)
         self.btn_names_tab.setMaximumHeight(30)
-        self.btn_names_tab.setStyleSheet("""
-            QPushButton {
-                background-color: #d0d0d0;
-                color: #000000;
-                border: 1px solid #b0b0b0;
-                border-radius: 3px;
-                padding: 3px 10px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #c0c0c0;
-            }
-            QPushButton:checked {
-                background-color: #a0a0a0;
-                font-weight: bold;
-            }
-        """)
-        self.btn_names_tab.clicked.connect(lambda: self.switch_weights_tab('names'))
+        self.btn_names_tab.setProperty("class", "tabButton")
+        self.btn_names_tab.clicked.connect(partial(self.switch_weights_tab, 'names'))
         header_layout.addWidget(self.btn_names_tab)
         
         self.btn_verbs_tab = QPushButton("الأفعال")
-        self.btn_verbs_tab.setFont(self.default_font)
         self.btn_verbs_tab.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للزر
         self.btn_verbs_tab.setCheckable(True)
         self.btn_verbs_tab.setMaximumHeight(30)
-        self.btn_verbs_tab.setStyleSheet(self.btn_names_tab.styleSheet())
-        self.btn_verbs_tab.clicked.connect(lambda: self.switch_weights_tab('verbs'))
+        self.btn_verbs_tab.setProperty("class", "tabButton")
+        self.btn_verbs_tab.clicked.connect(partial(self.switch_weights_tab, 'verbs'))
         header_layout.addWidget(self.btn_verbs_tab)
         
         self.btn_all_tab = QPushButton("الكل")
-        self.btn_all_tab.setFont(self.default_font)
         self.btn_all_tab.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للزر
         self.btn_all_tab.setCheckable(True)
         self.btn_all_tab.setMaximumHeight(30)
-        self.btn_all_tab.setStyleSheet(self.btn_names_tab.styleSheet())
-        self.btn_all_tab.clicked.connect(lambda: self.switch_weights_tab('all'))
+        self.btn_all_tab.setProperty("class", "tabButton")
+        self.btn_all_tab.clicked.connect(partial(self.switch_weights_tab, 'all'))
         header_layout.addWidget(self.btn_all_tab)
         
         layout.addLayout(header_layout)
         
-        # قائمة الأسماء
-        self.names_list = QListWidget()
-        self.names_list.setFont(self.default_font)
-        self.names_list.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للقائمة
-        self.names_list.setStyleSheet("""
-            QListWidget {
-                background-color: #ffffff;
-                border: 1px solid #c0c0c0;
-                color: #000000;
-            }
-            QListWidget::item {
-                padding: 5px;
-                border-bottom: 1px solid #e8e8e8;
-            }
-            QListWidget::item:selected {
-                background-color: #d0d0d0;
-            }
-        """)
-        self.names_list.itemClicked.connect(self.on_weight_selected)
-        
-        # قائمة الأفعال
-        self.verbs_list = QListWidget()
-        self.verbs_list.setFont(self.default_font)
-        self.verbs_list.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للقائمة
-        self.verbs_list.setStyleSheet(self.names_list.styleSheet())
-        self.verbs_list.itemClicked.connect(self.on_weight_selected)
-        
-        # قائمة الكل
-        self.all_list = QListWidget()
-        self.all_list.setFont(self.default_font)
-        self.all_list.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للقائمة
-        self.all_list.setStyleSheet(self.names_list.styleSheet())
-        self.all_list.itemClicked.connect(self.on_weight_selected)
-        
-        # إضافة القوائم مباشرة (سنستخدم show/hide)
-        layout.addWidget(self.names_list, stretch=1)
-        layout.addWidget(self.verbs_list, stretch=1)
-        layout.addWidget(self.all_list, stretch=1)
-        
-        # إخفاء القوائم غير المختارة
-        self.verbs_list.hide()
-        self.all_list.hide()
+        # نموذج واحد لكل الأوزان، ومرشح واحد يُبدَّل نوعه عند تبديل التبويب (الأسماء، الأفعال، الكل)
+        self.weights_model = WeightsListModel(self)
+        self.weights_proxy = WeightsFilterProxy('names', self)
+        self.weights_proxy.setSourceModel(self.weights_model)
+        
+        # قائمة واحدة لكل التبويبات
+        self.weights_view = QListView()
+        self.weights_view.setObjectName("weightsView")
+        self.weights_view.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL للقائمة
+        self.weights_view.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        # العناصر سطر واحد: ارتفاع موحد يُحسب مرة واحدة، وتخطيط على دفعات للقوائم الطويلة
+        self.weights_view.setUniformItemSizes(True)
+        self.weights_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.weights_view.setBatchSize(200)
+        self.weights_view.setModel(self.weights_proxy)
+        self.weights_view.clicked.connect(self.on_weight_selected)
+        
+        # التبويب: (نوع أوزانه في المرشح، زره)
+        self.weights_tabs = {
+            'names': ('names', self.btn_names_tab),
+            'verbs': ('verbs', self.btn_verbs_tab),
+            'all': (None, self.btn_all_tab),
+        }
+        layout.addWidget(self.weights_view, stretch=1)
         
         return widget
     
     def create_inputs_column(self):
         """إنشاء عمود المدخلات"""
         widget = QWidget()
-        widget.setStyleSheet("background-color: #f5f5f5;")
-        layout = QVBoxLayout(widget)
-        layout.setSpacing(8)
-        layout.setContentsMargins(8, 8, 8, 8)
+        layout = self.create_column_layout(widget)
         
         # العنوان
         title = QLabel("ملفات المدونة")
-        title.setFont(self.default_font)
-        title.setStyleSheet("font-weight: bold; font-size: 15px; color: #000000;")
+        title.setProperty("class", "columnTitle")
         layout.addWidget(title)
         
         # قائمة الملفات
         self.files_list = QListWidget()
-        self.files_list.setFont(self.default_font)
-        self.files_list.setStyleSheet("""
-            QListWidget {
-                background-color: #ffffff;
-                border: 1px solid #c0c0c0;
-                color: #000000;
-            }
-            QListWidget::item {
-                padding: 5px;
-                border-bottom: 1px solid #e8e8e8;
-            }
-        """)
+        self.files_list.setObjectName("filesList")
+        self.files_list.setUniformItemSizes(True)
+        self.files_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.files_list.setBatchSize(200)
         layout.addWidget(self.files_list)
         
         # شريط التقدم
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                background-color: #e0e0e0;
-                border: 1px solid #c0c0c0;
-                border-radius: 3px;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background-color: #b0b0b0;
-            }
-        """)
         layout.addWidget(self.progress_bar)
         
         # سجل العمليات
         log_label = QLabel("سجل العمليات")
-        log_label.setFont(self.default_font)
-        log_label.setStyleSheet("font-weight: bold; color: #000000;")
+        log_label.setProperty("class", "sectionLabel")
         layout.addWidget(log_label)
         
-        self.log_text = QTextEdit()
+        # سجل نصي بسيط: تخطيط بالأسطر وإضافة بكلفة ثابتة، مع حد لعدد الأسطر المحفوظة
+        # (وبلا سجل تراجع، فهو للقراءة فقط ولا داعي لحفظ كل إضافة)
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setFont(self.default_font)
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #ffffff;
-                border: 1px solid #c0c0c0;
-                color: #000000;
-                font-size: 15px;
-            }
-        """)
+        self.log_text.setUndoRedoEnabled(False)
+        self.log_text.setFont(ui_font(TEXT_VIEW_POINT_SIZE))
+        self.log_text.setMaximumBlockCount(5000)
         layout.addWidget(self.log_text, stretch=1)  # إضافة stretch factor
         
         return widget
@@ -954,67 +1301,36 @@ class MorphologyMainWindow(QMainWindow):
     def create_results_column(self):
         """إنشاء عمود النتائج"""
         widget = QWidget()
-        widget.setStyleSheet("background-color: #f5f5f5;")
-        layout = QVBoxLayout(widget)
-        layout.setSpacing(8)
-        layout.setContentsMargins(8, 8, 8, 8)
+        layout = self.create_column_layout(widget)
         
         # العنوان
         title = QLabel("نتائج التحليل")
-        title.setFont(self.default_font)
-        title.setStyleSheet("font-weight: bold; font-size: 15px; color: #000000;")
+        title.setProperty("class", "columnTitle")
         layout.addWidget(title)
         
         # الإحصائيات السريعة
         self.stats_label = QLabel("لا توجد نتائج بعد")
-        self.stats_label.setFont(self.default_font)
-        self.stats_label.setStyleSheet("""
-            background-color: #ffffff;
-            border: 1px solid #c0c0c0;
-            padding: 10px;
-            color: #000000;
-        """)
+        self.stats_label.setObjectName("statsLabel")
         layout.addWidget(self.stats_label)
         
         # عرض النتائج
         results_label = QLabel("تفاصيل النتائج")
-        results_label.setFont(self.default_font)
-        results_label.setStyleSheet("font-weight: bold; color: #000000;")
+        results_label.setProperty("class", "sectionLabel")
         layout.addWidget(results_label)
         
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
-        self.results_text.setFont(self.default_font)
-        self.results_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #ffffff;
-                border: 1px solid #c0c0c0;
-                color: #000000;
-                font-size: 15px;
-            }
-        """)
+        self.results_text.setUndoRedoEnabled(False)
+        self.results_text.setFont(ui_font(TEXT_VIEW_POINT_SIZE))
         layout.addWidget(self.results_text, stretch=1)  # إضافة stretch factor
         
         return widget
     
     def create_small_button(self, text, slot):
-        """إنشاء زر صغير"""
+        """إنشاء زر صغير (نمطه من قاعدة smallButton في MAIN_WINDOW_QSS)"""
         btn = QPushButton(text)
-        btn.setFont(self.default_font)
         btn.setMinimumHeight(35)
-        btn.setStyleSheet("""
-            QPushButton {
-                background-color: #e0e0e0;
-                color: #000000;
-                border: 1px solid #c0c0c0;
-                border-radius: 3px;
-                padding: 5px 10px;
-                font-size: 15px;
-            }
-            QPushButton:hover {
-                background-color: #d0d0d0;
-            }
-        """)
+        btn.setProperty("class", "smallButton")
         btn.clicked.connect(slot)
         return btn
     
@@ -1022,12 +1338,9 @@ class MorphologyMainWindow(QMainWindow):
     
     def import_weights(self):
         """استيراد الأوزان"""
-        database_folder = self.settings['database_folder']
-        # تحويل المسار النسبي إلى مطلق إذا لزم الأمر
-        if not os.path.isabs(database_folder):
-            database_folder = os.path.join(self.base_dir, database_folder)
-        names_file = os.path.join(database_folder, "0.3 أوزان_الأسماء.txt")
-        verbs_file = os.path.join(database_folder, "0.3 أوزان_الأفعال.txt")
+        database_folder = self.database_folder
+        names_file = self.settings['names_weights_file']
+        verbs_file = self.settings['verbs_weights_file']
         
         if not os.path.exists(names_file) or not os.path.exists(verbs_file):
             QMessageBox.warning(
@@ -1038,69 +1351,59 @@ class MorphologyMainWindow(QMainWindow):
             return
         
         try:
-            # إنشاء FileManager مؤقت
-            # corpus_type قيمة افتراضية (لن تُستخدم - يتم الاكتشاف تلقائياً)
-            temp_file_manager = FileManager(
-                corpus_type=self.settings.get('corpus_type', 'list'),
-                match_whole_word=self.settings['match_whole_word'],
-                affixes_data={'prefixes': [], 'suffixes': []},
-                tags_map={},
-                db_manager=None,
-                cache_manager=None,
-                pattern_ranker=None,
-                cross_validator=None
-            )
+            # FileManager واحد لقراءة ملفات الأوزان يُعاد استعماله في كل استيراد وتحديث
+            # (قراءة الأوزان لا تعتمد على الإعدادات ولا على السوابق واللواحق)
+            if self.weights_file_manager is None:
+                # corpus_type قيمة افتراضية (لن تُستخدم - يتم الاكتشاف تلقائياً)
+                self.weights_file_manager = FileManager(
+                    corpus_type=self.settings.get('corpus_type', 'list'),
+                    match_whole_word=self.settings['match_whole_word'],
+                    affixes_data={'prefixes': [], 'suffixes': []},
+                    tags_map={},
+                    db_manager=None,
+                    cache_manager=None,
+                    pattern_ranker=None,
+                    cross_validator=None
+                )
+            read_weights = self.weights_file_manager.read_weights_and_derived_words
             
-            self.names_weights = temp_file_manager.read_weights_and_derived_words(names_file)
-            temp_file_manager.affixes_data = {'prefixes': [], 'suffixes': []}
-            self.verbs_weights = temp_file_manager.read_weights_and_derived_words(verbs_file)
-            self.all_weights = {**self.names_weights, **self.verbs_weights}
+            self.names_weights = load_data_file(names_file, read_weights)
+            self.verbs_weights = load_data_file(verbs_file, read_weights)
+            # عرض موحد للقاموسين دون نسخهما في قاموس جديد
+            self.all_weights = ChainMap(self.names_weights, self.verbs_weights)
+            weights_count = len(self.all_weights)  # الوزن الوارد في الملفين يُعد مرة واحدة
             
             self.update_weights_display()
-            self.log_message(f"تم تحميل {len(self.all_weights)} وزن صرفي")
+            self.log_message(f"تم تحميل {weights_count} وزن صرفي")
             QMessageBox.information(
                 self, "نجح",
                 f"تم تحميل الأوزان بنجاح:\n"
                 f"الأسماء: {len(self.names_weights)}\n"
                 f"الأفعال: {len(self.verbs_weights)}\n"
-                f"الإجمالي: {len(self.all_weights)}"
+                f"الإجمالي: {weights_count}"
             )
         except Exception as e:
             QMessageBox.critical(self, "خطأ", f"فشل تحميل الأوزان:\n{str(e)}")
     
     def update_weights_display(self):
         """تحديث عرض الأوزان"""
-        self.names_list.clear()
-        self.verbs_list.clear()
-        self.all_list.clear()
-        
-        for weight, derived in self.names_weights.items():
-            item_text = f"{weight}"
-            if derived:
-                item_text += f" ({len(derived)} مشتق)"
-            self.names_list.addItem(item_text)
-            self.all_list.addItem(f"[اسم] {item_text}")
-        
-        for weight, derived in self.verbs_weights.items():
-            item_text = f"{weight}"
-            if derived:
-                item_text += f" ({len(derived)} مشتق)"
-            self.verbs_list.addItem(item_text)
-            self.all_list.addItem(f"[فعل] {item_text}")
-        
-        total = len(self.all_weights)
+        # صفوف النموذج فقط، والمرشحات تتبع إعادة ضبطه
+        rows = [('names', weight, len(derived) if derived else 0)
+                for weight, derived in self.names_weights.items()]
+        rows.extend(('verbs', weight, len(derived) if derived else 0)
+                    for weight, derived in self.verbs_weights.items())
+        self.weights_model.set_rows(rows)
+        
         names_count = len(self.names_weights)
         verbs_count = len(self.verbs_weights)
+        total = names_count + verbs_count
         self.weights_stats.setText(
             f"عدد الأوزان: {total} (أسماء: {names_count}, أفعال: {verbs_count})"
         )
     
     def select_corpus(self):
         """اختيار مجلد المدونة"""
-        corpus_folder = self.settings['corpus_folder']
-        # تحويل المسار النسبي إلى مطلق إذا لزم الأمر
-        if not os.path.isabs(corpus_folder):
-            corpus_folder = os.path.join(self.base_dir, corpus_folder)
+        corpus_folder = self.resolved_paths['corpus_folder']
         if not os.path.exists(corpus_folder):
             corpus_folder = str(self.base_dir)
         
@@ -1111,23 +1414,30 @@ class MorphologyMainWindow(QMainWindow):
         )
         
         if folder:
-            # قراءة جميع ملفات .txt و .docx من المجلد
+            # قراءة جميع ملفات .txt و .docx من المجلد مع بناء سطور عرضها في المرور نفسه
+            # (scandir يعيد نوع المدخل مع الأسماء، و entry.stat يُخزَّن فلا يتكرر استدعاؤه)
             self.file_paths = []
-            for file_name in os.listdir(folder):
-                file_path = os.path.join(folder, file_name)
-                if os.path.isfile(file_path):
+            file_entries = []
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    file_name = entry.name
+                    lower_name = file_name.lower()
                     # دعم ملفات .txt و .docx فقط
-                    if file_name.lower().endswith(('.txt', '.docx')):
-                        self.file_paths.append(file_path)
+                    if not lower_name.endswith(CORPUS_FILE_EXTENSIONS) or not entry.is_file():
+                        continue
+                    self.file_paths.append(entry.path)
+                    size_mb = entry.stat().st_size / (1024 * 1024)
+                    file_ext = lower_name[lower_name.rfind('.'):]
+                    file_entries.append(f"{file_name} ({size_mb:.2f} MB) [{file_ext}]")
             
             if self.file_paths:
+                # إضافة كل الملفات دفعة واحدة مع إيقاف إعادة الرسم والإشارات أثناء الملء
+                self.files_list.setUpdatesEnabled(False)
+                self.files_list.blockSignals(True)
                 self.files_list.clear()
-                for file_path in self.file_paths:
-                    file_name = os.path.basename(file_path)
-                    file_size = os.path.getsize(file_path)
-                    size_mb = file_size / (1024 * 1024)
-                    file_ext = os.path.splitext(file_name)[1].lower()
-                    self.files_list.addItem(f"{file_name} ({size_mb:.2f} MB) [{file_ext}]")
+                self.files_list.addItems(file_entries)
+                self.files_list.blockSignals(False)
+                self.files_list.setUpdatesEnabled(True)
                 
                 self.log_message(f"تم اختيار مجلد المدونة: {folder}")
                 self.log_message(f"تم العثور على {len(self.file_paths)} ملف (.txt و .docx)")
@@ -1159,32 +1469,15 @@ class MorphologyMainWindow(QMainWindow):
         # إظهار شريط التقدم
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # indeterminate
+        self.pending_progress = None
+        self.progress_timer.start()
         
-        # إعداد التكوين
-        # تحويل المسارات النسبية إلى مطلقة
-        database_folder = self.settings['database_folder']
-        if not os.path.isabs(database_folder):
-            database_folder = os.path.join(self.base_dir, database_folder)
-        
-        names_results_dir = self.settings['names_results_dir']
-        if not os.path.isabs(names_results_dir):
-            names_results_dir = os.path.join(self.base_dir, names_results_dir)
-        
-        verbs_results_dir = self.settings['verbs_results_dir']
-        if not os.path.isabs(verbs_results_dir):
-            verbs_results_dir = os.path.join(self.base_dir, verbs_results_dir)
-        
+        # إعداد التكوين (المسارات المطلقة محسوبة في load_default_paths)
         config = {
             **self.settings,
             'file_paths': self.file_paths,
-            'names_weights_file': os.path.join(database_folder, "0.3 أوزان_الأسماء.txt"),
-            'verbs_weights_file': os.path.join(database_folder, "0.3 أوزان_الأفعال.txt"),
-            'names_affixes_file': os.path.join(database_folder, "0.3 سوابق ولواحق_أسماء.txt"),
-            'verbs_affixes_file': os.path.join(database_folder, "0.3 سوابق ولواحق_أفعال.txt"),
-            'symbols_file_path': os.path.join(database_folder, "الخريطة.txt"),
-            'tags_file_path': os.path.join(database_folder, "0.3 الوسم.txt"),
-            'names_results_dir': names_results_dir,
-            'verbs_results_dir': verbs_results_dir,
+            'names_results_dir': self.resolved_paths['names_results_dir'],
+            'verbs_results_dir': self.resolved_paths['verbs_results_dir'],
             'selected_weights_tab': self.current_weights_tab,  # التبويب المختار: 'names', 'verbs', أو 'all'
             'corpus_type': self.settings.get('corpus_type', 'list')
         }
@@ -1201,7 +1494,7 @@ class MorphologyMainWindow(QMainWindow):
     def stop_analysis(self):
         """إيقاف التحليل"""
         if self.processing_worker:
-            self.processing_worker.stop()
+            self.processing_worker.requestInterruption()
             self.is_paused = True
             self.btn_stop.setEnabled(False)
             self.btn_resume.setEnabled(True)
@@ -1217,7 +1510,15 @@ class MorphologyMainWindow(QMainWindow):
             self.start_analysis()
     
     def on_progress(self, message, current, total):
-        """تحديث التقدم"""
+        """تحديث التقدم (يُحفظ آخره فقط ويرسمه المؤقت، فلا يتبع الرسم معدل الإشارات)"""
+        self.pending_progress = (current, total)
+    
+    def apply_pending_progress(self):
+        """تطبيق آخر تقدم معلّق على شريط التقدم"""
+        if self.pending_progress is None:
+            return
+        current, total = self.pending_progress
+        self.pending_progress = None
         if total > 0:
             self.progress_bar.setRange(0, total)
             self.progress_bar.setValue(current)
@@ -1235,6 +1536,8 @@ class MorphologyMainWindow(QMainWindow):
         self.btn_settings.setEnabled(True)
         self.is_paused = False
         
+        self.progress_timer.stop()
+        self.pending_progress = None
         self.progress_bar.setVisible(False)
         
         if success:
@@ -1243,6 +1546,12 @@ class MorphologyMainWindow(QMainWindow):
             # حفظ النتائج
             self.last_results = results
             
+            # فهرس نتائج الأوزان لعرض نتيجة الوزن المختار دون البحث في القائمة عند كل نقرة
+            # (الوزن المكرر في الأسماء والأفعال تبقى له نتيجته الأولى)
+            self.weight_results_index = {}
+            for result_data in results.get('all_processing_results', []):
+                self.weight_results_index.setdefault(result_data.weight, result_data)
+            
             # حفظ مرجع قاعدة البيانات
             if results.get('db_manager'):
                 self.db_manager = results['db_manager']
@@ -1293,15 +1602,12 @@ class MorphologyMainWindow(QMainWindow):
         # إحصائيات التحقق التبادلي
         if results.get('cross_validator'):
             try:
-                validation_report = results['cross_validator'].get_validation_report()
-                # استخراج الأرقام من التقرير
-                import re
-                total_validated = re.search(r'إجمالي الكلمات المحللة: (\d+)', validation_report)
-                valid_count = re.search(r'التحليلات الصحيحة: (\d+)', validation_report)
-                if total_validated and valid_count:
-                    total_v = int(total_validated.group(1))
-                    valid_v = int(valid_count.group(1))
-                    valid_percent = (valid_v / total_v * 100) if total_v > 0 else 0
+                # الأعداد مباشرة من المُحقق بدل بناء التقرير النصي واستخراجها منه
+                validation_stats = results['cross_validator'].get_validation_stats()
+                total_v = validation_stats['total']
+                valid_v = validation_stats['valid']
+                if total_v:
+                    valid_percent = valid_v / total_v * 100
                     stats_text += f"\nالتحقق التبادلي:\n"
                     stats_text += f"الصحيحة: {valid_v:,} / {total_v:,} ({valid_percent:.1f}%)\n"
             except:
@@ -1309,69 +1615,57 @@ class MorphologyMainWindow(QMainWindow):
         
         self.stats_label.setText(stats_text)
     
-    def switch_weights_tab(self, tab_name):
-        """تبديل التبويب في عمود الأوزان"""
+    def switch_weights_tab(self, tab_name, checked=False):
+        """تبديل التبويب في عمود الأوزان (checked من إشارة clicked ولا يُستعمل)"""
         # حفظ التبويب المختار
         self.current_weights_tab = tab_name
         
         # إلغاء تحديد جميع الأزرار
-        self.btn_names_tab.setChecked(False)
-        self.btn_verbs_tab.setChecked(False)
-        self.btn_all_tab.setChecked(False)
-        
-        # إخفاء جميع القوائم
-        self.names_list.hide()
-        self.verbs_list.hide()
-        self.all_list.hide()
-        
-        # إظهار القائمة المختارة وتحديد الزر
-        if tab_name == 'names':
-            self.names_list.show()
-            self.btn_names_tab.setChecked(True)
-        elif tab_name == 'verbs':
-            self.verbs_list.show()
-            self.btn_verbs_tab.setChecked(True)
-        elif tab_name == 'all':
-            self.all_list.show()
-            self.btn_all_tab.setChecked(True)
+        for _, tab_button in self.weights_tabs.values():
+            tab_button.setChecked(False)
+        
+        # عرض أوزان التبويب المختار في القائمة وتحديد الزر
+        if tab_name in self.weights_tabs:
+            kind, tab_button = self.weights_tabs[tab_name]
+            self.weights_proxy.set_kind(kind)
+            tab_button.setChecked(True)
     
-    def on_weight_selected(self, item):
+    def on_weight_selected(self, index):
         """عند اختيار وزن"""
-        weight_text = item.text()
-        # استخراج اسم الوزن (إزالة [اسم] أو [فعل] إن وجد)
-        weight = weight_text.split('] ')[-1].split(' (')[0]
+        weight = index.data(WeightsListModel.WeightRole)
         
         # البحث عن النتائج لهذا الوزن
         if hasattr(self, 'last_results') and self.last_results is not None:
-            results = self.last_results.get('all_processing_results', [])
-            for result_data in results:
-                if result_data['weight'] == weight:
-                    self.display_weight_results(result_data)
-                    break
+            result_data = self.weight_results_index.get(weight)
+            if result_data is not None:
+                self.display_weight_results(result_data)
         else:
             # لا توجد نتائج بعد - إظهار رسالة
             self.results_text.setPlainText(f"الوزن المحدد: {weight}\n\nلا توجد نتائج بعد.\nيرجى تشغيل التحليل أولاً.")
     
     def display_weight_results(self, result_data):
         """عرض نتائج وزن معين"""
-        weight = result_data['weight']
-        results = result_data['results']
-        count = result_data['count']
+        weight = result_data.weight
+        results = result_data.results
+        count = result_data.match_count
         
-        text = f"الوزن: {weight}\n"
-        text += f"عدد النتائج: {count}\n"
-        text += "─" * 50 + "\n\n"
+        # تُجمع الأجزاء في قائمة ثم تُضم مرة واحدة وتُعرض بتخطيط واحد للمستند
+        parts = [
+            f"الوزن: {weight}\n",
+            f"عدد النتائج: {count}\n",
+            "─" * 50 + "\n\n",
+        ]
         
         # عرض أول 100 نتيجة
         for i, (prefix, root, suffix) in enumerate(results[:100]):
             matched_word = prefix + root + suffix
-            text += f"{i+1}. {matched_word}\n"
-            text += f"   الجذر: {root} | السابق: {prefix or '#'} | اللاحق: {suffix or '#'}\n\n"
+            parts.append(f"{i+1}. {matched_word}\n"
+                         f"   الجذر: {root} | السابق: {prefix or '#'} | اللاحق: {suffix or '#'}\n\n")
         
         if len(results) > 100:
-            text += f"\n... و {len(results) - 100} نتيجة أخرى\n"
+            parts.append(f"\n... و {len(results) - 100} نتيجة أخرى\n")
         
-        self.results_text.setPlainText(text)
+        self.results_text.setPlainText(''.join(parts))
     
     def open_settings(self):
         """فتح نافذة الإعدادات"""
@@ -1383,20 +1677,14 @@ class MorphologyMainWindow(QMainWindow):
     
     def open_results_folder(self):
         """فتح مجلد النتائج"""
-        import subprocess
-        import platform
-        
-        results_dir = self.settings.get('names_results_dir', 'قواعد البيانات/النتائج_الأسماء')
-        # تحويل المسار النسبي إلى مطلق إذا لزم الأمر
-        if not os.path.isabs(results_dir):
-            results_dir = os.path.join(self.base_dir, results_dir)
+        results_dir = self.resolved_paths['names_results_dir']
         if not os.path.exists(results_dir):
             results_dir = self.base_dir
         
         try:
-            if platform.system() == 'Windows':
+            if SYSTEM_NAME == 'Windows':
                 os.startfile(results_dir)
-            elif platform.system() == 'Darwin':  # macOS
+            elif SYSTEM_NAME == 'Darwin':  # macOS
                 subprocess.Popen(['open', results_dir])
             else:  # Linux
                 subprocess.Popen(['xdg-open', results_dir])
@@ -1449,18 +1737,14 @@ class MorphologyMainWindow(QMainWindow):
             
             layout = QVBoxLayout(dialog)
             
-            text_edit = QTextEdit()
+            # التقرير نص خالص: تخطيط QPlainTextEdit بالأسطر أسرع بكثير للتقارير الكبيرة
+            text_edit = QPlainTextEdit()
             text_edit.setReadOnly(True)
-            text_edit.setFont(self.default_font)
-            text_edit.setPlainText(validation_report)
-            text_edit.setStyleSheet("""
-                QTextEdit {
-                    background-color: #ffffff;
-                    border: 1px solid #c0c0c0;
-                    color: #000000;
-                    font-size: 15px;
-                }
-            """)
+            text_edit.setUndoRedoEnabled(False)
+            text_edit.setFont(ui_font(TEXT_VIEW_POINT_SIZE))
+            # التقرير الكبير يُعرض أوله فوراً ويكتمل على أجزاء بعد ظهور النافذة
+            set_plain_text_streamed(text_edit, validation_report)
+            text_edit.setStyleSheet(VALIDATION_REPORT_QSS)
             layout.addWidget(text_edit)
             
             button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
@@ -1468,62 +1752,138 @@ class MorphologyMainWindow(QMainWindow):
             button_box.rejected.connect(dialog.close)
             layout.addWidget(button_box)
             
-            dialog.exec()
+            # نافذة غير مشروطة: لا تحجب النافذة الرئيسية، وتُحذف عند إغلاقها
+            # (المرجع يُحفظ ليبقى التقرير المفتوح حتى يُغلق)
+            dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            self.validation_dialog = dialog
+            dialog.show()
         except Exception as e:
             QMessageBox.critical(self, "خطأ", f"فشل عرض تقرير التحقق:\n{str(e)}")
     
     def generate_reports(self, results):
-        """توليد التقارير"""
+        """توليد التقارير في خيط منفصل (رسائله تصل إلى السجل عبر الإشارة)"""
         if not results.get('db_manager'):
             return
         
-        try:
-            report_generator = ReportGenerator(results['db_manager'])
-            stats = results['db_manager'].get_statistics()
-            
-            coverage_info = report_generator.generate_coverage_outputs(
-                all_words_set=results.get('all_corpus_words', set()),
-                recognized_set=results.get('recognized_words', set())
-            )
-            
-            stats['processing_time'] = results.get('processing_time', 0)
-            report_generator.generate_text_report(stats, coverage=coverage_info)
-            
-            self.log_message("✅ تم إنشاء التقارير بنجاح")
-        except Exception as e:
-            self.log_message(f"⚠️ تحذير: فشل إنشاء بعض التقارير: {str(e)}")
+        # تقارير التحليل السابق ما زالت تُكتب: تبدأ هذه عند انتهائها دون انتظارها هنا
+        # (يبقى آخر طلب فقط، فكل تشغيل يكتب ملفات التقارير نفسها)
+        if self.report_worker is not None:
+            self.pending_report_results = results
+            return
+        
+        self.start_report_worker(results)
+    
+    def start_report_worker(self, results):
+        """بدء عامل التقارير (تملكه النافذة، ويُحذف بعد انتهاء خيطه)"""
+        self.report_worker = ReportWorker(results, self)
+        self.report_worker.log_message.connect(self.log_message)
+        self.report_worker.finished.connect(self.on_report_finished)
+        self.report_worker.finished.connect(self.report_worker.deleteLater)
+        self.report_worker.start()
+    
+    def on_report_finished(self):
+        """عند انتهاء عامل التقارير: بدء التقارير المؤجلة إن وُجدت، أو إكمال الإغلاق المؤجل"""
+        self.report_worker = None
+        if self.close_after_reports:
+            self.close()
+            return
+        results = self.pending_report_results
+        self.pending_report_results = None
+        if results is not None:
+            self.start_report_worker(results)
     
     def log_message(self, message):
-        """إضافة رسالة للسجل"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
-        # التمرير للأسفل
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.log_text.setTextCursor(cursor)
+        """إضافة رسالة للسجل (لكل سطر وقته، وتُعرض مع ما يصل معها في دفعة واحدة)"""
+        second = int(time.time())
+        if second != self.log_timestamp[0]:
+            self.log_timestamp = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+        timestamp = self.log_timestamp[1]
+        self.log_buffer.extend(f"[{timestamp}] {line}" for line in message.split('\n'))
+        if not self.log_timer.isActive():
+            self.log_timer.start()
+    
+    def flush_log(self):
+        """إضافة رسائل السجل المعلّقة دفعة واحدة"""
+        if not self.log_buffer:
+            return
+        # appendPlainText يمرر إلى الأسفل بنفسه ما دام العرض عند آخر السجل
+        self.log_text.appendPlainText('\n'.join(self.log_buffer))
+        self.log_buffer.clear()
+    
+    def on_close_confirmed(self, result):
+        """عند الرد على تأكيد الإغلاق أثناء المعالجة"""
+        box = self.close_confirm_box
+        self.close_confirm_box = None
+        box.deleteLater()
+        if box.standardButton(box.clickedButton()) != QMessageBox.StandardButton.Yes:
+            return
+        
+        worker = self.processing_worker
+        if not (worker and worker.isRunning()):
+            # انتهت المعالجة أثناء انتظار الرد
+            self.close()
+            return
+        
+        self.close_after_worker = True
+        self.btn_stop.setEnabled(False)
+        self.log_message("جارٍ إيقاف المعالجة قبل الإغلاق...")
+        worker.finished.disconnect(self.on_analysis_finished)
+        worker.finished.connect(self.close_after_worker_stopped)
+        worker.requestInterruption()
+    
+    def close_after_worker_stopped(self, success, results, error):
+        """إغلاق النافذة بعد توقف عامل التحليل"""
+        # إشارة الانتهاء تصدر في آخر run، فالانتظار بعدها قصير
+        worker = self.processing_worker
+        worker.wait()
+        # on_analysis_finished لم تستلم النتائج، فاتصال العامل يُغلق هنا
+        if worker.db_manager:
+            self.close_database(worker.db_manager)
+        self.close()
+    
+    def close_database(self, db_manager):
+        """إغلاق اتصال قاعدة البيانات عند الخروج (يُسجَّل الخطأ ولا يوقف الإغلاق)"""
+        try:
+            db_manager.close()
+        except sqlite3.Error as e:
+            logging.warning(f"تعذر إغلاق قاعدة البيانات: {e}")
     
     def closeEvent(self, event):
         """عند إغلاق النافذة"""
-        # إيقاف المعالجة إن كانت جارية
-        if self.processing_worker and self.processing_worker.isRunning():
-            reply = QMessageBox.question(
-                self, "تأكيد",
-                "المعالجة جارية. هل تريد الإغلاق؟",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-            )
-            if reply == QMessageBox.StandardButton.No:
-                event.ignore()
-                return
-            else:
-                self.processing_worker.stop()
-                self.processing_worker.wait(3000)  # انتظار 3 ثوان
+        # إيقاف المعالجة إن كانت جارية: تأكيد غير حاجب، ثم طلب إيقاف وإغلاق النافذة
+        # عند انتهاء العامل بدل حجب الواجهة بانتظاره
+        worker = self.processing_worker
+        if worker and worker.isRunning():
+            if not self.close_after_worker and not self.close_confirm_box:
+                # open() بدل exec(): لا حلقة أحداث متداخلة تعيد تشغيل إشارات العامل المنتظرة
+                self.close_confirm_box = QMessageBox(
+                    QMessageBox.Icon.Question, "تأكيد",
+                    "المعالجة جارية. هل تريد الإغلاق؟",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                    self
+                )
+                self.close_confirm_box.finished.connect(self.on_close_confirmed)
+                self.close_confirm_box.open()
+            event.ignore()
+            return
+        
+        # التقارير الجارية تكتمل قبل الإغلاق (كتابة ملفات لا تُقطع)، والمؤجلة تُلغى؛
+        # on_report_finished تعيد الإغلاق عند انتهائها بدل انتظارها هنا
+        if self.report_worker is not None:
+            if not self.close_after_reports:
+                self.close_after_reports = True
+                self.pending_report_results = None
+                self.log_message("انتظار انتهاء كتابة التقارير قبل الإغلاق...")
+            event.ignore()
+            return
+        
+        # عرض ما بقي من رسائل السجل
+        self.log_timer.stop()
+        self.flush_log()
         
         # إغلاق قاعدة البيانات
         if self.db_manager:
-            try:
-                self.db_manager.close()
-            except:
-                pass
+            self.close_database(self.db_manager)
         
         event.accept()
 
@@ -1535,11 +1895,7 @@ def main():
     app = QApplication(sys.argv)
     
     # تعيين الخط الافتراضي (Sakkal Majalla)
-    try:
-        font = QFont("Sakkal Majalla", 14)
-    except:
-        font = QFont("Arial", 14)
-    app.setFont(font)
+    app.setFont(ui_font(14))
     
     window = MorphologyMainWindow()
     window.show()
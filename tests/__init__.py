@@ -0,0 +1,18 @@
+"""
+اختبارات المختار الصرفي
+"""
+import sys
+import importlib.util
+from pathlib import Path
+
+CORE_FILE = Path(__file__).resolve().parent.parent / "0.5 المختار الصرفي.py"
+
+
+def load_core():
+    """تحميل الكود الأصلي كوحدة (اسم ملفه ليس اسم وحدة صالحاً للاستيراد)، مرة واحدة"""
+    if 'morphology_core' not in sys.modules:
+        spec = importlib.util.spec_from_file_location("morphology_core", CORE_FILE)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['morphology_core'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['morphology_core']
@@ -0,0 +1,66 @@
+"""
+اختبار معالج الدُفعات: المسار التسلسلي للدوال غير القابلة للتسلسل ونقاط الاستعادة
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tests import load_core
+
+core = load_core()
+
+
+class BatchProcessorTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.processor = core.BatchProcessor(chunk_size=100, save_interval=300, max_workers=2)
+        self.processor.checkpoint_file = os.path.join(self.tmp_dir, 'checkpoint.ndjson')
+        self.processor.meta_file = os.path.join(self.tmp_dir, 'checkpoint.meta')
+        self.lines = [f"سطر {i}" for i in range(1050)]
+        self.input_file = os.path.join(self.tmp_dir, 'input.txt')
+        with open(self.input_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.lines))
+
+    def test_unpicklable_callables(self):
+        prefix = 'س'
+
+        def nested(chunk):
+            return [line.startswith(prefix) for line in chunk]
+
+        expected = [True] * len(self.lines)
+        self.assertEqual(self.processor.process_file_in_chunks(self.input_file, nested), expected)
+        self.assertEqual(
+            self.processor.process_file_in_chunks(self.input_file, lambda chunk: [len(line) for line in chunk]),
+            [len(line) for line in self.lines]
+        )
+        self.assertFalse(os.path.exists(self.processor.meta_file))
+
+    def test_resumed_rows_match_fresh_run(self):
+        fresh = self.processor.process_file_in_chunks(self.input_file, split_line)
+        
+        # نقطة استعادة بعد أول 300 سطر، ثم المتابعة منها
+        self.processor.processed_count = 300
+        self.processor.save_checkpoint(fresh[:300])
+        with mock.patch('builtins.input', return_value='y'):
+            resumed = self.processor.process_file_in_chunks(self.input_file, split_line)
+        
+        self.assertEqual(resumed, fresh)
+        self.assertTrue(all(type(row) is tuple for row in resumed))
+
+    def test_unserializable_rows(self):
+        with self.assertRaises(TypeError):
+            self.processor.save_checkpoint([('سطر', object())])
+        self.assertFalse(os.path.exists(self.processor.checkpoint_file))
+
+
+def split_line(chunk):
+    """دالة معالجة على مستوى الوحدة تُرجع صفوفاً"""
+    return [tuple(line.split(' ')) for line in chunk]
+
+
+if __name__ == '__main__':
+    unittest.main()
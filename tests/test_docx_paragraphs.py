@@ -0,0 +1,74 @@
+"""
+اختبار قراءة فقرات ملفات docx من XML مباشرة مقابل paragraph.text في python-docx
+"""
+import os
+import tempfile
+import unittest
+import zipfile
+
+from tests import load_core
+
+core = load_core()
+
+CONTENT_TYPES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>'''
+
+RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>'''
+
+# فقرات بنص داخل حاويات لا تقرؤها python-docx (w:ins وw:smartTag وw:fldSimple وw:del)،
+# ورابط وفواصل وجدول ومربع نص
+DOCUMENT = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:body>
+<w:p><w:r><w:t>كَتَبَ</w:t></w:r><w:ins w:id="1"><w:r><w:t>مُدْرَج</w:t></w:r></w:ins><w:r><w:t xml:space="preserve"> الكَاتِبُ</w:t></w:r></w:p>
+<w:p><w:smartTag w:uri="u" w:element="e"><w:r><w:t>وسم</w:t></w:r></w:smartTag><w:r><w:t>دَرَسَ</w:t></w:r></w:p>
+<w:p><w:fldSimple w:instr="PAGE"><w:r><w:t>1</w:t></w:r></w:fldSimple><w:hyperlink><w:r><w:t>رَابِط</w:t></w:r></w:hyperlink></w:p>
+<w:p><w:r><w:t>أ</w:t><w:tab/><w:t>ب</w:t><w:br/><w:t>ج</w:t><w:br w:type="page"/><w:t>د</w:t><w:cr/><w:noBreakHyphen/><w:ptab/></w:r></w:p>
+<w:p><w:del w:id="2"><w:r><w:delText>محذوف</w:delText></w:r></w:del><w:r><w:t>بَاقٍ</w:t></w:r></w:p>
+<w:tbl><w:tr><w:tc><w:p><w:r><w:t>جدول</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+<w:p><w:r><w:t>قبل</w:t><w:pict><w:txbxContent><w:p><w:r><w:t>مربع</w:t></w:r></w:p></w:txbxContent></w:pict><w:t>بعد</w:t></w:r></w:p>
+<w:p/>
+</w:body>
+</w:document>'''
+
+EXPECTED = [
+    'كَتَبَ الكَاتِبُ',
+    'دَرَسَ',
+    'رَابِط',
+    'أ\tب\nجد\n-\t',
+    'بَاقٍ',
+    'قبلبعد',
+    '',
+]
+
+
+class DocxParagraphsTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.file_path = os.path.join(tmp_dir.name, 'document.docx')
+        with zipfile.ZipFile(self.file_path, 'w') as archive:
+            archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+            archive.writestr('_rels/.rels', RELS)
+            archive.writestr('word/document.xml', DOCUMENT)
+
+    def test_xml_paragraphs(self):
+        self.assertEqual(list(core.iter_docx_paragraphs(self.file_path)), EXPECTED)
+
+    @unittest.skipUnless(core.DOCX_SUPPORT, "python-docx غير مثبتة")
+    def test_same_as_python_docx(self):
+        from docx import Document
+        self.assertEqual(list(core.iter_docx_paragraphs(self.file_path)),
+                         [paragraph.text for paragraph in Document(self.file_path).paragraphs])
+
+
+if __name__ == '__main__':
+    unittest.main()
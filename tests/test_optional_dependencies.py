@@ -0,0 +1,56 @@
+"""
+اختبار المكتبات الاختيارية الموجودة لكن المتعذر استيرادها: تُعامل معاملة الغائبة
+"""
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from tests import load_core
+
+core = load_core()
+
+
+class BrokenOptionalDependencyTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        # حزم بأسماء المكتبات الاختيارية يفشل استيرادها (كحزمة docx القديمة لبايثون 2)
+        packages_dir = os.path.join(self.tmp_dir, 'packages')
+        for name in ('docx', 'xlsxwriter', 'openpyxl'):
+            os.makedirs(os.path.join(packages_dir, name))
+            with open(os.path.join(packages_dir, name, '__init__.py'), 'w', encoding='utf-8') as f:
+                f.write('from exceptions import PendingDeprecationWarning\n')
+        for patcher in (mock.patch.object(sys, 'path', [packages_dir] + sys.path), mock.patch.dict(sys.modules)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for name in ('docx', 'xlsxwriter', 'openpyxl'):
+            sys.modules.pop(name, None)
+
+    def test_docx_fallback(self):
+        file_path = os.path.join(self.tmp_dir, 'broken.docx')
+        with open(file_path, 'wb') as f:
+            f.write(b'not a zip file')
+        with mock.patch.object(core, 'DOCX_SUPPORT', True):
+            with self.assertRaises(zipfile.BadZipFile):
+                list(core.iter_docx_paragraphs(file_path))
+
+    def test_excel_report(self):
+        # مولد التقارير ينشئ مجلد reports في مجلد العمل
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp_dir)
+        db_manager = core.DatabaseManager(os.path.join(self.tmp_dir, 'report.db'))
+        self.addCleanup(db_manager.close)
+        report_generator = core.ReportGenerator(db_manager)
+        stats = {'total_results': 0, 'unique_words': 0, 'total_patterns': 0, 'total_roots': 0,
+                 'top_patterns': [], 'top_roots': []}
+        with mock.patch.object(core, 'XLSXWRITER_SUPPORT', True), mock.patch.object(core, 'OPENPYXL_SUPPORT', True):
+            self.assertIsNone(report_generator.generate_excel_report(stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+اختبار البحث عن الأوزان في المدونة مقابل البحث الأصلي سطراً بسطر
+
+البحث الحالي يمسح نص الملف كاملاً (MULTILINE)، ويتخطى الملف الذي لا يحوي النص الثابت
+اللازم للنمط، ويمسح الوزن وأوزانه المشتقة في قراءة واحدة لكل ملف. الاختبارات هنا تقارن
+نتائجه (بترتيبها) بالبحث الأصلي: تطبيع كل سطر ثم البحث فيه بالنمط الكامل.
+"""
+import random
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests import load_core
+
+core = load_core()
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "قواعد البيانات"
+
+# عدد الأوزان المختبرة من كل ملف (مع أوزانها المشتقة)
+NAMES_COUNT = 8
+VERBS_COUNT = 4
+
+ROOTS = ['كتب', 'درس', 'قول', 'سمع', 'نصر', 'علم', 'وعد', 'رمى', 'سأل']
+PREFIXES = ['', '', 'ال', 'وال', 'ب', 'و']
+SUFFIXES = ['', '', 'ون', 'ات', 'ها', 'ة']
+DIACRITICS_RE = re.compile('[ً-ْ]')
+
+
+def fill_weight(weight, root):
+    """كلمة على الوزن: أحرف فعل تُستبدل بأحرف الجذر بالترتيب"""
+    letters = iter(root)
+    return ''.join(next(letters, 'ب') if c in 'فعل' else c for c in weight)
+
+
+def build_corpus_words(weights, seed=7):
+    """كلمات مدونة الاختبار: لكل وزن ومشتقاته كلمات بسوابق ولواحق، وبعضها بلا تشكيل"""
+    rng = random.Random(seed)
+    words = []
+    for weight, derived_weights in weights:
+        for root in rng.sample(ROOTS, 3):
+            for candidate in [weight] + derived_weights[:3]:
+                word = rng.choice(PREFIXES) + fill_weight(candidate, root) + rng.choice(SUFFIXES)
+                if rng.random() < 0.3:
+                    word = DIACRITICS_RE.sub('', word)
+                words.append(word)
+    rng.shuffle(words)
+    return words
+
+
+def per_line_search(file_manager, file_path, pattern):
+    """البحث الأصلي: تطبيع كل سطر من الملف ثم البحث فيه بالنمط الكامل"""
+    compiled_pattern = re.compile(file_manager._build_full_pattern(pattern))
+    results = []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            normalized_line = core.DiacriticsHandler.normalize_quranic_text(line)
+            for match in compiled_pattern.finditer(normalized_line):
+                results.append((match.group('prefix') or '', match.group('root'), match.group('suffix') or ''))
+    return results
+
+
+class PatternSearchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        tmp_path = Path(cls.tmp_dir.name)
+
+        cls.symbols_map = core.load_literal_file(DATA_DIR / "الخريطة.txt")
+        cls.affixes = {
+            'names': core.load_literal_file(DATA_DIR / "0.3 سوابق ولواحق_أسماء.txt"),
+            'verbs': core.load_literal_file(DATA_DIR / "0.3 سوابق ولواحق_أفعال.txt"),
+        }
+        reader = core.FileManager(affixes_data=cls.affixes['names'])
+        names = reader.read_weights_and_derived_words(DATA_DIR / "0.3 أوزان_الأسماء.txt")
+        reader.affixes_data = cls.affixes['verbs']
+        verbs = reader.read_weights_and_derived_words(DATA_DIR / "0.3 أوزان_الأفعال.txt")
+        cls.weights = ([('names', weight, derived) for weight, derived in list(names.items())[:NAMES_COUNT]]
+                       + [('verbs', weight, derived) for weight, derived in list(verbs.items())[:VERBS_COUNT]])
+
+        words = build_corpus_words([(weight, derived) for _, weight, derived in cls.weights])
+        rng = random.Random(11)
+
+        # مدونة قائمة: كلمة في كل سطر، مع أسطر فارغة وأسطر بمسافات
+        cls.list_file = tmp_path / "list.txt"
+        list_lines = []
+        for word in words:
+            list_lines.append(word)
+            if rng.random() < 0.05:
+                list_lines.append(rng.choice(['', '   ']))
+        cls.list_file.write_text('\n'.join(list_lines) + '\n', encoding='utf-8')
+
+        # مدونة نص: جمل بعلامات ترقيم وأقواس، وسطر أخير بلا فاصل سطر
+        cls.text_file = tmp_path / "text.txt"
+        text_lines = []
+        for i in range(0, len(words), 7):
+            text_lines.append(' '.join(words[i:i + 7]) + rng.choice(['.', '،', '', ' (' + words[i] + ')']))
+        cls.text_file.write_text('\n'.join(text_lines), encoding='utf-8')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def setUp(self):
+        core.FileManager.clear_corpus_caches()
+
+    def settings(self):
+        """كل تركيبات نوع المدونة ومطابقة الكلمة كاملة والتشكيل الاختياري"""
+        for corpus_type, file_path in (('list', self.list_file), ('text', self.text_file)):
+            for match_whole_word in (True, False):
+                for optional_tashkeel in (False, True):
+                    yield corpus_type, str(file_path), match_whole_word, optional_tashkeel
+
+    def weight_pattern(self, weight, optional_tashkeel):
+        processor = core.ArabicProcessor(optional_tashkeel=optional_tashkeel, symbols_map=self.symbols_map)
+        return processor.replace_symbols(processor.add_optional_tashkeel_and_grouping(weight))
+
+    def test_search_patterns_in_file(self):
+        total = 0
+        for corpus_type, file_path, match_whole_word, optional_tashkeel in self.settings():
+            for affixes_key, weight, derived_weights in self.weights:
+                file_manager = core.FileManager(
+                    corpus_type=corpus_type, match_whole_word=match_whole_word,
+                    affixes_data=self.affixes[affixes_key]
+                )
+                for current_weight in [weight] + derived_weights:
+                    pattern = self.weight_pattern(current_weight, optional_tashkeel)
+                    with self.subTest(corpus_type=corpus_type, match_whole_word=match_whole_word,
+                                      optional_tashkeel=optional_tashkeel, weight=current_weight):
+                        expected = per_line_search(file_manager, file_path, pattern)
+                        found = file_manager.search_patterns_in_file(file_path, pattern, current_weight)
+                        self.assertEqual(list(found), expected)
+                        total += len(expected)
+        # المدونة مبنية من الأوزان نفسها، فالمقارنة تشمل تطابقات فعلية لا قوائم فارغة فقط
+        self.assertGreater(total, 0)
+
+    def test_patterns_matching_empty_text(self):
+        # نمط يطابق نصاً فارغاً يتبع عدد تطابقاته عدد الأسطر، فيُمسح سطراً بسطر كالبحث الأصلي
+        for corpus_type, file_path, match_whole_word, _ in self.settings():
+            file_manager = core.FileManager(
+                corpus_type=corpus_type, match_whole_word=match_whole_word,
+                affixes_data=self.affixes['names']
+            )
+            for pattern in ('(?:ا)?', '[ًٌٍَُِّْ]*', 'ك?ت?'):
+                with self.subTest(corpus_type=corpus_type, match_whole_word=match_whole_word, pattern=pattern):
+                    expected = per_line_search(file_manager, file_path, pattern)
+                    self.assertEqual(list(file_manager.search_patterns_in_file(file_path, pattern, pattern)), expected)
+
+    def test_process_weight_single_pass(self):
+        for corpus_type, file_path, match_whole_word, optional_tashkeel in self.settings():
+            with tempfile.TemporaryDirectory() as results_dir:
+                for affixes_key, weight, derived_weights in self.weights:
+                    result = core.process_weight((
+                        weight, derived_weights, [file_path], results_dir, corpus_type, match_whole_word,
+                        self.affixes[affixes_key], {}, self.symbols_map, optional_tashkeel, False
+                    ))
+                    file_manager = core.FileManager(
+                        corpus_type=corpus_type, match_whole_word=match_whole_word,
+                        affixes_data=self.affixes[affixes_key]
+                    )
+                    searches = [
+                        (current_weight, per_line_search(
+                            file_manager, file_path, self.weight_pattern(current_weight, optional_tashkeel)))
+                        for current_weight in [weight] + derived_weights
+                    ]
+                    # الوزن المكرر في قائمة المشتقات تتكرر نتائجه بعدد مرات بحثه
+                    expected = {}
+                    for current_weight, found in searches:
+                        expected.setdefault(current_weight, []).extend(found)
+                    with self.subTest(corpus_type=corpus_type, match_whole_word=match_whole_word,
+                                      optional_tashkeel=optional_tashkeel, weight=weight):
+                        self.assertEqual(result.results, searches[0][1])
+                        self.assertEqual(result.patterns_results, expected)
+
+    def test_process_weight_logs_derived_weights(self):
+        affixes_key, weight, derived_weights = next(item for item in self.weights if item[2])
+        with tempfile.TemporaryDirectory() as results_dir:
+            with self.assertLogs(level='INFO') as logs:
+                core.process_weight((
+                    weight, derived_weights, [str(self.list_file)], results_dir, 'list', True,
+                    self.affixes[affixes_key], {}, self.symbols_map, False, False
+                ))
+        derived_lines = [line for line in logs.output if 'الأوزان المشتقة' in line]
+        self.assertEqual(len(derived_lines), 1)
+        for derived_weight in derived_weights:
+            self.assertIn(derived_weight, derived_lines[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
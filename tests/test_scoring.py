@@ -0,0 +1,125 @@
+"""
+اختبار حساب نقاط النتائج دفعة واحدة مقابل الحساب ثم الإدراج نتيجةً نتيجة
+"""
+import os
+import random
+import tempfile
+import unittest
+
+from tests import load_core
+
+core = load_core()
+
+# (word, root, prefix, suffix): كلمات بأطوال وسوابق ولواحق مختلفة، وبعضها مكرر
+ROWS = [
+    ('كاتب', 'كاتب', '', ''),
+    ('الكاتب', 'كاتب', 'ال', ''),
+    ('كاتبون', 'كاتب', '', 'ون'),
+    ('والكاتبون', 'كاتب', 'وال', 'ون'),
+    ('كاتب', 'كاتب', '', ''),
+] * 30
+
+
+class ScoresBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def open_db(self, name):
+        db_manager = core.DatabaseManager(os.path.join(self.tmp_dir.name, name))
+        self.addCleanup(db_manager.close)
+        return db_manager
+
+    def per_row_scores(self, pattern, batches):
+        """الطريقة الأصلية: نقاط كل نتيجة بتكرار الوزن الحالي ثم إدراجها (فيزيد تكراره)"""
+        db_manager = self.open_db('per_row.db')
+        ranker = core.PatternRanker(db_manager)
+        scores = []
+        for rows in batches:
+            db_manager.insert_pattern(pattern, 'اسم', core.count_extra_chars(pattern))
+            for word, root, prefix, suffix in rows:
+                score = ranker.calculate_score(pattern, word, prefix, suffix, 1)
+                db_manager.insert_result(word, root, pattern, prefix, suffix, '', score)
+                scores.append(score)
+        return scores
+
+    def batch_scores(self, pattern, batches):
+        db_manager = self.open_db('batch.db')
+        ranker = core.PatternRanker(db_manager)
+        scores = []
+        for rows in batches:
+            db_manager.insert_pattern(pattern, 'اسم', core.count_extra_chars(pattern))
+            meta = ranker.get_pattern_meta([pattern])[pattern]
+            batch = ranker.calculate_scores_batch(
+                pattern, [(word, prefix, suffix) for word, _, prefix, suffix in rows], meta=meta)
+            db_manager.insert_results_bulk([
+                (word, root, pattern, prefix, suffix, '', score)
+                for (word, root, prefix, suffix), score in zip(rows, batch)
+            ])
+            scores.extend(batch)
+        return scores
+
+    def test_frequency_grows_within_batch(self):
+        batches = [ROWS]
+        self.assertEqual(self.batch_scores('فاعل', batches), self.per_row_scores('فاعل', batches))
+
+    def test_frequency_carries_over_between_batches(self):
+        # الوزن نفسه يُحفظ مرتين (كالوزن الوارد في الأسماء والأفعال)
+        batches = [ROWS[:40], ROWS[40:]]
+        self.assertEqual(self.batch_scores('فاعل', batches), self.per_row_scores('فاعل', batches))
+
+    def test_without_database(self):
+        ranker = core.PatternRanker()
+        rows = [(word, prefix, suffix) for word, _, prefix, suffix in ROWS]
+        expected = [ranker.calculate_score('فاعل', word, prefix, suffix, 1) for word, prefix, suffix in rows]
+        self.assertEqual(ranker.calculate_scores_batch('فاعل', rows), expected)
+
+
+class RankPatternsTest(unittest.TestCase):
+    """متوسط نقاط كل وزن في rank_patterns مقابل جمع نقاط نتائجه ثم قسمته (الحساب الأصلي)"""
+
+    PATTERNS = ['فاعل', 'مفعول', 'استفعال', 'فعيل', 'افتعال', 'فعل']
+
+    def patterns_results(self):
+        rng = random.Random(5)
+        prefixes, suffixes = ['', 'ال', 'و'], ['', 'ون', 'ة']
+        return {
+            pattern: [(rng.choice(prefixes), 'كتب', rng.choice(suffixes)) for _ in range(rng.randint(1, 13))]
+            for pattern in self.PATTERNS
+        }
+
+    def per_result_averages(self, ranker, patterns_results, word):
+        metas = ranker.get_pattern_meta(patterns_results)
+        return {
+            pattern: sum(ranker.calculate_score(pattern, word, prefix, suffix, len(results), metas[pattern].db_freq)
+                         for prefix, _, suffix in results) / len(results)
+            for pattern, results in patterns_results.items()
+        }
+
+    def check(self, ranker):
+        patterns_results = self.patterns_results()
+        for word in ('كاتب', 'الكاتبون', 'استكتاب'):
+            with self.subTest(word=word):
+                ranked = {pattern: score for pattern, _, score in ranker.rank_patterns(patterns_results, word)}
+                self.assertEqual(ranked, self.per_result_averages(ranker, patterns_results, word))
+
+    def test_without_database(self):
+        self.check(core.PatternRanker())
+
+    def test_with_database_frequency(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_manager = core.DatabaseManager(os.path.join(tmp_dir, 'rank.db'))
+            try:
+                for i, pattern in enumerate(self.PATTERNS):
+                    db_manager.insert_pattern(pattern, 'اسم', core.count_extra_chars(pattern))
+                    db_manager.insert_results_bulk([
+                        (f'كلمة{j}', 'كتب', pattern, '', '', '', 0) for j in range(i * 7)
+                    ])
+                self.check(core.PatternRanker(db_manager))
+            finally:
+                db_manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
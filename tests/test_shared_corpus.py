@@ -0,0 +1,43 @@
+"""
+اختبار تحميل المدونة في الذاكرة المشتركة والرجوع إلى القراءة من القرص
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tests import load_core
+
+core = load_core()
+
+
+class SharedCorpusTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.file_path = os.path.join(tmp_dir.name, 'corpus.txt')
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            f.write('كَتَبَ الكَاتِبُ\nدَرَسَ\n')
+        self.file_sig = core.file_signature(self.file_path)
+        self.addCleanup(core.attach_shared_corpus, {})
+
+    def test_text_read_from_shared_memory(self):
+        with core.SharedCorpus([self.file_path]) as corpus:
+            self.assertIn(self.file_path, corpus.blocks)
+            core.attach_shared_corpus(corpus.blocks)
+            self.assertEqual(core.read_shared_text(self.file_path, self.file_sig),
+                             core.FileManager.load_normalized_text(self.file_path))
+
+    def test_no_space_falls_back_to_disk(self):
+        with mock.patch.object(core, 'shared_memory_free_bytes', return_value=core.SHARED_MEMORY_HEADROOM):
+            with core.SharedCorpus([self.file_path]) as corpus:
+                self.assertEqual(corpus.blocks, {})
+                core.attach_shared_corpus(corpus.blocks)
+                self.assertIsNone(core.read_shared_text(self.file_path, self.file_sig))
+                self.assertEqual(core.FileManager._read_text(self.file_path, self.file_sig),
+                                 core.FileManager.load_normalized_text(self.file_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
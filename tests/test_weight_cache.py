@@ -0,0 +1,127 @@
+"""
+اختبار كاش نتائج الأوزان بين الجلسات: التخزين في JSON والاسترجاع وحذف ما خُزّن بإعدادات أخرى
+"""
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests import load_core
+
+core = load_core()
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "قواعد البيانات"
+
+
+class WeightCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.cache_manager = core.CacheManager(os.path.join(self.tmp_dir, 'cache'))
+        self.addCleanup(self.cache_manager.close)
+
+        corpus_file = os.path.join(self.tmp_dir, 'corpus.txt')
+        with open(corpus_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(['كَاتِب', 'الكَاتِبُون', 'دَارِس', 'كُتَّاب', 'مَكْتُوب']) + '\n')
+        self.context = {
+            'file_paths': [corpus_file],
+            'corpus_type': 'list',
+            'match_whole_word': True,
+            'affixes': {'names': core.load_literal_file(DATA_DIR / "0.3 سوابق ولواحق_أسماء.txt")},
+            'tags_map': {},
+            'symbols_map': core.load_literal_file(DATA_DIR / "الخريطة.txt"),
+            'optional_tashkeel': False,
+            'use_cross_validation': False,
+        }
+        core.init_weight_worker({}, self.context)
+        self.addCleanup(core.init_weight_worker)
+        self.tasks = [
+            ('فَاعِل', ['فَاعِلُون', 'فَاعِل'], os.path.join(self.tmp_dir, 'results'), 'names'),
+            ('فُعَّال', [], os.path.join(self.tmp_dir, 'results'), 'names'),
+        ]
+
+    def store_results(self, fingerprint):
+        cached, pending_tasks, pending_keys = core.split_cached_weight_tasks(
+            self.tasks, self.cache_manager, fingerprint)
+        results = [core.process_weight(task) for task in pending_tasks]
+        for key, result_data in zip(pending_keys, results):
+            core.cache_weight_result(self.cache_manager, fingerprint, key, result_data)
+        return cached, results
+
+    def test_results_restored_as_processed(self):
+        fingerprint = core.weight_context_fingerprint(self.context)
+        cached, processed = self.store_results(fingerprint)
+        self.assertEqual(cached, [])
+        self.assertTrue(processed[0].results)
+
+        cached, pending = self.store_results(fingerprint)
+        self.assertEqual(pending, [])
+        self.assertEqual([result_data for _, result_data in cached], processed)
+        for result_data in (result_data for _, result_data in cached):
+            self.assertTrue(all(type(row) is tuple for row in result_data.results))
+            for found in result_data.patterns_results.values():
+                self.assertTrue(all(type(row) is tuple for row in found))
+
+    def test_other_settings_pruned(self):
+        old_fingerprint = bytes(16)
+        self.store_results(old_fingerprint)
+        fingerprint = core.weight_context_fingerprint(self.context)
+        cached, _ = self.store_results(fingerprint)
+        self.assertEqual(cached, [])
+        stored = self.cache_manager.conn.execute(
+            'SELECT DISTINCT fingerprint FROM weight_result_cache').fetchall()
+        self.assertEqual(stored, [(fingerprint,)])
+
+
+class CacheManagerTest(unittest.TestCase):
+    """القيم المعادة من الذاكرة الداخلية للكاش لا يغيّرها المستدعي"""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_dir = os.path.join(tmp_dir.name, 'cache')
+
+    def open_cache(self):
+        cache_manager = core.CacheManager(self.cache_dir)
+        self.addCleanup(cache_manager.close)
+        return cache_manager
+
+    def test_cached_value_not_shared(self):
+        cache_manager = self.open_cache()
+        results = [('ال', 'كَاتِب', ''), ('', 'كَاتِب', 'ون')]
+        cache_manager.set('file.txt', 'فَاعِل', results)
+        results.append(('و', 'كَاتِب', ''))
+
+        cached = cache_manager.get('file.txt', 'فَاعِل')
+        self.assertEqual(cached, (('ال', 'كَاتِب', ''), ('', 'كَاتِب', 'ون')))
+        with self.assertRaises(AttributeError):
+            cached.append(('و', 'كَاتِب', ''))
+        self.assertEqual(cache_manager.get('file.txt', 'فَاعِل'), cached)
+
+    def test_value_read_from_database_frozen(self):
+        cache_manager = self.open_cache()
+        cache_manager.set('file.txt', 'فَاعِل', [('ال', 'كَاتِب', '')])
+        cache_manager.save_cache()
+        self.assertEqual(self.open_cache().get('file.txt', 'فَاعِل'), (('ال', 'كَاتِب', ''),))
+
+    def test_search_results_from_cache(self):
+        corpus_file = os.path.join(self.cache_dir + '_corpus.txt')
+        with open(corpus_file, 'w', encoding='utf-8') as f:
+            f.write('الكَاتِبُون\nكَاتِب\n')
+        core.FileManager.clear_corpus_caches()
+        file_manager = core.FileManager(
+            affixes_data=core.load_literal_file(DATA_DIR / "0.3 سوابق ولواحق_أسماء.txt"),
+            cache_manager=self.open_cache(),
+        )
+        found = file_manager.search_patterns_in_file(corpus_file, 'كَاتِب', 'فَاعِل')
+        self.assertTrue(found)
+        found.append(('و', 'كَاتِب', ''))
+        cached = file_manager.search_patterns_in_file(corpus_file, 'كَاتِب', 'فَاعِل')
+        self.assertEqual(cached, found[:-1])
+        self.assertTrue(all(type(row) is tuple for row in cached))
+
+
+if __name__ == '__main__':
+    unittest.main()
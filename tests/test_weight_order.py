@@ -0,0 +1,70 @@
+"""
+اختبار حفظ نتائج الأوزان بترتيب مهامها: الوزن الوارد في ملفي الأسماء والأفعال
+"""
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests import load_core
+
+core = load_core()
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "قواعد البيانات"
+
+
+def weight_names(file_name):
+    """الأوزان الأساسية في ملف أوزان"""
+    return set(core.FileManager().read_weights_and_derived_words(DATA_DIR / file_name))
+
+
+class TaskOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.weight = 'فَعَلَ'
+        self.tasks = [
+            ('فَاعِل', [], 'names_dir', 'names'),
+            (self.weight, [], 'names_dir', 'names'),
+            (self.weight, [], 'verbs_dir', 'verbs'),
+            ('فَعَّلَ', [], 'verbs_dir', 'verbs'),
+        ]
+        self.results = [
+            core.WeightResult(weight, core.WEIGHT_PATTERN_TYPES[affixes_key],
+                              [('', 'كَتَبَ', ''), ('و', 'كَتَبَ', '')][:i % 2 + 1] * (i + 1), {}, i + 1)
+            for i, (weight, _, _, affixes_key) in enumerate(self.tasks)
+        ]
+
+    def test_weight_in_both_files(self):
+        self.assertIn(self.weight, weight_names("0.3 أوزان_الأسماء.txt") & weight_names("0.3 أوزان_الأفعال.txt"))
+
+    def test_release_in_task_order(self):
+        for completion_order in ([3, 2, 1, 0], [2, 0, 3, 1], [0, 1, 2, 3]):
+            with self.subTest(completion_order=completion_order):
+                released = core.release_in_task_order(self.tasks, (self.results[i] for i in completion_order))
+                self.assertEqual(list(released), self.results)
+
+    def test_saved_type_and_scores_do_not_depend_on_completion(self):
+        saved = []
+        for name, completion_order in (('tasks.db', [0, 1, 2, 3]), ('reversed.db', [3, 2, 1, 0])):
+            db_manager = core.DatabaseManager(os.path.join(self.tmp_dir, name))
+            self.addCleanup(db_manager.close)
+            ranker = core.PatternRanker(db_manager)
+            for result_data in core.release_in_task_order(self.tasks, (self.results[i] for i in completion_order)):
+                core.save_weight_results(db_manager, result_data, result_data.pattern_type, ranker)
+            patterns = dict(db_manager.conn.execute('SELECT pattern, pattern_type FROM patterns').fetchall())
+            scores = db_manager.conn.execute('''
+                SELECT p.pattern, r.word, r.prefix, r.frequency, r.score
+                FROM results r JOIN patterns p ON r.pattern_id = p.id ORDER BY r.id
+            ''').fetchall()
+            saved.append((patterns, scores))
+        
+        # الوزن الوارد في الملفين يُحفظ اسماً كما في الكود الأصلي
+        self.assertEqual(saved[0][0][self.weight], 'اسم')
+        self.assertEqual(saved[1], saved[0])
+
+
+if __name__ == '__main__':
+    unittest.main()